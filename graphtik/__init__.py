@@ -33,7 +33,7 @@ __uri__ = "https://github.com/pygraphkit/graphtik"
 __author__ = "hnguyen, ankostis"  # chronologically ordered
 
 
-from .base import AbortedException, IncompleteExecutionError
+from .base import AbortedException, IncompleteExecutionError, LazyInput
 from .modifier import (
     modify,
     hcat,
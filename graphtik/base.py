@@ -100,6 +100,46 @@ class Token(str):
 
 UNSET = Token("UNSET")
 
+
+class LazyInput:
+    """
+    Wrap an expensive input value to be loaded only when 1st needed by the :term:`solution`.
+
+    :param loader:
+        a callable without arguments returning the actual value,
+        e.g. reading a file or querying a database
+
+    Any operation :term:`pruned <prune>` from the plan never triggers its loader,
+    and with :func:`.set_prefetch_steps()` the loader is called in a background
+    thread, a few :term:`steps` before the 1st operation needing it executes:
+
+        >>> from graphtik import compose, operation
+        >>> from graphtik.base import LazyInput
+
+        >>> pipe = compose(
+        ...     "lazy",
+        ...     operation(lambda a: a + 1, "inc", needs="a", provides="b"),
+        ...     operation(lambda c: c * 2, "double", needs="c", provides="d"),
+        ... )
+        >>> calls = []
+        >>> def load_c():
+        ...     calls.append("c")
+        ...     return 3
+        >>> pipe.compute({"a": 1, "c": LazyInput(load_c)}, outputs="b")
+        {'b': 2}
+        >>> calls
+        []
+    """
+
+    __slots__ = ("loader",)
+
+    def __init__(self, loader: Callable[[], Any]):
+        self.loader = loader
+
+    def __repr__(self):
+        return f"LazyInput({func_name(self.loader, self.loader, human=1)})"
+
+
 debug_var_tip = "(tip: set GRAPHTIK_DEBUG envvar to view Op details in print-outs)"
 
 
@@ -0,0 +1,175 @@
+# Copyright 2020-2020, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`Coalesce <coalescing>` concurrent identical computations into a single one.
+
+A :class:`SingleFlight` given to :meth:`.Pipeline.compute()` keys each call
+by the *content* of its inputs (plus the arguments & :term:`configurations`
+affecting the solution), and while a call
+is in flight, any identical calls from other threads wait for it and receive
+a copy of its :term:`solution` (or of its error), instead of re-computing it.
+"""
+import copy
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+log = logging.getLogger(__name__)
+
+
+def content_key(*values) -> Optional[bytes]:
+    """
+    A digest of the pickled `values`, or None if any of them cannot be pickled.
+
+    Mappings (at any position) are digested sorted by their keys,
+    so the order of the inputs given does not matter.
+
+    .. Note::
+        All `values` are pickled & hashed on every call, a cost paid
+        even when nothing gets coalesced (e.g. for large dataframes).
+    """
+    values = tuple(
+        sorted(v.items(), key=lambda kv: str(kv[0])) if isinstance(v, dict) else v
+        for v in values
+    )
+    try:
+        data = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as ex:
+        log.debug("Cannot coalesce unpicklable values, due to: %s", ex)
+        return None
+
+    return hashlib.blake2b(data, digest_size=20).digest()
+
+
+class _Flight:
+    """A call in flight, or finished recently (see :attr:`SingleFlight.window`)."""
+
+    __slots__ = ("done", "result", "error", "finished_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+
+def _shared_copy(result):
+    """A shallow copy of the `result` of a call for a waiting call, if it has a ``copy()``."""
+    copier = getattr(result, "copy", None)
+    return copier() if callable(copier) else result
+
+
+def _raise_copy(error: BaseException):
+    """
+    Re-raise a copy of the `error` of a call to a waiting call, not to share its traceback.
+
+    Any error that cannot be copied is re-raised as is, stripped from its traceback.
+    """
+    try:
+        err = copy.copy(error)
+    except Exception as ex:
+        log.debug("Re-raising uncopyable %r, due to: %s", error, ex)
+        raise error.with_traceback(None)
+    err.__cause__, err.__context__ = error.__cause__, error.__context__
+    raise err.with_traceback(error.__traceback__)
+
+
+class SingleFlight:
+    """
+    Run just one of concurrent calls with the same key, and share its outcome.
+
+    :param window:
+        seconds to keep sharing the outcome of a finished call with
+        any identical calls arriving afterwards;
+        if 0 (the default), only calls still in flight are shared.
+
+    The 1st call returns its outcome as is, while the rest receive a shallow
+    ``copy()`` of it, if it has one (e.g. the :term:`solution`, for pipelines),
+    so they may not alter each other's, but the values within are still shared,
+    and must be treated as read-only.
+    Errors are re-raised to all waiting calls as copies (with their own tracebacks),
+    but never kept in the `window`.
+
+    .. attribute:: calls
+
+        how many calls were made in total
+    .. attribute:: coalesced
+
+        how many of those :attr:`calls` shared the outcome of another one
+    """
+
+    def __init__(self, window: float = 0):
+        self.window = window
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now: float):
+        """Forget calls finished more than `window` seconds ago (under lock)."""
+        expired = [
+            key
+            for key, flight in self._flights.items()
+            if flight.finished_at is not None and now - flight.finished_at > self.window
+        ]
+        for key in expired:
+            del self._flights[key]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]):
+        """
+        Call `fn`, unless an identical call for `key` is in flight (or within `window`).
+
+        :param key:
+            identifies identical calls; if None, `fn` is always called
+            (and not counted as coalesced)
+        """
+        if key is None:
+            with self._lock:
+                self.calls += 1
+            return fn()
+
+        with self._lock:
+            self.calls += 1
+            self._purge_expired(time.monotonic())
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                _raise_copy(flight.error)
+            return _shared_copy(flight.result)
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                flight.finished_at = time.monotonic()
+                forget = self.window <= 0 or flight.error is not None
+                if forget and self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The number of `calls` made, how many `coalesced`, and those `computed`."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "computed": self.calls - self.coalesced,
+            }
+
+    def __repr__(self):
+        return f"SingleFlight(window={self.window}, {self.stats})"
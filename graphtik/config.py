@@ -32,14 +32,18 @@ _abort: ContextVar[Optional[bool]] = ContextVar(
     "abort", default=Value(ctypes.c_bool, lock=False)
 )
 _skip_evictions: ContextVar[Optional[bool]] = ContextVar("skip_evictions", default=None)
+_optimize_plans: ContextVar[Optional[bool]] = ContextVar("optimize_plans", default=None)
 _layered_solution: ContextVar[Optional[bool]] = ContextVar(
     "layered_solution", default=None
 )
 _execution_pool: ContextVar[Optional["Pool"]] = ContextVar(
     "execution_pool", default=None
 )
+_prefetch_steps: ContextVar[int] = ContextVar("prefetch_steps", default=0)
 _parallel_tasks: ContextVar[Optional[bool]] = ContextVar("parallel_tasks", default=None)
 _marshal_tasks: ContextVar[Optional[bool]] = ContextVar("marshal_tasks", default=None)
+_fuse_tasks: ContextVar[Optional[bool]] = ContextVar("fuse_tasks", default=None)
+_race_providers: ContextVar[Optional[bool]] = ContextVar("race_providers", default=None)
 _endure_operations: ContextVar[Optional[bool]] = ContextVar(
     "endure_operations", default=None
 )
@@ -155,6 +159,23 @@ regardless of asked outputs.
 """
 
 
+plans_optimized = partial(_tristate_armed, _optimize_plans)
+"""
+Like :func:`set_optimize_plans()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_optimize_plans = partial(_getter, _optimize_plans)
+"""see :func:`set_optimize_plans()`"""
+set_optimize_plans = partial(_tristate_set, _optimize_plans)
+"""
+When true, plans compiled :term:`fold <plan folding>` away their constant & identity operations.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
 solution_layered = partial(_tristate_armed, _layered_solution)
 """
 Like :func:`set_layered_solution()` as a context-manager, resetting back to old value.
@@ -206,6 +227,39 @@ def get_execution_pool() -> "Optional[Pool]":
     return _execution_pool.get()
 
 
+@contextmanager
+def prefetch_steps_plugged(nsteps: int):
+    """
+    Like :func:`set_prefetch_steps()` as a context-manager, resetting back to old value.
+
+    .. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+    """
+    resetter = _prefetch_steps.set(nsteps)
+    try:
+        yield
+    finally:
+        _prefetch_steps.reset(resetter)
+
+
+def set_prefetch_steps(nsteps: int):
+    """
+    Load :class:`.LazyInput` values in a background thread, that many :term:`steps` ahead.
+
+    :param nsteps:
+        if 0 (default), lazy inputs are loaded only when 1st needed;
+        applies only to :term:`sequential` executions.
+
+    :return:
+        a "reset" token (see :meth:`.ContextVar.set`)
+    """
+    return _prefetch_steps.set(nsteps)
+
+
+def get_prefetch_steps() -> int:
+    """see :func:`set_prefetch_steps()`"""
+    return _prefetch_steps.get()
+
+
 tasks_in_parallel = partial(_tristate_armed, _parallel_tasks)
 """
 (deprecated) Like :func:`set_parallel_tasks()` as a context-manager, resetting back to old value.
@@ -250,6 +304,40 @@ inputs & outputs with :mod:`dill`,  which might help for pickling problems.
 """
 
 
+tasks_fused = partial(_tristate_armed, _fuse_tasks)
+"""
+Like :func:`set_fuse_tasks()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_fuse_tasks = partial(_getter, _fuse_tasks)
+"""see :func:`set_fuse_tasks()`"""
+set_fuse_tasks = partial(_tristate_set, _fuse_tasks)
+"""
+Enable/disable :term:`fusion` of linear chains of :term:`parallel` operations into single tasks.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
+providers_raced = partial(_tristate_armed, _race_providers)
+"""
+Like :func:`set_race_providers()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_race_providers = partial(_getter, _race_providers)
+"""see :func:`set_race_providers()`"""
+set_race_providers = partial(_tristate_set, _race_providers)
+"""
+Enable/disable :term:`hedged <hedging>` execution of alternative providers of the same outputs.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
 operations_endured = partial(_tristate_armed, _endure_operations)
 """
 Like :func:`set_endure_operations()` as a context-manager, resetting back to old value.
@@ -292,3 +380,26 @@ Enable/disable globally :term:`rescheduling` for operations returning only *part
     a "reset" token (see :meth:`.ContextVar.set`)
 
 ."""
+
+
+def _execution_settings() -> tuple:
+    """
+    The current :term:`configurations` affecting executions & their solutions.
+
+    Used to key :term:`coalesced <coalescing>` computations;
+    the `execution pool` is reduced to whether one is plugged at all.
+    """
+    return (
+        _debug.get(),
+        _skip_evictions.get(),
+        _optimize_plans.get(),
+        _layered_solution.get(),
+        _execution_pool.get() is not None,
+        _prefetch_steps.get(),
+        _parallel_tasks.get(),
+        _marshal_tasks.get(),
+        _fuse_tasks.get(),
+        _race_providers.get(),
+        _endure_operations.get(),
+        _reschedule_operations.get(),
+    )
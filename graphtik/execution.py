@@ -2,14 +2,27 @@
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """:term:`execute` the :term:`plan` to derrive the :term:`solution`."""
 import logging
+import os
 import random
 import sys
 import time
+from bisect import bisect_left
 from collections import ChainMap, abc, defaultdict, namedtuple
 from contextvars import ContextVar, copy_context
 from functools import partial
 from itertools import chain
-from typing import Any, Callable, Collection, List, Mapping, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import networkx as nx
 from boltons.setutils import IndexedSet as iset
@@ -19,6 +32,7 @@ from .base import (
     AbortedException,
     IncompleteExecutionError,
     Items,
+    LazyInput,
     Operation,
     PlotArgs,
     Plottable,
@@ -27,17 +41,24 @@ from .base import (
     first_solid,
 )
 from .config import (
+    evictions_skipped,
     get_execution_pool,
+    get_prefetch_steps,
     is_abort,
     is_debug,
     is_endure_operations,
+    is_fuse_tasks,
     is_layered_solution,
     is_marshal_tasks,
     is_parallel_tasks,
+    is_race_providers,
     is_reschedule_operations,
     is_skip_evictions,
 )
+from .jsonpointer import resolve_path
 from .modifier import (
+    HCatAcc,
+    VCatAcc,
     acc_contains,
     acc_delitem,
     acc_getitem,
@@ -46,12 +67,18 @@ from .modifier import (
     dep_stripped,
     get_accessor,
     get_jsonp,
+    get_keyword,
+    is_optional,
     is_sfx,
+    is_vararg,
+    is_varargs,
 )
 from .planning import (
+    ChaindocsIndex,
     OpMap,
+    build_chaindocs_index,
     unsatisfied_operations,
-    yield_chaindocs,
+    yield_indexed_chaindocs,
     yield_node_names,
     yield_ops,
 )
@@ -62,6 +89,58 @@ from .planning import (
 log = logging.getLogger(__name__)
 
 
+def _jsonp_steps(key) -> Sequence[str]:
+    """The steps of a :term:`jsonp` `key` (or just the `key`), ``[""]`` for the root."""
+    steps = getattr(key, "_jsonp", None)
+    if not steps:
+        return (key,)
+    if steps[0] == "" and len(steps) > 1:  # absolute path
+        return steps[1:]
+    return steps
+
+
+def _jsonp_root(key) -> str:
+    """The 1st step of a :term:`jsonp` `key` (or the `key` itself), ``""`` for the root."""
+    return _jsonp_steps(key)[0]
+
+
+def _roots_overlap(roots1: set, roots2: set) -> bool:
+    """Whether any keys are written in both, or one writes in the solution's root."""
+    return bool("" in roots1 or "" in roots2 or not roots1.isdisjoint(roots2))
+
+
+def _check_concat_alignment(doc, pairs, axis: int) -> None:
+    """
+    Raise if the *pandas* values of `pairs` cannot concatenate along `axis` into `doc`.
+
+    Checks just what :func:`pandas.concat()` refuses, i.e. aligning
+    unequal, non-unique labels (of the other axis), without copying any data,
+    so that deferred :term:`pandas concatenation`\\s fail on their producing operation.
+    """
+    from .jsonpointer import is_ndframe
+
+    for key, value in pairs:
+        if not is_ndframe(value):
+            continue
+        target = resolve_path(doc, _jsonp_steps(key)[:-1], None)
+        if not is_ndframe(target):
+            continue
+        if axis == 1:
+            labels, target_labels = value.index, target.index
+        elif value.ndim == target.ndim == 2:
+            labels, target_labels = value.columns, target.columns
+        else:
+            continue
+        if not (labels.is_unique and target_labels.is_unique) and not labels.equals(
+            target_labels
+        ):
+            raise ValueError(
+                f"Cannot {'hcat' if axis else 'vcat'} {key!r}"
+                f" with unequal, non-unique {'index' if axis else 'columns'}:"
+                f"\n  +--value: {list(labels)}\n  +--target: {list(target_labels)}"
+            )
+
+
 def _isDebugLogging():
     return log.isEnabledFor(logging.DEBUG)
 
@@ -99,16 +178,62 @@ class Solution(ChainMap, Plottable):
     elapsed_ms = {}
     #: A unique identifier to distinguish separate flows in execution logs.
     solid: str
-    # FIXME: SPURIOUS dag reversals on multi-threaded runs (see below next assertion)!
-    #: Cloned from `plan` will be modified, by removing the downstream edges of:
-    #:
-    #: - any partial outputs not provided, or
-    #: - all `provides` of failed operations.
-    dag: nx.DiGraph
+    #: Privately cloned :attr:`dag`, or None while still sharing the plan's one.
+    _dag = None
     #: the plan that produced this solution
     plan = "ExecutionPlan"
     # optimization for the expensive :attr:`.overwrites` dictionary
     _overwrites_cache = None
+    #: :term:`pandas concatenation` updates (`update` accessor, pairs) not yet applied
+    #: (populated only when non-:term:`layer`\ed), and the root keys they write into;
+    #: see :meth:`_flush_concats()`.
+    _pending_concats = ()
+    _pending_roots = ()
+    #: When non-:term:`layer`\ed, the ``{root-step: [(op-outputs, jsonp-key), ...]}``
+    #: for the :term:`jsonp` outputs kept in :attr:`executed`, to drop them
+    #: along with their evicted :term:`superdoc`\s (see :meth:`_drop_subdoc_outputs()`).
+    _subdoc_outputs: Dict[str, List[Tuple[dict, str]]] = {}
+    #: The :term:`memory budget` (in bytes) for :meth:`_spill_over_budget()`,
+    #: set by :meth:`.ExecutionPlan.execute()`.
+    memory_budget: Optional[int] = None
+    #: The ``{(id(map), key): (map, key, size)}`` of the values counted against
+    #: the :attr:`memory_budget`, summing up to :attr:`_mem_total`.
+    _mem_sizes: Dict[Tuple[int, str], Tuple[dict, str, int]]
+    _mem_total = 0
+    #: The ``{(id(map), key): map}`` of the values (re)written since
+    #: the last :meth:`_spill_over_budget()`, to be (re)sized there.
+    _mem_dirty: Dict[Tuple[int, str], dict]
+    #: The ``{root-step: [(spilled, container, key, sub-steps), ...]}`` for the
+    #: placeholders of :term:`spill`\ed values, to reload them (see :meth:`_unspill()`).
+    _spilled: Dict[str, List[Tuple[Any, dict, Any, Sequence[str]]]] = {}
+    #: The ``{key: value}`` of values failed to :term:`spill` (e.g. unpicklable),
+    #: kept in memory & not counted against the :attr:`memory_budget`.
+    _unspillable: Dict[str, Any] = {}
+    #: The temporary folder with the :term:`spill` files, created on the 1st spill.
+    _spill_dir: Optional[str] = None
+    _n_spills = 0
+    #: The input keys with :class:`.LazyInput` values not loaded yet
+    #: (see :meth:`_load_lazy()`).
+    _lazy_keys = ()
+    #: The ``{input-key: future}`` of lazy inputs loading in the background
+    #: (see :meth:`_prefetch_lazy()`).
+    _prefetched: Dict[str, Any] = {}
+    #: A callable receiving ``(op, outputs)`` after each operation executed ok,
+    #: (see :meth:`.Pipeline.compute_iter()`).
+    _outputs_listener: Optional[Callable[[Operation, dict], None]] = None
+    #: A callable receiving the operations done, i.e. executed (ok or failed)
+    #: or canceled, as soon as they are (see :meth:`.ExecutionPlan._execute_thread_pool_barrier_method()`).
+    _done_listener: Optional[Callable[[Collection[Operation]], None]] = None
+    #: The ``{op: (src, dst) pairs}`` of the :term:`folded <plan folding>` conveyor ops
+    #: whose `needs` have not been computed yet (see :meth:`_convey_folded()`).
+    _pending_conveys: Dict[Operation, Tuple[Tuple[str, str], ...]]
+    #: The ``{op: alternative-providers}`` when :term:`hedging` (see :meth:`_cancel_race_losers()`).
+    _race_groups: Dict[Operation, Tuple[Operation, ...]]
+    #: The alternative providers canceled, when :term:`hedging`.
+    _race_losers = frozenset()
+    #: The ``{alternative-providers: queue}`` receiving each provider as its
+    #: pool task finishes, when :term:`hedging` (see :meth:`.ExecutionPlan._handle_race()`).
+    _race_queues: Dict[Tuple[Operation, ...], "queue.Queue"]
 
     def __init__(
         self,
@@ -117,6 +242,11 @@ class Solution(ChainMap, Plottable):
         callbacks: Tuple[Callable[["OpTask"], None], Callable[["OpTask"], None]] = None,
         is_layered=None,
     ):
+        lazy_keys = [k for k, v in input_values.items() if isinstance(v, LazyInput)]
+        if lazy_keys:
+            # Don't replace loaded values into user's inputs.
+            input_values = dict(input_values)
+            self._lazy_keys = set(lazy_keys)
         super().__init__(input_values)
         ## Make callbacks a 2-tuple with possible None callables.
         #
@@ -148,6 +278,8 @@ class Solution(ChainMap, Plottable):
         self.broken = {}
         self.elapsed_ms = {}
         self.solid = "%X" % random.randint(0, 2 ** 16)
+        self._mem_sizes = {}
+        self._mem_dirty = {}
 
         ## Cache context-var flags.
         #
@@ -155,13 +287,13 @@ class Solution(ChainMap, Plottable):
         self.is_reschedule = is_reschedule_operations()
         self.is_parallel = is_parallel_tasks()
         self.is_marshal = is_marshal_tasks()
-
-        # FIXME: SPURIOUS dag reversals on multi-threaded runs (see below next assertion)!
-        self.dag = plan.dag.copy()
-        # assert next(iter(dag.edges))[0] == next(iter(plan.dag.edges))[0]:
+        self._pending_conveys = {}
+        self._race_groups = plan._alternative_providers() if is_race_providers() else {}
+        self._race_queues = {}
 
     def copy(self):
         """Deep-copy user's `input_data` and pass the rest into a new Solution. """
+        self._flush_concats()
         named_inputs = dict(self.maps[-1])
         clone = type(self)(
             self.plan,
@@ -185,14 +317,49 @@ class Solution(ChainMap, Plottable):
             setattr(clone, p, val)
 
         ## Replicate layer setup in constructor, here
+        #  (copying layers, not to write into each other's).
         #
-        executed_ok = reversed(self.layers) if self.is_layered else ()
+        if self.is_layered:
+            clone.executed = {
+                op: v if isinstance(v, Exception) else dict(v)
+                for op, v in self.executed.items()
+            }
+            executed_ok = reversed(clone.layers)
+        else:
+            executed_ok = ()
         clone.maps = [*executed_ok, named_inputs]
 
         return clone
 
     __copy__ = copy
 
+    @property
+    def dag(self) -> nx.DiGraph:
+        """
+        The `plan`'s dag, cloned on 1st modification, by removing the downstream edges of:
+
+        - any partial outputs not provided, or
+        - all `provides` of failed operations.
+
+        Until then, it is the very same (read-only) :attr:`.ExecutionPlan.dag` instance,
+        so that successful runs never pay for copying the graph.
+        """
+        dag = self._dag
+        return self.plan.dag if dag is None else dag
+
+    @dag.setter
+    def dag(self, dag):
+        self._dag = None if dag is self.plan.dag else dag
+
+    def _writable_dag(self) -> nx.DiGraph:
+        """Clone the plan's dag (copy-on-write) before modifying it the 1st time."""
+        dag = self._dag
+        if dag is None:
+            # FIXME: SPURIOUS dag reversals on multi-threaded runs (see below next assertion)!
+            dag = self._dag = self.plan.dag.copy()
+            # assert next(iter(dag.edges))[0] == next(iter(plan.dag.edges))[0]:
+        return dag
+
     def __repr__(self):
         if is_debug():
             return self.debugstr()
@@ -230,10 +397,13 @@ class Solution(ChainMap, Plottable):
                 # don't send canceled SFXs as Inputs.
                 if not is_sfx(i) or self.get(i, True)
             ],
+            self.plan.chaindocs_index(),
         )
         # Minus executed, bc partial-out op might not have any provides left.
         newly_canceled = canceled.keys() - self.canceled.keys() - self.executed.keys()
         self.canceled.update((k, canceled[k]) for k in newly_canceled)
+        if self._done_listener and newly_canceled:
+            self._done_listener(newly_canceled)
 
         if log.isEnabledFor(logging.INFO):
             log.info(
@@ -245,11 +415,71 @@ class Solution(ChainMap, Plottable):
                 op.name,
             )
 
+    def _flush_concats(self, key=UNSET) -> None:
+        """
+        Apply any pending :term:`pandas concatenation`\\s, at once for each target.
+
+        :param key:
+            if given, flush only if it may read or write into a pending target
+            (shares the same root step)
+
+        Writing through :func:`.hcat()`/:func:`.vcat()` into a non-:term:`layer`\\ed
+        solution is deferred, so that the fragments produced by many operations
+        for the same target are concatenated with a single :func:`pandas.concat()`
+        (instead of a growing copy per operation), when 1st read, or at the end
+        of the execution; their fragments are checked when written
+        (see :func:`_check_concat_alignment()`), so that failures are
+        attributed to the producing operation.
+        """
+        pending = self._pending_concats
+        if not pending:
+            return
+        if key is not UNSET:
+            root = _jsonp_root(key)
+            if root and root not in self._pending_roots:
+                return
+
+        self._pending_concats = []
+        self._pending_roots = set()
+        self._overwrites_cache = None
+
+        ## Merge consecutive batches of the same accessor.
+        #
+        target_map = self.maps[0]
+        upd, pairs = pending[0]
+        pairs = list(pairs)
+        for next_upd, next_pairs in pending[1:]:
+            if next_upd is upd:
+                pairs.extend(next_pairs)
+            else:
+                upd(target_map, pairs)
+                upd, pairs = next_upd, list(next_pairs)
+        upd(target_map, pairs)
+
     def __contains__(self, key):
+        self._flush_concats(key)
+        if getattr(key, "_jsonp", None):
+            if self._spilled:
+                self._unspill(key)
+            if self._lazy_keys:
+                self._load_lazy(key)
         acc = acc_contains(key)
         return any(acc(m, key) for m in self.maps)
 
+    def __iter__(self):
+        self._flush_concats()
+        return super().__iter__()
+
+    def __len__(self):
+        self._flush_concats()
+        return super().__len__()
+
     def __getitem__(self, key):
+        self._flush_concats(key)
+        if self._spilled:
+            self._unspill(key)
+        if self._lazy_keys:
+            self._load_lazy(key)
         acc = acc_getitem(key)
         for mapping in self.maps:
             try:
@@ -259,11 +489,32 @@ class Solution(ChainMap, Plottable):
         return self.__missing__(key)
 
     def __setitem__(self, key, val):
+        self._flush_concats(key)
+        if getattr(key, "_jsonp", None):
+            if self._spilled:
+                self._unspill(key)
+            if self._lazy_keys:
+                self._load_lazy(key)
         self._overwrites_cache = None
         super().__setitem__(key, val)
 
     def __delitem__(self, key):
+        self._flush_concats(key)
         self._overwrites_cache = None
+        if self._spilled:
+            if len(_jsonp_steps(key)) > 1:
+                self._unspill(key)
+            else:
+                for spilled, *_ in self._spilled.pop(key, ()):
+                    spilled.discard()
+        if self._lazy_keys:
+            if len(_jsonp_steps(key)) > 1:
+                self._load_lazy(key)
+            elif key in self._lazy_keys:
+                self._lazy_keys.discard(key)
+                future = self._prefetched.pop(key, None)
+                if future:
+                    future.cancel()
 
         acc = acc_contains(key)
         matches = [m for m in self.maps if acc(m, key)]
@@ -273,6 +524,8 @@ class Solution(ChainMap, Plottable):
         acc = acc_delitem(key)
         for m in matches:
             acc(m, key)
+        if self.memory_budget is not None:
+            self._account_deleted(matches, key)
 
         ## Delete it from extra places when non-layered.
         #
@@ -281,6 +534,272 @@ class Solution(ChainMap, Plottable):
                 m.pop(key, None)
 
             self._initial_inputs.pop(key, None)
+            self._drop_subdoc_outputs(key)
+
+    def _drop_subdoc_outputs(self, key) -> None:
+        """
+        Pop from :attr:`executed` any :term:`jsonp` outputs under the deleted `key`,
+
+        or they would keep alive the values of evicted docs (non-layered only).
+        """
+        entries = self._subdoc_outputs.get(_jsonp_root(key))
+        if not entries:
+            return
+
+        steps = list(_jsonp_steps(key))
+        nsteps = len(steps)
+        kept = []
+        for outputs, k in entries:
+            if list(_jsonp_steps(k)[:nsteps]) == steps:
+                outputs.pop(k, None)
+            else:
+                kept.append((outputs, k))
+        entries[:] = kept
+
+    def _mark_mem_dirty(self, m: dict, keys) -> None:
+        """Mark the roots of `keys` in map `m` to be (re)sized against the :attr:`memory_budget`."""
+        dirty = self._mem_dirty
+        for k in keys:
+            root = _jsonp_root(k)
+            if root == "":
+                dirty.update(((id(m), r), m) for r in m)
+            else:
+                dirty[(id(m), root)] = m
+
+    def _account_deleted(self, maps, key) -> None:
+        """Subtract from :attr:`_mem_total` a `key` deleted from `maps` (or resize it if a subdoc)."""
+        if len(_jsonp_steps(key)) > 1:
+            self._mark_mem_dirty(maps[0], (key,))
+            for m in maps[1:]:
+                self._mark_mem_dirty(m, (key,))
+            return
+        for m in maps:
+            mk = (id(m), key)
+            self._mem_dirty.pop(mk, None)
+            counted = self._mem_sizes.pop(mk, None)
+            if counted:
+                self._mem_total -= counted[2]
+
+    def _spill_over_budget(self, step_idx: int) -> None:
+        """
+        :term:`Spill` values into files, while the solution exceeds its :attr:`memory_budget`.
+
+        :param step_idx:
+            the index in the plan's :attr:`~.ExecutionPlan.steps` of the operation
+            about to execute, whose needs are never spilled
+
+        Only the values written since the last call are sized, into a running total
+        (see :attr:`_mem_sizes`), and candidates are scanned only when it exceeds the budget.
+        Values are spilled in descending order of their size multiplied by the steps
+        until they are needed again, so the largest values needed the latest go first.
+        Given inputs are never spilled (the caller holds them anyway), neither
+        are any pending :term:`pandas concatenation` targets, nor values failing
+        to spill (e.g. unpicklable), and none of them count against the budget.
+        """
+        from .spill import Spilled, sizeof, spill
+
+        inputs = self.maps[-1] if self.is_layered else self._initial_inputs
+        unspillable = self._unspillable
+        pending_roots = self._pending_roots
+        sizes = self._mem_sizes
+
+        dirty = self._mem_dirty
+        if dirty:
+            for mk, m in list(dirty.items()):
+                k = mk[1]
+                if k in pending_roots:
+                    continue  # sized once flushed
+                del dirty[mk]
+                counted = sizes.pop(mk, None)
+                if counted:
+                    self._mem_total -= counted[2]
+                v = m.get(k, UNSET)
+                if (
+                    v is UNSET
+                    or isinstance(v, Spilled)
+                    or inputs.get(k, UNSET) is v
+                    or unspillable.get(k, UNSET) is v
+                ):
+                    continue
+                size = sizeof(v)
+                sizes[mk] = (m, k, size)
+                self._mem_total += size
+
+        excess = self._mem_total - self.memory_budget
+        if excess <= 0:
+            return
+
+        needed_at = self.plan._needed_at_steps()
+        nsteps = len(self.plan.steps)
+        candidates = []
+        for mk, (m, k, size) in sizes.items():
+            if k in pending_roots:
+                continue
+            uses = needed_at.get(k, ())
+            i = bisect_left(uses, step_idx)
+            next_use = uses[i] if i < len(uses) else nsteps
+            if next_use > step_idx:
+                candidates.append((size * (next_use - step_idx), size, mk, m, k))
+
+        if self._spill_dir is None:
+            import tempfile
+
+            self._spill_dir = tempfile.mkdtemp(prefix="graphtik-spill-")
+        if not self._spilled:
+            self._spilled = {}
+
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        for _cost, size, mk, m, k in candidates:
+            if excess <= 0:
+                break
+            del sizes[mk]
+            self._mem_total -= size
+            v = m.get(k, UNSET)
+            if v is UNSET or isinstance(v, Spilled):
+                continue
+            self._n_spills += 1
+            fpath = os.path.join(self._spill_dir, str(self._n_spills))
+            try:
+                spilled = spill(v, fpath, size)
+            except Exception as ex:
+                log.warning(
+                    "... (%s) kept '%s' in memory, failed to spill due to: %s",
+                    self.solid,
+                    k,
+                    ex,
+                )
+                if not self._unspillable:
+                    self._unspillable = {}
+                self._unspillable[k] = v
+                excess -= size
+                continue
+            places = self._spilled.setdefault(k, [])
+            m[k] = spilled
+            places.append((spilled, m, k, ()))
+
+            ## Replace also any references from `executed` when non-layered.
+            #
+            if not self.is_layered:
+                for outputs in self.layers:
+                    if outputs.get(k, UNSET) is v:
+                        outputs[k] = spilled
+                        places.append((spilled, outputs, k, ()))
+                for outputs, subkey in self._subdoc_outputs.get(k, ()):
+                    steps = _jsonp_steps(subkey)[1:]
+                    subval = outputs.get(subkey, UNSET)
+                    if subval is not UNSET and resolve_path(v, steps, UNSET) is subval:
+                        outputs[subkey] = spilled
+                        places.append((spilled, outputs, subkey, steps))
+            excess -= size
+            log.info(
+                "... (%s) spilled '%s' (%s bytes) into: %s",
+                self.solid,
+                k,
+                size,
+                spilled.path,
+            )
+
+    def _unspill(self, key=UNSET) -> None:
+        """
+        Reload any :term:`spill`\\ed values under the root of `key` (or all), where they were.
+
+        The files are kept until the end of the execution, in case they are memory-mapped.
+        """
+        spilled = self._spilled
+        root = UNSET if key is UNSET else _jsonp_root(key)
+        if root is UNSET or root == "":
+            roots = list(spilled)
+        elif root in spilled:
+            roots = (root,)
+        else:
+            return
+
+        for root in roots:
+            loaded = {}
+            for sp, container, k, steps in spilled.pop(root):
+                if container.get(k, UNSET) is sp:
+                    if sp in loaded:
+                        value = loaded[sp]
+                    else:
+                        value = loaded[sp] = sp.load()
+                    container[k] = resolve_path(value, steps) if steps else value
+                    if not steps and (self.is_layered or container is self.maps[0]):
+                        # e.g. memory-mapped arrays do not count.
+                        self._mem_dirty[(id(container), k)] = container
+
+    def _remove_spill_dir(self) -> None:
+        """Reload any :term:`spill`\\ed values, and delete their files."""
+        if self._spill_dir:
+            import shutil
+
+            self._unspill()
+            # Memory-mapped files remain accessible on POSIX, ignored on Windows.
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    def _materialize_streams(self) -> None:
+        """Replace any :term:`streaming` values left with their concatenated chunks."""
+        from .streaming import Stream
+
+        maps = self.maps if self.is_layered else (*self.maps, *self.layers)
+        for m in maps:
+            for k, v in list(m.items()):
+                if isinstance(v, Stream):
+                    m[k] = v.materialize()
+
+    def _snapshot(self) -> dict:
+        """A plain dict of all values, leaving any :class:`.LazyInput`\\s not loaded."""
+        self._flush_concats()
+        snapshot = {}
+        for m in reversed(self.maps):
+            snapshot.update(m)
+        return snapshot
+
+    def _load_lazy(self, key) -> None:
+        """Replace any :class:`.LazyInput` under the root of `key` with its loaded value."""
+        root = _jsonp_root(key)
+        if root == "":
+            keys = list(self._lazy_keys)
+        elif root in self._lazy_keys:
+            keys = (root,)
+        else:
+            return
+
+        inputs = self.maps[-1]
+        for k in keys:
+            self._lazy_keys.discard(k)
+            lazy = inputs.get(k)
+            if not isinstance(lazy, LazyInput):
+                continue
+            future = self._prefetched.pop(k, None)
+            log.info("... (%s) loading lazy input '%s'.", self.solid, k)
+            value = future.result() if future else lazy.loader()
+            for m in (inputs, self._initial_inputs):
+                if m.get(k) is lazy:
+                    m[k] = value
+
+    def _prefetch_lazy(self, step_idx: int, nsteps: int, pool) -> None:
+        """
+        Submit into `pool` the loaders of lazy inputs needed up to `nsteps` ahead.
+
+        :param step_idx:
+            the index in the plan's :attr:`~.ExecutionPlan.steps` of the operation
+            about to execute
+        """
+        needed_at = self.plan._needed_at_steps()
+        inputs = self.maps[-1]
+        for k in self._lazy_keys:
+            if k in self._prefetched:
+                continue
+            uses = needed_at.get(k, ())
+            i = bisect_left(uses, step_idx)
+            if i < len(uses) and uses[i] < step_idx + nsteps:
+                lazy = inputs.get(k)
+                if isinstance(lazy, LazyInput):
+                    if not self._prefetched:
+                        self._prefetched = {}
+                    log.debug("... (%s) prefetching lazy input '%s'.", self.solid, k)
+                    self._prefetched[k] = pool.submit(lazy.loader)
 
     def update(
         self,
@@ -309,6 +828,40 @@ class Solution(ChainMap, Plottable):
 
         target_map = self.maps[0]
 
+        ## Defer :term:`pandas concatenation`\s, unless layered,
+        #  or other values are written into their targets.
+        #
+        deferred = ()
+        if not self.is_layered:
+            concat_updates = (VCatAcc().update, HCatAcc().update)
+            roots = {
+                upd: {_jsonp_root(k) for k, _ in pairs}
+                for upd, pairs in update_groups.items()
+            }
+            concat_roots = set().union(
+                *(r for upd, r in roots.items() if upd in concat_updates)
+            )
+            other_roots = set().union(
+                *(r for upd, r in roots.items() if upd not in concat_updates)
+            )
+            if concat_roots and not _roots_overlap(concat_roots, other_roots):
+                deferred = [
+                    (upd, update_groups.pop(upd))
+                    for upd in list(update_groups)
+                    if upd in concat_updates
+                ]
+                for upd, pairs in deferred:
+                    _check_concat_alignment(
+                        target_map, pairs, concat_updates.index(upd)
+                    )
+
+            ## Apply pending concats before writing over their targets.
+            #
+            if self._pending_concats and update_groups:
+                applied_roots = set().union(*(roots[upd] for upd in update_groups))
+                if _roots_overlap(applied_roots, self._pending_roots):
+                    self._flush_concats()
+
         # First update keys without any :attr:`._accessor.update`,
         # to install any container-values in the "root" level.
         target_map.update(update_groups.pop(None, ()))
@@ -318,6 +871,13 @@ class Solution(ChainMap, Plottable):
         for upd, pairs in update_groups.items():
             upd(target_map, pairs)
 
+        if deferred:
+            if not self._pending_concats:
+                self._pending_concats = []
+                self._pending_roots = set()
+            self._pending_concats.extend(deferred)
+            self._pending_roots.update(*(roots[upd] for upd, _ in deferred))
+
     def _populate_op_layer_with_outputs(self, op, outputs) -> dict:
         """
         Installs & populates a new 1st chained-map, if layered, or use `named_inputs`.
@@ -332,6 +892,11 @@ class Solution(ChainMap, Plottable):
             assert len(self.maps) == 1, f"Broken non-layered sol? {locals()}"
             # Update just they keys, the values are in `input_names`.
             self.executed[op] = outputs
+            for k in outputs:
+                if getattr(k, "_jsonp", None):
+                    if not self._subdoc_outputs:
+                        self._subdoc_outputs = defaultdict(list)
+                    self._subdoc_outputs[_jsonp_root(k)].append((outputs, k))
 
         if outputs:
             self.update(outputs)
@@ -359,6 +924,10 @@ class Solution(ChainMap, Plottable):
             return dep_singularized(dep)
 
         self._populate_op_layer_with_outputs(op, outputs)
+        if self.memory_budget is not None and outputs:
+            self._mark_mem_dirty(self.maps[0], outputs)
+        if self._outputs_listener:
+            self._outputs_listener(op, outputs)
         if first_solid(self.is_reschedule, getattr(op, "rescheduled", None)):
             ## Find which provides have been broken?
             #
@@ -379,12 +948,98 @@ class Solution(ChainMap, Plottable):
             )
 
             if outs_to_break:
-                dag = self.dag
+                dag = self._writable_dag()
                 dag.remove_edges_from((op, out) for out in outs_to_break)
                 self._reschedule(dag, "rescheduled", op)
                 # list used by `check_if_incomplete()`
                 self.broken[op] = outs_to_break
 
+        if self._done_listener:
+            self._done_listener((op,))
+        if self._pending_conveys:
+            self._convey_folded()
+        if op in self._race_groups:
+            self._cancel_race_losers(op)
+
+    def _has_untried_alternatives(self, op) -> bool:
+        """
+        Whether alternative providers of `op` are left to try, when :term:`hedging`,
+
+        so that a failure of `op` falls through to them.
+        """
+        group = self._race_groups.get(op)
+        return bool(group) and any(
+            alt is not op and alt not in self.executed and alt not in self.canceled
+            for alt in group
+        )
+
+    def _cancel_race_losers(self, winner):
+        """
+        Cancel all alternative providers of `winner` not executed (yet), when :term:`hedging`.
+
+        Any alternatives that failed before `winner` (tried sequentially)
+        are not reported as failures, either.
+        """
+        group = self._race_groups[winner]
+        failed = [op for op in group if op is not winner and self.is_failed(op)]
+        if failed:
+            self._race_losers = self._race_losers.union(failed)
+        losers = [
+            op
+            for op in group
+            if op is not winner and op not in self.executed and op not in self.canceled
+        ]
+        if losers:
+            log.info(
+                "... (%s) op(%s) won the race, CANCELING alternative providers%s.",
+                self.solid,
+                winner.name,
+                [op.name for op in losers],
+            )
+            self.canceled.update((op, f"lost-race({winner.name})") for op in losers)
+            self._race_losers = self._race_losers.union(losers)
+            if self._done_listener:
+                self._done_listener(losers)
+
+    def _execute_folded(self):
+        """
+        Mark as executed the :term:`folded <plan folding>` operations of the :attr:`plan`,
+
+        populating (deep-copies of) the cached outputs of the `const` ones,
+        and then conveying any values already in the solution (the rest,
+        as soon as they are computed).
+
+        The `const` ops pass through the :term:`callbacks` and the failure handling
+        of the regular operations (e.g. :term:`endurance`), with their cached errors.
+        """
+        from copy import deepcopy
+
+        for op, outputs in self.plan._constant_outputs().items():
+            if op in self.canceled:  # a const op it needs has failed
+                continue
+            if not isinstance(outputs, Exception):
+                outputs = deepcopy(outputs)
+            task = OpTask(op, self, self.solid, result=outputs)
+            self.plan._handle_task(task, op, self)
+        self._pending_conveys = {
+            op: conveyed
+            for op, conveyed in self.plan.folded.items()
+            if conveyed is not None and op not in self.executed
+        }
+        self._convey_folded()
+
+    def _convey_folded(self):
+        """Copy values into the `provides` of pending folded conveyor ops, when ready."""
+        pending = self._pending_conveys
+        for op, conveyed in list(pending.items()):
+            if (
+                op in pending
+                and op not in self.canceled
+                and all(src in self for src, _dst in conveyed)
+            ):
+                del pending[op]
+                self.operation_executed(op, {dst: self[src] for src, dst in conveyed})
+
     def operation_failed(self, op, ex):
         """
         Invoked once per operation, with its results.
@@ -392,8 +1047,10 @@ class Solution(ChainMap, Plottable):
         It will update :attr:`executed` with the operation status and
         the :attr:`canceled` with the unsatisfied ops downstream of `op`.
         """
-        dag = self.dag
+        dag = self._writable_dag()
         self.executed[op] = ex
+        if self._done_listener:
+            self._done_listener((op,))
         dag.remove_edges_from(tuple(dag.out_edges(op)))
         self._reschedule(dag, "failure of", op)
 
@@ -411,6 +1068,7 @@ class Solution(ChainMap, Plottable):
         exist more than once, and values, all those values in a list, ordered
         in reverse compute order (1st is the last one computed, last (any) given-inputs).
         """
+        self._flush_concats()
         if self._overwrites_cache is not None:
             return self._overwrites_cache
 
@@ -432,11 +1090,20 @@ class Solution(ChainMap, Plottable):
         }
 
     def check_if_incomplete(self) -> Optional[IncompleteExecutionError]:
-        """Return a :class:`IncompleteExecutionError` if `pipeline` operations failed/canceled. """
+        """
+        Return a :class:`IncompleteExecutionError` if `pipeline` operations failed/canceled.
+
+        Alternative providers that lost a race when :term:`hedging` are not reported.
+        """
+        losers = self._race_losers
         failures = {
-            op: ex for op, ex in self.executed.items() if isinstance(ex, Exception)
+            op: ex
+            for op, ex in self.executed.items()
+            if isinstance(ex, Exception) and op not in losers
         }
-        incomplete = iset(chain(self.canceled, failures.keys()))
+        incomplete = iset(
+            op for op in chain(self.canceled, failures.keys()) if op not in losers
+        )
         if incomplete:
             incomplete = list(yield_node_names(incomplete))
             partial_msgs = {
@@ -473,6 +1140,157 @@ class Solution(ChainMap, Plottable):
         return plot_args
 
 
+class LazySolution(abc.Mapping):
+    """
+    A read-only :term:`solution` executing on 1st access just the operations needed for a key.
+
+    Returned by :meth:`.Pipeline.compute()` when ``lazy=True``, and then each key
+    is :term:`compile`\\d & :term:`execute`\\d separately, feeding as inputs
+    any values already computed, not to re-execute the operations producing them.
+
+    Its keys are the asked `outputs` of the original `plan`, or
+    (if none asked) all the given inputs & reachable `provides`;
+    the intermediate values computed by each execution are retained internally
+    (but not exposed) to feed the next ones, only while any keys still pending
+    depend on them, and are then :term:`evicted <eviction>` (from all :attr:`solutions`).
+
+    Failures while accessing keys are annotated & logged like those of
+    :meth:`.Pipeline.compute()` (see :mod:`.jetsam`).
+    """
+
+    #: The :term:`plan` compiled for all asked outputs, to validate them.
+    plan: "ExecutionPlan"
+    #: The :class:`.Solution` instances executed so far, in access order.
+    solutions: List[Solution]
+
+    def __init__(
+        self,
+        plan: "ExecutionPlan",
+        named_inputs: Mapping,
+        recompute_from: Items = None,
+        *,
+        predicate=None,
+        pipeline=None,
+        **execute_kw,
+    ):
+        self.plan = plan
+        #: The pipeline computing it, salvaged in the :mod:`.jetsam` of failures.
+        self.pipeline = pipeline
+        self.named_inputs = dict(named_inputs)
+        self.recompute_from = recompute_from
+        self.predicate = predicate
+        self.execute_kw = execute_kw
+        self.solutions = []
+
+        if plan.asked_outs:
+            self._keys = iset(plan.provides)
+        else:
+            self._keys = iset(chain(named_inputs, plan.provides))
+        #: The keys computed so far, and the intermediates needed by the keys pending,
+        #: fed to next executions.
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self._values:
+            return self._values[key]
+        if key in self.named_inputs:
+            return self.named_inputs[key]
+
+        known = {**self.named_inputs, **self._values}
+        pipeline, net = self.pipeline, self.plan.net  # jetsam
+        plan = solution = None
+        ok = False
+        try:
+            with evictions_skipped():
+                plan = net.compile(
+                    known.keys(), key, self.recompute_from, predicate=self.predicate
+                )
+                log.info("=== Lazily computing '%s', according to %s...", key, plan)
+                solution = plan.execute(known, key, **self.execute_kw)
+            ok = True
+        finally:
+            if not ok:
+                from .jetsam import save_jetsam
+
+                ex = sys.exc_info()[1]
+                jetsam = save_jetsam(
+                    ex,
+                    locals(),
+                    "plan",
+                    "solution",
+                    outputs="key",
+                    pipeline="pipeline",
+                    network="net",
+                )
+                try:
+                    jetsam.log_n_plot()
+                except Exception as ex2:
+                    log.warning(
+                        "Suppressed error while logging/plotting jetsam of %s: %s(%s)"
+                        "\n  +--annotations:%s",
+                        self,
+                        type(ex2).__name__,
+                        ex2,
+                        jetsam,
+                        exc_info=True,
+                    )
+        self.solutions.append(solution)
+        self._retain(solution)
+
+        return self._values[key]
+
+    def _retain(self, solution: Solution) -> None:
+        """
+        Keep the keys computed by `solution`, and any intermediates of keys still pending,
+
+        evicting the rest of its values (and intermediates no longer needed),
+        since nobody can ask for them anymore.
+        """
+        inputs, keys, values = self.named_inputs, self._keys, self._values
+        values.update(
+            (k, solution[k]) for k in solution if k in keys and k not in inputs
+        )
+        dag = self.plan.dag
+        needed = set()
+        for k in keys:
+            if k not in values and k not in inputs and k in dag:
+                needed.update(nx.ancestors(dag, k))
+        needed.update([_jsonp_root(k) for k in needed if isinstance(k, str)])
+
+        for k in list(solution):
+            if k in keys or k in inputs:
+                continue
+            if k in needed:
+                values[k] = solution[k]
+            else:
+                del solution[k]
+        for k in [k for k in values if k not in keys and k not in needed]:
+            del values[k]
+            for sol in self.solutions:
+                if k in sol:
+                    del sol[k]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        computed = [k for k in self._keys if k in self._values]
+        pending = [
+            k
+            for k in self._keys
+            if k not in self._values and k not in self.named_inputs
+        ]
+        return f"{type(self).__name__}(computed={computed}, pending={pending})"
+
+
 class OpTask:
     """
     Mimic :class:`concurrent.futures.Future` for :term:`sequential` execution.
@@ -532,6 +1350,56 @@ class OpTask:
 task_context: ContextVar[OpTask] = ContextVar("task_context")
 
 
+class FusedTask:
+    """
+    Compute a chain of operations sequentially, as a single :term:`fusion` task.
+
+    Called (in some pool worker) it returns a list of ``(outputs, elapsed_ms)``
+    for each operation executed, stopping on the 1st one failed,
+    with its exception in place of its `outputs`.
+    """
+
+    __slots__ = ("ops", "sol", "solid", "internals")
+
+    def __init__(self, ops, sol, solid, internals=()):
+        #: the chain of operations about to be computed, in order
+        self.ops = ops
+        #: the input values for the whole chain
+        self.sol = sol
+        #: the operation identity, like :attr:`OpTask.solid`
+        self.solid = solid
+        #: the outputs consumed only within the chain, not returned
+        self.internals = internals
+
+    def marshalled(self):
+        import dill
+
+        return dill.dumps(self)
+
+    def __call__(self):
+        sol = dict(self.sol)
+        results = []
+        for op in self.ops:
+            t0 = time.time()
+            try:
+                outputs = OpTask(op, sol, self.solid)()
+            except Exception as ex:
+                results.append((ex, round(1000 * (time.time() - t0), 3)))
+                break
+            sol.update(outputs)
+            internals = self.internals
+            if internals:
+                outputs = {k: v for k, v in outputs.items() if k not in internals}
+            results.append((outputs, round(1000 * (time.time() - t0), 3)))
+
+        return results
+
+    get = __call__
+
+    def __repr__(self):
+        return f"FusedTask({', '.join(op.name for op in self.ops)})"
+
+
 def _do_task(task):
     """
     Un-dill the *simpler* :class:`OpTask` & Dill the results, to pass through pool-processes.
@@ -554,7 +1422,11 @@ def _do_task(task):
 
 
 class ExecutionPlan(
-    namedtuple("ExecPlan", "net needs provides dag steps asked_outs comments"),  # noqa
+    namedtuple(
+        "ExecPlan",
+        "net needs provides dag steps asked_outs comments folded",
+        defaults=(None,),
+    ),  # noqa
     Plottable,
 ):
     """
@@ -588,12 +1460,238 @@ class ExecutionPlan(
     .. attribute:: comments
 
         an {op, prune-explanation} dictionary
+    .. attribute:: folded
+
+        the operations :term:`folded <plan folding>` away from the `steps`
+        (see :meth:`.Network._fold_operations()`), or None if not optimized
     """
 
     @property
     def graph(self):
         return self.dag
 
+    def chaindocs_index(self) -> ChaindocsIndex:
+        """The :func:`.build_chaindocs_index()` of the :attr:`dag` (cached)."""
+        index = self.__dict__.get("_chaindocs_index")
+        if index is None:
+            index = self.__dict__["_chaindocs_index"] = build_chaindocs_index(self.dag)
+        return index
+
+    def _compact_dag(self) -> "CompactDag":
+        """The :class:`.CompactDag` index of the :attr:`dag`, looked up while executing (cached)."""
+        cdag = self.__dict__.get("_compact_dag_cache")
+        if cdag is None:
+            from .graphcore import CompactDag
+
+            cdag = self.__dict__["_compact_dag_cache"] = CompactDag(self.dag)
+        return cdag
+
+    def _upstream_ops(self) -> Dict[Operation, Tuple[Operation, ...]]:
+        """The :meth:`.CompactDag.upstream_ops()` deciding when ops get scheduled (cached)."""
+        upstream = self.__dict__.get("_upstream_ops_cache")
+        if upstream is None:
+            upstream = self.__dict__[
+                "_upstream_ops_cache"
+            ] = self._compact_dag().upstream_ops()
+        return upstream
+
+    def _constant_outputs(self) -> Dict[Operation, dict]:
+        """
+        The ``{op: outputs-or-error}`` of the `const` ops :term:`folded <plan folding>`.
+
+        Successful outputs are computed once and cached, so solutions receive
+        deep-copies of them (see :meth:`Solution._execute_folded()`), while failed
+        ops are recomputed on every call (e.g. for transient errors).
+        """
+        cache = self.__dict__.get("_constant_outputs_cache")
+        if cache is None:
+            cache = self.__dict__["_constant_outputs_cache"] = {}
+        outputs, values = {}, {}
+        for op, conveyed in self.folded.items():
+            if conveyed is None:
+                outs = cache.get(op)
+                if outs is None:
+                    log.debug("... computing const op(%s).", op.name)
+                    try:
+                        outs = op.compute(values)
+                    except Exception as ex:
+                        outputs[op] = ex
+                        continue
+                    cache[op] = outs
+                outputs[op] = outs
+                values.update(outs)
+        return outputs
+
+    def _eviction_refcounts(self) -> Tuple[Dict[str, int], Dict[Operation, List[str]]]:
+        """
+        The number of consumer operations for each :term:`eviction` step (cached).
+
+        A :term:`doc chain` is consumed by the operations needing any doc in it,
+        like in :meth:`.Network._build_execution_steps()`.
+
+        :return:
+            a 2-tuple with ``{evicted-doc: n-consumers}`` & ``{op: [consumed-docs]}``
+        """
+        refcounts = self.__dict__.get("_eviction_refcounts_cache")
+        if refcounts is None:
+            dag = self._compact_dag()
+            chaindocs = self.chaindocs_index()
+            counts, consumed = {}, defaultdict(list)
+            for doc in self.steps:
+                if isinstance(doc, Operation) or doc in counts:
+                    continue
+                # Docs not in dag are the pruned provides, evicted once computed.
+                chain = chaindocs.get(doc, (doc,)) if doc in dag else ()
+                users = iset(
+                    op
+                    for d in chain
+                    for op in dag.successors(d)
+                    if isinstance(op, Operation)
+                )
+                counts[doc] = len(users)
+                for op in users:
+                    consumed[op].append(doc)
+            refcounts = self.__dict__["_eviction_refcounts_cache"] = (
+                counts,
+                dict(consumed),
+            )
+        return refcounts
+
+    def _alternative_providers(self) -> Dict[Operation, Tuple[Operation, ...]]:
+        """
+        The ``{op: alternatives}`` of operations providing the very same data (cached).
+
+        The `alternatives` (including `op`) are grouped by the outputs they provide
+        in the :attr:`dag`, and used for :term:`hedging`.
+        """
+        groups = self.__dict__.get("_alternative_providers_cache")
+        if groups is None:
+            dag = self._compact_dag()
+            by_outputs = defaultdict(list)
+            for op in yield_ops(self.steps):
+                by_outputs[frozenset(dag.successors(op))].append(op)
+            groups = self.__dict__["_alternative_providers_cache"] = {
+                op: tuple(ops)
+                for outs, ops in by_outputs.items()
+                if outs and len(ops) > 1
+                for op in ops
+            }
+        return groups
+
+    def _linear_chains(self) -> Dict[Operation, Tuple[Operation, ...]]:
+        """
+        The ``{head-op: chain}`` of operations feeding exactly one another (cached).
+
+        Each operation in a chain (but the 1st) is the only consumer of all
+        the `provides` of the previous one, which is its only producer
+        (any other `needs` must be plan inputs); operations with :term:`jsonp`
+        dependencies are not chained.
+        """
+        chains = self.__dict__.get("_linear_chains_cache")
+        if chains is None:
+            dag = self._compact_dag()
+
+            def is_plain(op):
+                return not any(get_jsonp(d) for d in (*op.needs, *op.provides))
+
+            def next_link(op):
+                consumers = {
+                    c for out in dag.successors(op) for c in dag.successors(out)
+                }
+                if len(consumers) == 1:
+                    (consumer,) = consumers
+                    if isinstance(consumer, Operation) and is_plain(consumer):
+                        producers = {
+                            p
+                            for need in dag.predecessors(consumer)
+                            for p in dag.predecessors(need)
+                        }
+                        if producers == {op}:
+                            return consumer
+
+            links = {}
+            for op in yield_ops(self.steps):
+                if is_plain(op):
+                    consumer = next_link(op)
+                    if consumer is not None:
+                        links[op] = consumer
+
+            chains = {}
+            for head in links.keys() - set(links.values()):
+                chain = [head]
+                while chain[-1] in links:
+                    chain.append(links[chain[-1]])
+                chains[head] = tuple(chain)
+            self.__dict__["_linear_chains_cache"] = chains
+
+        return chains
+
+    def _fused_chains(self, solution) -> Dict[Operation, Tuple[Operation, ...]]:
+        """
+        Split :meth:`_linear_chains()` around ops not eligible for :term:`fusion`.
+
+        Eligible are those to be submitted into the :term:`execution pool`,
+        and not :term:`reschedule`\\d.
+        """
+
+        def is_fusable(op):
+            return (
+                first_solid(solution.is_parallel, getattr(op, "parallel", None))
+                and not first_solid(
+                    solution.is_reschedule, getattr(op, "rescheduled", None)
+                )
+                and not getattr(op, "map_over", None)
+                and not getattr(op, "partitionable", None)
+            )
+
+        fused = {}
+        for chain in self._linear_chains().values():
+            run = []
+            for op in (*chain, None):
+                if op is not None and is_fusable(op):
+                    run.append(op)
+                    continue
+                if len(run) > 1:
+                    fused[run[0]] = tuple(run)
+                run = []
+
+        return fused
+
+    def _needed_at_steps(self) -> Dict[str, List[int]]:
+        """
+        The ``{root-step: [step-index, ...]}`` of the operations needing each doc (cached).
+
+        Used to :term:`spill` first the values needed the latest.
+        """
+        needed_at = self.__dict__.get("_needed_at_steps_cache")
+        if needed_at is None:
+            needed_at = defaultdict(list)
+            dag = self._compact_dag()
+            for i, op in enumerate(self.steps):
+                if isinstance(op, Operation):
+                    for need in dag.predecessors(op):
+                        indices = needed_at[_jsonp_root(need)]
+                        if not indices or indices[-1] != i:
+                            indices.append(i)
+            needed_at = self.__dict__["_needed_at_steps_cache"] = dict(needed_at)
+        return needed_at
+
+    def _expected_provides(self) -> set:
+        """
+        The stripped :attr:`provides` with their :term:`doc chain`\\s (cached).
+
+        A solution with perfect :term:`eviction`\\s must not contain anything else.
+        """
+        expected = self.__dict__.get("_expected_provides_cache")
+        if expected is None:
+            expected = self.__dict__["_expected_provides_cache"] = set(
+                dep_stripped(n)
+                for n in yield_indexed_chaindocs(
+                    self.chaindocs_index(), self.dag, self.provides
+                )
+            )
+        return expected
+
     def prepare_plot_args(self, plot_args: PlotArgs) -> PlotArgs:
         plot_args = plot_args.clone_or_merge_graph(self.net.graph)
         graph = plot_args.graph
@@ -689,20 +1787,66 @@ class ExecutionPlan(
         if is_abort():
             raise AbortedException(solution)
 
+    def _chain_internals(self, chain) -> set:
+        """The outputs of a :term:`fused <fusion>` `chain` consumed only within it, unless kept."""
+        if not self.asked_outs or is_skip_evictions():
+            return set()
+        expected = self._expected_provides()
+        dag = self._compact_dag()
+        return {
+            out
+            for op in chain[:-1]
+            for out in dag.successors(op)
+            if out not in expected
+        }
+
     def _prepare_tasks(
-        self, operations, solution, pool, global_parallel, global_marshal
+        self,
+        operations,
+        solution,
+        pool,
+        global_parallel,
+        global_marshal,
+        fused_chains=None,
     ) -> Union["Future", OpTask, bytes]:
         """
         Combine ops+inputs, apply :term:`marshalling`, and submit to :term:`execution pool` (or not) ...
 
          based on global/pre-op configs.
+
+        :param fused_chains:
+            the ``{head-op: chain}`` to :term:`fuse <fusion>` into a single
+            :class:`FusedTask`, when a head-op is in `operations`
         """
         ## Selectively DILL the *simpler* OpTask & `sol` dict
         #  so as to pass through pool-processes,
         #  (s)ee https://stackoverflow.com/a/24673524/548792)
         #  and handle results in this thread, to evade Solution locks.
         #
-        input_values = dict(solution)
+        if solution._lazy_keys:
+            ## Load just the lazy inputs needed by this batch.
+            #
+            for op in operations:
+                chain = fused_chains.get(op) if fused_chains else None
+                for o in chain or (op,):
+                    for need in o.needs:
+                        solution._load_lazy(need)
+        snapshot = solution._snapshot()
+
+        def task_inputs(ops) -> dict:
+            """
+            The values (or their root docs) needed by `ops`,
+
+            so that each value gets freed along with its last task (when evicted).
+            """
+            inputs = {}
+            for o in ops:
+                for need in o.needs:
+                    stripped = dep_stripped(need)
+                    for k in (need, stripped, _jsonp_root(stripped)):
+                        if k in snapshot:
+                            inputs[k] = snapshot[k]
+            return inputs
 
         def prep_task(op):
             ok = False
@@ -710,17 +1854,51 @@ class ExecutionPlan(
                 # Mark start time here, to include also marshalling overhead.
                 solution.elapsed_ms[op] = time.time()
 
-                task = OpTask(op, input_values, solution.solid)
-                if first_solid(global_marshal, getattr(op, "marshalled", None)):
+                chain = fused_chains.get(op) if fused_chains else None
+                if chain:
+                    task = FusedTask(
+                        chain,
+                        task_inputs(chain),
+                        solution.solid,
+                        self._chain_internals(chain),
+                    )
+                    is_marshal = any(
+                        first_solid(global_marshal, getattr(o, "marshalled", None))
+                        for o in chain
+                    )
+                else:
+                    task = OpTask(op, task_inputs((op,)), solution.solid)
+                    is_marshal = first_solid(
+                        global_marshal, getattr(op, "marshalled", None)
+                    )
+                if is_marshal:
                     task = task.marshalled()
 
-                if first_solid(global_parallel, getattr(op, "parallel", None)):
+                if first_solid(global_parallel, getattr(op, "parallel", None)) and not (
+                    getattr(op, "map_over", None) or getattr(op, "partitionable", None)
+                ):
+                    # Mapped & partitioned ops fan-out themselves into the pool.
                     if not pool:
                         raise RuntimeError(
                             "With `parallel` you must `set_execution_pool().`"
                         )
 
-                    task = pool.apply_async(_do_task, (task,))
+                    group = solution._race_groups.get(op)
+                    if group:
+                        # Let `_handle_race()` wait for any of the providers to finish.
+                        import queue
+
+                        finished = solution._race_queues.setdefault(
+                            group, queue.Queue()
+                        ).put
+                        task = pool.apply_async(
+                            _do_task,
+                            (task,),
+                            callback=lambda _res, op=op: finished(op),
+                            error_callback=lambda _ex, op=op: finished(op),
+                        )
+                    else:
+                        task = pool.apply_async(_do_task, (task,))
                 elif isinstance(task, bytes):
                     # Marshalled (but non-parallel) tasks still need `_do_task()`.
                     task = partial(_do_task, task)
@@ -737,10 +1915,79 @@ class ExecutionPlan(
 
         return [prep_task(op) for op in operations]
 
-    def _handle_task(self, future: Union[OpTask, "AsyncResult"], op, solution) -> None:
-        """Un-dill parallel task results (if marshalled), and update solution / handle failure."""
+    def _handle_race(self, contenders: List[Tuple[Operation, "AsyncResult"]], solution):
+        """
+        Handle the 1st successful of alternative providers running in the pool, ...
+
+        discarding the results of the rest (canceled when the winner is handled);
+        if all of them fail, they are handled as failures, in order.
+
+        The providers are received from the race queue as they finish
+        (see :meth:`_prepare_tasks()`), not to poll them.
+        """
+        finished = solution._race_queues[solution._race_groups[contenders[0][0]]]
+        pending = {op: fut for op, fut in contenders if op not in solution.canceled}
+        failed = set()
+        while pending:
+            op = finished.get()
+            future = pending.pop(op, None)
+            if future is None:  # canceled, or from a previous batch
+                continue
+            future.wait()  # its callback is called just before it is ready
+            if future.successful():
+                self._handle_task(future, op, solution)
+                for op in (*pending, *failed):
+                    # Failed or still running, results discarded.
+                    solution.elapsed_ms.pop(op, None)
+                return
+            failed.add(op)
+
+        for op, future in contenders:
+            if op in failed:
+                self._handle_task(future, op, solution)
+
+    def _handle_fused_task(self, future, chain, solution) -> None:
+        """
+        Un-dill the results of a :class:`FusedTask` and handle each op in the `chain`, ...
+
+        with the callbacks & elapsed time measured for it (in the worker).
+        """
+        results = future.get()
+        if isinstance(results, bytes):
+            import dill
+
+            results = dill.loads(results)
+
+        for op, (outputs, elapsed) in zip(chain, results):
+            if op in solution.canceled:
+                break
+            task = OpTask(op, solution, solution.solid, result=outputs)
+            self._handle_task(task, op, solution, op_elapsed_ms=elapsed)
+
+    def _handle_task(
+        self,
+        future: Union[OpTask, "AsyncResult"],
+        op,
+        solution,
+        op_elapsed_ms: float = None,
+        endured: bool = None,
+    ) -> None:
+        """
+        Un-dill parallel task results (if marshalled), and update solution / handle failure.
+
+        :param op_elapsed_ms:
+            if given, the time the (already computed) `future` took,
+            e.g. inside a :class:`FusedTask`
+        :param endured:
+            if true, a failure is :term:`endured <endurance>` regardless of configs,
+            e.g. when alternative providers are left to try, when :term:`hedging`
+        """
 
         def elapsed_ms(op):
+            if op_elapsed_ms is not None:
+                solution.elapsed_ms[op] = op_elapsed_ms
+                return op_elapsed_ms
+
             t0 = solution.elapsed_ms[op]
             solution.elapsed_ms[op] = elapsed = round(1000 * (time.time() - t0), 3)
 
@@ -758,6 +2005,9 @@ class ExecutionPlan(
                     solution.callbacks[0](future)
 
             outputs = result = future.get()
+            if isinstance(outputs, Exception):
+                # Failed already, inside a :class:`FusedTask`.
+                raise outputs
             if isinstance(outputs, bytes):
                 import dill
 
@@ -771,7 +2021,7 @@ class ExecutionPlan(
             )
         except Exception as ex:
             result = ex
-            is_endured = first_solid(
+            is_endured = endured or first_solid(
                 solution.is_endurance, getattr(op, "endured", None)
             )
             elapsed = elapsed_ms(op)
@@ -816,6 +2066,49 @@ class ExecutionPlan(
         pool = get_execution_pool()  # cache pool
         parallel = solution.is_parallel
         marshal = solution.is_marshal
+        fused_chains = self._fused_chains(solution) if is_fuse_tasks() else None
+
+        ## Evict docs as soon as their last consumer has executed (or got canceled),
+        #  by counting down their consumers (see `_eviction_refcounts()`).
+        #
+        upstream = self._upstream_ops()
+        refcounts, consumed = self._eviction_refcounts()
+        refcounts = dict(refcounts)
+        # Docs to check for eviction, starting with those without consumers.
+        evictable = {doc for doc, n in refcounts.items() if n == 0}
+        released = set()
+        # Ops done (e.g. folded or canceled ones, outside of the tasks handled).
+        done_ops = [*solution.executed, *solution.canceled]
+        solution._done_listener = done_ops.extend
+
+        def release():
+            while done_ops:
+                op = done_ops.pop()
+                if op in released:
+                    continue
+                released.add(op)
+                for doc in consumed.get(op, ()):
+                    refcounts[doc] -= 1
+                    if not refcounts[doc]:
+                        evictable.add(doc)
+                # Outputs without consumers are evicted whenever (re)computed.
+                outputs = solution.executed.get(op)
+                if isinstance(outputs, dict):
+                    evictable.update(k for k in outputs if refcounts.get(k) == 0)
+            while evictable:
+                doc = evictable.pop()
+                # An optional need may not have a value in the solution.
+                if doc in solution:
+                    if log.isEnabledFor(logging.INFO):
+                        log.info(
+                            "... (%s) evicting '%s' from solution%s.",
+                            solution.solid,
+                            doc,
+                            list(solution),
+                        )
+                    del solution[doc]
+
+        release()
 
         # with each loop iteration, we determine a set of operations that can be
         # scheduled, then schedule them onto a thread pool, then collect their
@@ -828,51 +2121,30 @@ class ExecutionPlan(
             # the upnext list contains a list of operations for scheduling
             # in the current round of scheduling
             upnext = []
+            # Race losers will never execute.
+            done = (
+                solution.executed.keys() | solution._race_losers
+                if solution._race_losers
+                else solution.executed
+            )
             # TODO: optimization: start batches from previous last op).
             for node in self.steps:
                 ## Determines if a Operation is ready to be scheduled for execution
-                #  based on what has already been executed.
+                #  based on what has already been executed (all its upstream ops,
+                #  which in turn waited for theirs).
                 if (
                     isinstance(node, Operation)
                     and node not in solution.executed
-                    and set(yield_ops(nx.ancestors(self.dag, node))).issubset(
-                        solution.executed
-                    )
+                    and all(op in done for op in upstream[node])
                 ):
                     if node not in solution.canceled:
                         upnext.append(node)
-                elif isinstance(node, str):
-                    # Only evict if all successors for the data node
-                    # have been executed.
-                    if (
-                        # An optional need may not have a value in the solution.
-                        node in solution
-                        and (
-                            # The 2nd eviction branch for unused provides.
-                            node not in self.dag.nodes
-                            # Scan node's successors in `broken_dag`, not to block
-                            # an op waiting for calced data already given as input.
-                            or set(self.dag.successors(node)).issubset(
-                                solution.executed
-                            )
-                        )
-                    ):
-                        if log.isEnabledFor(logging.INFO):
-                            log.info(
-                                "... (%s) evicting '%s' from solution%s.",
-                                solution.solid,
-                                node,
-                                list(solution),
-                            )
-                        del solution[node]
 
             # stop if no nodes left to schedule, exit out of the loop
             if not upnext:
-                ## Re-check evictions and assume all ops executed.
+                ## Evict the needs of canceled/failed ops, assuming all ops executed.
                 #  Sequenced executor has no such problem bc exhausts steps.
                 #
-                #  TODO: evictions for parallel are wasting loops.
-                #
                 for node in self.steps:
                     if isinstance(node, str) and node in solution:
                         del solution[node]
@@ -885,12 +2157,39 @@ class ExecutionPlan(
                     list(op.name for op in upnext),
                     list(solution),
                 )
-            tasks = self._prepare_tasks(upnext, solution, pool, parallel, marshal)
+            tasks = self._prepare_tasks(
+                upnext, solution, pool, parallel, marshal, fused_chains
+            )
 
-            ## Handle results.
+            ## Handle results, racing any alternative providers submitted in the pool.
             #
-            for op, task in zip(upnext, tasks):
-                self._handle_task(task, op, solution)
+            races = defaultdict(list)
+            for i, op in enumerate(upnext):
+                # Don't keep the inputs & results of handled tasks alive,
+                # while evicting them.
+                task, tasks[i] = tasks[i], None
+                chain = fused_chains.get(op) if fused_chains else None
+                if chain:
+                    self._handle_fused_task(task, chain, solution)
+                elif op in solution._race_groups and hasattr(task, "ready"):
+                    races[solution._race_groups[op]].append((op, task))
+                elif op in solution.canceled:
+                    # Lost the race to a provider handled earlier in this batch.
+                    solution.elapsed_ms.pop(op, None)
+                else:
+                    self._handle_task(
+                        task,
+                        op,
+                        solution,
+                        endured=solution._has_untried_alternatives(op),
+                    )
+                del task
+                release()
+            while races:
+                _group, contenders = races.popitem()
+                self._handle_race(contenders, solution)
+                del contenders
+                release()
 
     def _execute_sequential_method(self, solution: Solution):
         """
@@ -899,29 +2198,51 @@ class ExecutionPlan(
         :param solution:
             must contain the input values only, gets modified
         """
-        for step in self.steps:
-            self._check_if_aborted(solution)
-
-            if isinstance(step, Operation):
-                if step in solution.canceled:
-                    continue
+        budget = solution.memory_budget
+        prefetch_steps = solution._lazy_keys and get_prefetch_steps()
+        prefetch_pool = None
+        if prefetch_steps:
+            from concurrent.futures import ThreadPoolExecutor
 
-                task = OpTask(step, solution, solution.solid)
-                self._handle_task(task, step, solution)
+            prefetch_pool = ThreadPoolExecutor(thread_name_prefix="graphtik-prefetch")
 
-            elif isinstance(step, str):
-                # Cache value may be missing if it is optional.
-                if step in solution:
-                    log.info(
-                        "... (%s) evicting '%s' from solution%s.",
-                        solution.solid,
+        try:
+            for i, step in enumerate(self.steps):
+                self._check_if_aborted(solution)
+
+                if isinstance(step, Operation):
+                    if step in solution.canceled:
+                        continue
+
+                    if budget is not None:
+                        solution._spill_over_budget(i)
+                    if prefetch_pool and solution._lazy_keys:
+                        solution._prefetch_lazy(i, prefetch_steps, prefetch_pool)
+                    # Don't keep the task (and its results) alive while spilling.
+                    self._handle_task(
+                        OpTask(step, solution, solution.solid),
                         step,
-                        list(solution),
+                        solution,
+                        endured=solution._has_untried_alternatives(step),
                     )
-                    del solution[step]
 
-            else:
-                raise AssertionError(f"Unrecognized instruction.{step}")
+                elif isinstance(step, str):
+                    # Cache value may be missing if it is optional.
+                    if step in solution:
+                        log.info(
+                            "... (%s) evicting '%s' from solution%s.",
+                            solution.solid,
+                            step,
+                            list(solution),
+                        )
+                        del solution[step]
+
+                else:
+                    raise AssertionError(f"Unrecognized instruction.{step}")
+        finally:
+            if prefetch_pool:
+                # Any unused prefetches are still loaded when accessed.
+                prefetch_pool.shutdown(wait=False)
 
     def execute(
         self,
@@ -932,6 +2253,7 @@ class ExecutionPlan(
         callbacks: Tuple[Callable[[OpTask], None], ...] = None,
         solution_class=None,
         layered_solution=None,
+        memory_budget: int = None,
     ) -> Solution:
         """
         :param named_inputs:
@@ -961,6 +2283,9 @@ class ExecutionPlan(
               regardless of any *jsonp* dependencies.
             - If ``None``, layers are used only if there are NO :term:`jsonp` dependencies
               in the network.
+        :param memory_budget:
+            if given, the bytes above which solution values are :term:`spill`\\ed
+            into temporary files (:term:`sequential` execution only)
 
         :return:
             The :term:`solution` which contains the results of each operation executed
@@ -1007,6 +2332,16 @@ class ExecutionPlan(
                 callbacks,
                 is_layered=layered_solution,
             )
+            if self.folded:
+                solution._execute_folded()
+            if memory_budget is not None:
+                if in_parallel:
+                    log.warning(
+                        "Ignored memory-budget(%s) for parallel execution.",
+                        memory_budget,
+                    )
+                else:
+                    solution.memory_budget = memory_budget
 
             log.info(
                 "=== (%s) Executing pipeline(%s)%s%s, on inputs%s, according to %s...",
@@ -1021,8 +2356,22 @@ class ExecutionPlan(
             ok2 = False
             try:
                 executor(solution)
+                if "graphtik.streaming" in sys.modules:
+                    solution._materialize_streams()
+                solution._flush_concats()
                 ok2 = True
             finally:
+                if not ok2:
+                    try:
+                        solution._flush_concats()
+                    except Exception as ex:
+                        log.warning(
+                            "... (%s) dropped pending concatenations, due to: %s",
+                            solution.solid,
+                            ex,
+                            exc_info=is_debug(),
+                        )
+                solution._remove_spill_dir()
                 ## Log cumulative operations elapsed time.
                 #
                 if log.isEnabledFor(logging.INFO):
@@ -1038,11 +2387,7 @@ class ExecutionPlan(
             # Validate eviction was perfect
             #
             if evict:
-                expected_provides = set()
-                expected_provides.update(
-                    yield_chaindocs(dag, self.provides, expected_provides)
-                )
-                expected_provides = set(dep_stripped(n) for n in expected_provides)
+                expected_provides = self._expected_provides()
                 # It is a proper subset when not all outputs calculated.
                 assert set(solution).issubset(expected_provides), (
                     f"Evictions left more data{list(iset(solution) - set(self.provides))} than {self}!"
@@ -1058,3 +2403,183 @@ class ExecutionPlan(
 
                 ex = sys.exc_info()[1]
                 save_jetsam(ex, locals(), "solution")
+
+    def _codegen_unsupported(self) -> Optional[str]:
+        """Return why this plan cannot :meth:`codegen()`, or None if it can."""
+        from .fnop import FnOp
+
+        flags = {
+            "endure_operations": is_endure_operations(),
+            "reschedule_operations": is_reschedule_operations(),
+            "parallel_tasks": is_parallel_tasks(),
+            "marshal_tasks": is_marshal_tasks(),
+        }
+        flags = [k for k, v in flags.items() if v]
+        if flags:
+            return f"global flags{flags}"
+
+        for op in yield_ops(self.steps):
+            if not isinstance(op, FnOp) or not op.fn:
+                return f"not a function op({op.name})"
+            modes = "rescheduled endured parallel marshalled".split()
+            modes = [m for m in modes if getattr(op, m)]
+            if modes:
+                return f"{modes} op({op.name})"
+            deps = chain(op.needs, op.provides, op._fn_needs, op._fn_provides)
+            if any(get_jsonp(d) or get_accessor(d) for d in deps):
+                return f"jsonp/accessor dependencies in op({op.name})"
+
+    def codegen(self) -> Callable[[Mapping], dict]:
+        """
+        Generate a function running this plan's steps as straight-line python code.
+
+        Each operation's underlying function is called with local variables
+        holding the values, :term:`eviction`\\s become ``del`` statements,
+        and a dictionary with just the :attr:`provides` is returned
+        (or the `inputs` plus everything computed, if no outputs were asked),
+        without any :class:`.Solution` or :class:`.OpTask` overhead in between.
+
+        Not supported features, like :term:`reschedule`\\d, :term:`endured`,
+        :term:`parallel` or :term:`marshalled <marshalling>` operations, or :term:`jsonp`
+        dependencies (with any :term:`accessor`), make it fall back to a function
+        calling the regular :meth:`execute()`, converting its solution to a dict.
+
+        .. Note::
+            Configurations and the :term:`returns dictionary` attributes of operations
+            are read once, while generating the code;  :term:`abort run` and
+            :term:`callbacks` are not supported (they are, when falling back).
+
+        :return:
+            a function accepting a mapping of `named_inputs`, and returning
+            a dictionary of outputs;  the generated source-code is stored
+            in its ``__source__`` attribute (``None`` if fallen back).
+        """
+        reason = self._codegen_unsupported()
+        if reason:
+            log.info("Generic execution of %s due to %s.", self, reason)
+
+            def run_plan(named_inputs):
+                return dict(self.execute(named_inputs))
+
+            run_plan.__source__ = None
+            return run_plan
+
+        from .fnop import NO_RESULT, NO_RESULT_BUT_SFX
+
+        namespace = {
+            "NO_RESULT": NO_RESULT,
+            "NO_RESULT_BUT_SFX": NO_RESULT_BUT_SFX,
+            "validate": self.validate,
+        }
+        #: ``{data-name -> local-var}`` for all values ever assigned.
+        locvars = {}
+        #: data-names currently assigned (not evicted)
+        live = {}
+
+        def assign(name) -> str:
+            name = str(dep_stripped(name))
+            var = locvars.get(name)
+            if var is None:
+                var = locvars[name] = f"v{len(locvars)}"
+            live[name] = var
+            return var
+
+        def read(name) -> str:
+            return locvars[str(dep_stripped(name))]
+
+        lines = ["def run_plan(inputs):"]
+        if self.needs:
+            lines.append("    try:")
+            lines.extend(
+                f"        {assign(n)} = inputs[{str(n)!r}]" for n in self.needs
+            )
+            lines.extend(
+                ("    except KeyError:", "        validate(inputs)", "        raise")
+            )
+
+        for i, step in enumerate(self.steps):
+            if isinstance(step, str):
+                name = str(dep_stripped(step))
+                if name in live:
+                    lines.append(f"    del {live.pop(name)}")
+                continue
+
+            op = step
+            op.validate_fn_name()
+            namespace[f"op{i}"] = op
+            namespace[f"fn{i}"] = op.fn
+            fn_needs = op._fn_needs
+            lines.append(f"    # {op.name}")
+            if any(is_optional(n) or is_vararg(n) or is_varargs(n) for n in fn_needs):
+                ## Irregular needs are matched by the op itself.
+                #
+                needs = ", ".join(
+                    f"{str(n)!r}: {read(n)}"
+                    for n in iset(fn_needs)
+                    if str(dep_stripped(n)) in live
+                )
+                lines.append(
+                    f"    _a, _va, _kw = op{i}._match_inputs_with_fn_needs({{{needs}}})"
+                )
+                lines.append(f"    _r = fn{i}(*_a, *_va, **_kw)")
+            else:
+                args = [read(n) for n in fn_needs if not get_keyword(n)]
+                kwargs = [
+                    f"{get_keyword(n)!r}: {read(n)}" for n in fn_needs if get_keyword(n)
+                ]
+                if kwargs:
+                    args.append(f"**{{{', '.join(kwargs)}}}")
+                lines.append(f"    _r = fn{i}({', '.join(args)})")
+
+            fn_provides = [str(dep_stripped(p)) for p in op._fn_provides]
+            aliases = [
+                (str(dep_stripped(src)), str(dep_stripped(dst)))
+                for src, dst in (op.aliases or ())
+            ]
+            if op.returns_dict or not fn_provides:
+                ## Results (& aliases) zipped by the op itself.
+                #
+                lines.append(f"    _r = op{i}._zip_results_with_provides(_r)")
+                lines.extend(f"    {assign(p)} = _r[{p!r}]" for p in fn_provides)
+                lines.extend(f"    {assign(dst)} = _r[{dst!r}]" for _, dst in aliases)
+            else:
+                ## Irregular results are zipped by the op itself (e.g. to scream).
+                #
+                outs = ", ".join(assign(p) for p in fn_provides)
+                if len(fn_provides) == 1:
+                    lines.append(
+                        "    if _r is NO_RESULT or _r is NO_RESULT_BUT_SFX:"
+                        f" op{i}._zip_results_with_provides(_r)"
+                    )
+                    lines.append(f"    {outs} = _r")
+                else:
+                    lines.append(
+                        f"    if type(_r) is tuple and len(_r) == {len(fn_provides)}:"
+                    )
+                    lines.append(f"        {outs} = _r")
+                    lines.append("    else:")
+                    lines.append(f"        _r = op{i}._zip_results_with_provides(_r)")
+                    lines.append(
+                        f"        {outs} = {', '.join(f'_r[{p!r}]' for p in fn_provides)}"
+                    )
+                lines.extend(f"    {assign(dst)} = {read(src)}" for src, dst in aliases)
+
+        if self.asked_outs and not is_skip_evictions():
+            outs = (str(dep_stripped(n)) for n in self.provides)
+            outs = ", ".join(f"{n!r}: {live[n]}" for n in outs if n in live)
+            lines.append(f"    return {{{outs}}}")
+        else:
+            evicted = [n for n in locvars if n not in live]
+            outs = ", ".join(f"{n!r}: {var}" for n, var in live.items())
+            lines.append(f"    sol = {{**inputs, {outs}}}")
+            lines.extend(f"    sol.pop({n!r}, None)" for n in evicted)
+            lines.append("    return sol")
+
+        source = "\n".join(lines)
+        if _isDebugLogging():
+            log.debug("Generated code for %s:\n%s", self, source)
+        exec(compile(source, f"<codegen: {self}>", "exec"), namespace)
+        run_plan = namespace["run_plan"]
+        run_plan.__source__ = source
+
+        return run_plan
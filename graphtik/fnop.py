@@ -10,11 +10,13 @@
 """
 
 import logging
+import os
 import sys
 import textwrap
+from collections import Counter
 from collections import abc as cabc
 from functools import update_wrapper, wraps
-from typing import Any, Callable, Collection, List, Mapping, Sequence, Tuple
+from typing import Any, Callable, Collection, List, Mapping, Optional, Sequence, Tuple
 
 from boltons.setutils import IndexedSet as iset
 
@@ -32,9 +34,11 @@ from .base import (
     func_name,
 )
 from .modifier import (
+    JsonpAcc,
     dep_renamed,
     dep_singularized,
     dep_stripped,
+    get_accessor,
     get_jsonp,
     get_keyword,
     is_implicit,
@@ -51,6 +55,9 @@ from .modifier import (
 
 log = logging.getLogger(__name__)
 
+#: How each :attr:`.FnOp._fn_needs` binds into the underlying function arguments.
+_BIND_POSITIONAL, _BIND_KEYWORD, _BIND_VARARG, _BIND_VARARGS = range(4)
+
 #: A special return value for the function of a :term:`reschedule` operation
 #: signifying that it did not produce any result at all (including :term:`sideffects`),
 #: otherwise, it would have been a single result, ``None``.
@@ -346,6 +353,11 @@ class FnOp(Operation):
         parallel=None,
         marshalled=None,
         returns_dict=None,
+        streaming=None,
+        map_over=None,
+        partitionable=None,
+        pure=None,
+        const=None,
         node_props: Mapping = None,
     ):
         """
@@ -378,6 +390,20 @@ class FnOp(Operation):
         provides, _fn_provides = _process_dependencies(provides)
         alias_dst = aliases and tuple(dst for _src, dst in aliases)
         provides = iset((*provides, *alias_dst))
+        if map_over is not None:
+            mapped = next((n for n in _fn_needs if n == map_over), None)
+            if mapped is None:
+                raise ValueError(
+                    f"Operation `map_over`({map_over!r}) not in `needs`{list(_fn_needs)}!"
+                )
+            if is_vararg(mapped) or is_varargs(mapped):
+                raise ValueError(
+                    f"Operation `map_over`({map_over!r}) cannot be a *vararg(s)* need!"
+                )
+        if partitionable and map_over is not None:
+            raise ValueError(
+                f"Operation cannot be both `partitionable` and `map_over`({map_over!r})!"
+            )
 
         # TODO: enact conveyor fn if varargs in the outputs.
         if fn is None and name and len(_fn_needs) == len(_fn_provides):
@@ -462,6 +488,28 @@ class FnOp(Operation):
         #:
         #: Can be changed amidst execution by the operation's function.
         self.returns_dict = returns_dict
+        #: If true, the function receives any :term:`streaming` inputs as iterators
+        #: over their chunks, and any iterators it returns become :class:`.Stream`\s;
+        #: if a positive int (not ``True``), those are produced in a background thread,
+        #: buffering that many chunks ahead (see :mod:`.streaming`).
+        self.streaming = streaming
+        #: The name of a `need` with a collection (or a *pandas* groupby) whose items
+        #: are fed one by one into the function, :term:`fanning out <fan-out>`
+        #: in the :term:`execution pool` if :attr:`parallel`, and gathering the results.
+        self.map_over = map_over
+        #: If true, the function is row-wise independent, and when an :term:`execution pool`
+        #: is configured, its *pandas*/*numpy* inputs are :term:`partitioned <partitioning>`
+        #: into that many row-slices (if a positive int, not ``True``), or as many
+        #: as the CPUs (:func:`os.cpu_count()`), computed in the pool & concatenated back.
+        self.partitionable = partitionable
+        #: If true, the function has no side-effects and its results depend only
+        #: on its inputs, so any duplicates of this operation are eligible
+        #: for :term:`common-subexpression elimination` when composed with ``dedupe``.
+        self.pure = pure
+        #: If true, the results of the function never change (e.g. it has no `needs`,
+        #: or depends only on other `const` operations), so that optimized plans
+        #: compute it just once (see :term:`plan folding`).
+        self.const = const
         #: Added as-is into NetworkX graph, and you may filter operations by
         #: :meth:`.Pipeline.withset()`.
         #: Also plot-rendering affected if they match `Graphviz` properties,
@@ -469,6 +517,91 @@ class FnOp(Operation):
         #: unless they start with underscore(``_``).
         self.node_props = node_props
 
+        self._precompute_fn_plans()
+
+    def _precompute_fn_plans(self):
+        """
+        Prepare the "plans" to bind `inputs` into `fn` arguments, and to zip its results.
+
+        Invoked once on construction (and :meth:`withset()` clones, since they
+        are "private" fields), so that :meth:`compute()` does not have to re-evaluate
+        modifiers of dependencies on every call.
+        """
+        bindings = []
+        for n in self._fn_needs:
+            assert not is_sfx(n) and not is_implicit(n), locals()
+            keyword = get_keyword(n)
+            if keyword:
+                ## Keep jsut the last part from `jsonp`s.
+                #
+                steps = get_jsonp(keyword)
+                if steps:
+                    keyword = steps[-1]
+                kind = _BIND_KEYWORD
+            elif is_vararg(n):
+                kind = _BIND_VARARG
+            elif is_varargs(n):
+                kind = _BIND_VARARGS
+            else:
+                kind = _BIND_POSITIONAL
+            bindings.append((n, not is_optional(n), kind, keyword))
+        #: A tuple of ``(need, is_compulsory, bind-kind, keyword)``,
+        #: one for each :attr:`_fn_needs`.
+        self._fn_needs_bindings = tuple(bindings)
+        self._fn_needs_parents = self._group_jsonp_needs_by_parent()
+
+        fn_required = self._fn_provides
+        renames = {get_keyword(i): i for i in fn_required}  # +1 useless key: None
+        renames.pop(None, None)
+        #: The ``(fn-required-names, {fn-name -> provide}, sfx-provides)``
+        #: used when zipping results of :term:`returns dictionary` operations.
+        self._fn_dict_results_plan = (
+            tuple(get_keyword(i) or i for i in fn_required),
+            renames,
+            tuple(i for i in self.provides if is_sfx(i)),
+        )
+        #: The ``(stripped-alias-source, stripped-alias-destination)`` pairs.
+        self._fn_stripped_aliases = tuple(
+            (dep_stripped(src), dep_stripped(dst)) for src, dst in self.aliases or ()
+        )
+
+    def _group_jsonp_needs_by_parent(self) -> Optional[tuple]:
+        """
+        Find :term:`jsonp` needs sharing the same parent, to resolve it just once.
+
+        :return:
+            ``None`` if no 2 needs share a parent, or a tuple aligned with
+            :attr:`_fn_needs_bindings`, with ``(parent-dep, last-step)`` pairs
+            for the needs in such a group, ``None`` otherwise.
+        """
+        jsonp_acc = None
+        parents = []
+        for n in self._fn_needs:
+            steps = get_jsonp(n)
+            acc = get_accessor(n)
+            if steps and len(steps) > 1 and "" not in steps and acc:
+                if jsonp_acc is None:
+                    jsonp_acc = JsonpAcc()
+                if (acc.getitem, acc.contains) == (
+                    jsonp_acc.getitem,
+                    jsonp_acc.contains,
+                ):
+                    parents.append(tuple(steps[:-1]))
+                    continue
+            parents.append(None)
+
+        counts = Counter(p for p in parents if p)
+        if not any(c > 1 for c in counts.values()):
+            return None
+
+        from .jsonpointer import json_pointer
+
+        parent_deps = {p: modify(json_pointer(p)) for p, c in counts.items() if c > 1}
+        return tuple(
+            (parent_deps[p], get_jsonp(n)[-1]) if p in parent_deps else None
+            for n, p in zip(self._fn_needs, parents)
+        )
+
     def __repr__(self):
         """
         Display operation & dependency names annotated with :term:`diacritic`\\s.
@@ -504,8 +637,9 @@ class FnOp(Operation):
         endured = "!" if first_solid(is_endure_operations(), self.endured) else ""
         parallel = "|" if first_solid(is_parallel_tasks(), self.parallel) else ""
         marshalled = "&" if first_solid(is_marshal_tasks(), self.marshalled) else ""
+        streaming = "~" if self.streaming else ""
 
-        return f"FnOp{endured}{resched}{parallel}{marshalled}({', '.join(items)})"
+        return f"FnOp{endured}{resched}{parallel}{marshalled}{streaming}({', '.join(items)})"
 
     @property
     def deps(self) -> Mapping[str, Collection]:
@@ -535,6 +669,11 @@ class FnOp(Operation):
         parallel=...,
         marshalled=...,
         returns_dict=...,
+        streaming=...,
+        map_over=...,
+        partitionable=...,
+        pure=...,
+        const=...,
         node_props: Mapping = ...,
         renamer=None,
     ) -> "FnOp":
@@ -662,12 +801,39 @@ class FnOp(Operation):
     def _match_inputs_with_fn_needs(self, named_inputs) -> Tuple[list, list, dict]:
         positional, vararg_vals, kwargs = [], [], {}
         missing, varargs_bad = [], []
-        for n in self._fn_needs:
+
+        ## Resolve :term:`jsonp` needs under the same parent just once,
+        #  unless solution is :term:`layer`\ed (parent & child may differ in layers).
+        #
+        needs_parents = self._fn_needs_parents
+        if needs_parents and getattr(named_inputs, "is_layered", True) is not False:
+            needs_parents = None
+        if needs_parents:
+            from .jsonpointer import resolve_path
+
+            parent_docs = {}
+
+        for i, (n, is_compulsory, kind, keyword) in enumerate(self._fn_needs_bindings):
             try:
                 ok = False
-                assert not is_sfx(n) and not is_implicit(n), locals()
-                if n not in named_inputs:
-                    if not is_optional(n) or is_sfx(n):
+                inp_value = UNSET
+                if needs_parents and needs_parents[i]:
+                    parent, step = needs_parents[i]
+                    if parent in parent_docs:
+                        doc = parent_docs[parent]
+                    else:
+                        try:
+                            doc = named_inputs[parent]
+                        except KeyError:
+                            doc = UNSET
+                        parent_docs[parent] = doc
+                    if doc is not UNSET:
+                        inp_value = resolve_path(doc, (step,), UNSET)
+                elif n in named_inputs:
+                    inp_value = named_inputs[n]
+
+                if inp_value is UNSET:
+                    if is_compulsory:
                         # It means `inputs` < compulsory `needs`.
                         # Compilation should have ensured all compulsories existed,
                         # but ..?
@@ -675,23 +841,17 @@ class FnOp(Operation):
                         missing.append(n)
                     ok = True
                     continue
-                else:
-                    inp_value = named_inputs[n]
 
-                keyword = get_keyword(n)
-                if keyword:
-                    ## Keep jsut the last part from `jsonp`s.
-                    #
-                    steps = get_jsonp(keyword)
-                    if steps:
-                        keyword = steps[-1]
+                if kind == _BIND_POSITIONAL:
+                    positional.append(inp_value)
 
+                elif kind == _BIND_KEYWORD:
                     kwargs[keyword] = inp_value
 
-                elif is_vararg(n):
+                elif kind == _BIND_VARARG:
                     vararg_vals.append(inp_value)
 
-                elif is_varargs(n):
+                else:  # _BIND_VARARGS
                     if isinstance(inp_value, str) or not isinstance(
                         inp_value, cabc.Iterable
                     ):
@@ -699,8 +859,6 @@ class FnOp(Operation):
                     else:
                         vararg_vals.extend(i for i in inp_value)
 
-                else:
-                    positional.append(inp_value)
                 ok = True
             finally:
                 if not ok:
@@ -726,17 +884,12 @@ class FnOp(Operation):
                 f"\n  {debug_var_tip}"
             )
 
-        fn_required = self._fn_provides
-        if fn_required:
-            renames = {get_keyword(i): i for i in fn_required}  # +1 useless key: None
-            renames.pop(None, None)
-            fn_expected = fn_required = [get_keyword(i) or i for i in fn_required]
-        else:
-            fn_expected = fn_required = renames = ()
+        fn_expected, renames, sfx_provides = self._fn_dict_results_plan
+        fn_required = fn_expected
 
         if is_rescheduled:
             # Canceled sfx(ed) are welcomed.
-            fn_expected = iset([*fn_expected, *(i for i in self.provides if is_sfx(i))])
+            fn_expected = iset([*fn_expected, *sfx_provides])
 
         res_names = results.keys()
 
@@ -835,7 +988,7 @@ class FnOp(Operation):
                 {}
                 if results is NO_RESULT_BUT_SFX
                 # Cancel also any SFX.
-                else {p: False for p in set(self.provides) if is_sfx(p)}
+                else dict.fromkeys(self._fn_dict_results_plan[2], False)
             )
 
         elif not self._fn_provides:  # All provides were sideffects?
@@ -861,17 +1014,158 @@ class FnOp(Operation):
             results, cabc.Mapping
         ), f"Abnormal results type {type(results).__name__!r}: {results}!"
 
-        if self.aliases:
+        if self._fn_stripped_aliases:
             alias_values = [
-                (dep_stripped(dst), results[stripped_src])
-                for src, dst in self.aliases
-                for stripped_src in [dep_stripped(src)]
-                if stripped_src in results
+                (dst, results[src])
+                for src, dst in self._fn_stripped_aliases
+                if src in results
             ]
             results.update(alias_values)
 
         return results
 
+    def _consume_streams(self, positional, varargs, kwargs) -> Tuple[list, list, dict]:
+        """Fork any :class:`.Stream` inputs if :attr:`streaming`, or concatenate them."""
+        from .streaming import Stream
+
+        consume = Stream.fork if self.streaming else Stream.materialize
+
+        def unstream(value):
+            return consume(value) if isinstance(value, Stream) else value
+
+        return (
+            [unstream(v) for v in positional],
+            [unstream(v) for v in varargs],
+            {k: unstream(v) for k, v in kwargs.items()},
+        )
+
+    def _wrap_streams(self, results: dict) -> dict:
+        """Wrap any iterators returned into :class:`.Stream`\\s, when :attr:`streaming`."""
+        from .streaming import Stream
+
+        buffer = 0 if self.streaming is True else self.streaming
+        return {
+            k: Stream(v, buffer) if isinstance(v, cabc.Iterator) else v
+            for k, v in results.items()
+        }
+
+    def _map_over_items(self, named_inputs):
+        """
+        :term:`Fan-out <fan-out>` the function over the items of :attr:`map_over` input,
+
+        and gather their results (per `provides`) with :func:`_gather_results()`.
+        """
+        from collections import ChainMap
+
+        from .config import get_execution_pool, is_parallel_tasks
+
+        items = named_inputs[self.map_over]
+        keys = None
+        if _is_groupby(items):
+            keys, items = zip(*items) if len(items) else ((), ())
+        if "graphtik.streaming" in sys.modules:
+            from .streaming import Stream
+
+            if isinstance(items, Stream):
+                items = items.materialize()
+
+        ## Match inputs once, with a placeholder for the mapped item.
+        #
+        slot = object()
+        positional, varargs, kwargs = self._match_inputs_with_fn_needs(
+            ChainMap({self.map_over: slot}, named_inputs)
+        )
+        if "graphtik.streaming" in sys.modules:
+            positional, varargs, kwargs = self._consume_streams(
+                positional, varargs, kwargs
+            )
+        args = [*positional, *varargs]
+        arg_idx = next((i for i, v in enumerate(args) if v is slot), None)
+        kw_name = next((k for k, v in kwargs.items() if v is slot), None)
+
+        def bind(item):
+            if arg_idx is not None:
+                args[arg_idx] = item
+            else:
+                kwargs[kw_name] = item
+            return self.fn, tuple(args), dict(kwargs)
+
+        calls = [bind(i) for i in items]
+        if first_solid(is_parallel_tasks(), self.parallel):
+            pool = get_execution_pool()
+            if not pool:
+                raise RuntimeError("With `parallel` you must `set_execution_pool().`")
+            results = pool.starmap(_call_fn, calls)
+        else:
+            results = [_call_fn(*c) for c in calls]
+
+        return self._gather_per_provides(
+            results, lambda values: _gather_results(values, keys)
+        )
+
+    def _gather_per_provides(self, results: list, gather: Callable):
+        """Apply `gather` on the fanned-out `results` of each `provides` separately."""
+        if self.returns_dict:
+            return {
+                k: gather([r[k] for r in results])
+                for k in (results[0] if results else ())
+            }
+        if len(self._fn_provides) > 1:
+            return tuple(
+                gather(list(col))
+                for col in (zip(*results) if results else [()] * len(self._fn_provides))
+            )
+        return gather(results)
+
+    def _compute_partitions(self, pool, positional, varargs, kwargs):
+        """
+        Split the *pandas*/*numpy* arguments into row-slices and compute them in `pool`,
+
+        and :func:`_vcat_partitions()` their results (per `provides`).
+
+        :return:
+            the `fn` results, or :data:`.UNSET` if no arguments could be partitioned
+        """
+        from .jsonpointer import is_ndframe
+
+        args = [*positional, *varargs]
+        nargs = len(args)
+        values = [*args, *kwargs.values()]
+        sliced = [i for i, v in enumerate(values) if _is_row_sliceable(v)]
+        if not sliced:
+            return UNSET
+        nrows = {len(values[i]) for i in sliced}
+        if len(nrows) > 1:
+            raise ValueError(
+                f"Cannot partition inputs with unequal number of rows: {sorted(nrows)}"
+            )
+        (nrows,) = nrows
+
+        nparts = self.partitionable
+        if nparts is True:
+            nparts = os.cpu_count() or 1
+        nparts = min(nparts, nrows)
+        if nparts < 2:
+            return UNSET
+
+        step, extra = divmod(nrows, nparts)
+        bounds = [i * step + min(i, extra) for i in range(nparts + 1)]
+        calls = []
+        for start, stop in zip(bounds, bounds[1:]):
+            part = list(values)
+            for i in sliced:
+                v = values[i]
+                part[i] = v.iloc[start:stop] if is_ndframe(v) else v[start:stop]
+            calls.append(
+                (self.fn, tuple(part[:nargs]), dict(zip(kwargs, part[nargs:])))
+            )
+        log.debug(
+            "Op(%s) computing %i partitions of %i rows.", self.name, nparts, nrows
+        )
+        results = pool.starmap(_call_fn, calls)
+
+        return self._gather_per_provides(results, _vcat_partitions)
+
     def compute(
         self,
         named_inputs=None,
@@ -895,9 +1189,32 @@ class FnOp(Operation):
             if named_inputs is None:
                 named_inputs = {}
 
-            positional, varargs, kwargs = self._match_inputs_with_fn_needs(named_inputs)
-            results_fn = self.fn(*positional, *varargs, **kwargs)
+            if self.map_over is not None:
+                results_fn = self._map_over_items(named_inputs)
+            else:
+                positional, varargs, kwargs = self._match_inputs_with_fn_needs(
+                    named_inputs
+                )
+                if "graphtik.streaming" in sys.modules:
+                    positional, varargs, kwargs = self._consume_streams(
+                        positional, varargs, kwargs
+                    )
+                partitioned = UNSET
+                if self.partitionable:
+                    from .config import get_execution_pool
+
+                    pool = get_execution_pool()
+                    if pool:
+                        partitioned = self._compute_partitions(
+                            pool, positional, varargs, kwargs
+                        )
+                if partitioned is UNSET:
+                    results_fn = self.fn(*positional, *varargs, **kwargs)
+                else:
+                    results_fn = partitioned
             results_op = self._zip_results_with_provides(results_fn)
+            if self.streaming:
+                results_op = self._wrap_streams(results_op)
 
             outputs = astuple(outputs, "outputs", allowed_types=cabc.Collection)
 
@@ -957,6 +1274,77 @@ class FnOp(Operation):
         return plot_args
 
 
+def _is_groupby(obj) -> bool:
+    """Check if `obj` is a *pandas* groupby, without importing :mod:`pandas`."""
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(obj, pd.core.groupby.GroupBy)
+
+
+def _call_fn(fn, args, kwargs):
+    """Module-level, to be picklable into process pools."""
+    return fn(*args, **kwargs)
+
+
+def _gather_results(results: list, keys: Sequence = None):
+    """
+    Concatenate *pandas* `results`, or index them by the groupby `keys` (if given).
+
+    :return:
+        a concatenated *pandas* object, a :class:`pandas.Series` indexed by `keys`,
+        or the `results` list
+    """
+    from .jsonpointer import is_ndframe
+
+    if results and all(is_ndframe(r) for r in results):
+        import pandas as pd
+
+        return pd.concat(results)
+    if keys is not None:
+        import pandas as pd
+
+        return pd.Series(
+            results, index=pd.Index(keys), dtype=None if results else object
+        )
+    return results
+
+
+def _is_row_sliceable(obj) -> bool:
+    """Check for *pandas* objects or *numpy* arrays (not 0-d), without importing them."""
+    from .jsonpointer import is_ndframe
+
+    if is_ndframe(obj):
+        return True
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(obj, np.ndarray) and obj.ndim > 0
+
+
+def _vcat_partitions(parts: list):
+    """
+    Concatenate in order the results of row-partitions, like :func:`.vcat` does.
+
+    :raise ValueError:
+        if results are neither *pandas* objects nor *numpy* arrays
+        (the `fn` was not row-wise)
+    """
+    from .jsonpointer import _convey_axes_names, is_ndframe
+
+    if all(is_ndframe(p) for p in parts):
+        import pandas as pd
+
+        doc = pd.concat(parts, axis=0)
+        _convey_axes_names(doc, parts)
+        return doc
+    if all(_is_row_sliceable(p) for p in parts):
+        import numpy as np
+
+        return np.concatenate(parts)
+
+    raise ValueError(
+        f"Cannot concatenate partitioned results of non row-wise types: "
+        f"{sorted({type(p).__name__ for p in parts})}"
+    )
+
+
 def operation(
     fn: Callable = UNSET,
     name=UNSET,
@@ -970,6 +1358,11 @@ def operation(
     parallel=UNSET,
     marshalled=UNSET,
     returns_dict=UNSET,
+    streaming=UNSET,
+    map_over=UNSET,
+    partitionable=UNSET,
+    pure=UNSET,
+    const=UNSET,
     node_props: Mapping = UNSET,
 ) -> FnOp:
     r"""
@@ -1066,6 +1459,33 @@ def operation(
         if true, it means the `fn` :term:`returns dictionary` with all `provides`,
         and no further processing is done on them
         (i.e. the returned output-values are not zipped with `provides`)
+    :param streaming:
+        If true, the `fn` receives :term:`streaming` inputs as iterators over their
+        chunks, and any iterators (e.g. generators) it returns are consumed lazily,
+        chunk by chunk, by any other *streaming* operations downstream
+        (or concatenated for the rest);
+        if a positive int (not ``True``), those iterators are pulled in a background
+        thread, that many chunks ahead (bounded buffer), to overlap with their consumers.
+    :param map_over:
+        The name of a `need` (not a *vararg(s)*) with a collection (or a *pandas* groupby),
+        to :term:`fan-out` the `fn` over its items, gathering the results into lists
+        (or concatenated *pandas* objects); in :term:`parallel` if `parallel` is true.
+    :param partitionable:
+        If true, the `fn` must be row-wise independent, and when an :term:`execution pool`
+        is configured, its *pandas*/*numpy* inputs get :term:`partitioned <partitioning>`
+        into row-slices (as many as this int, if not ``True``, or the CPUs),
+        computed in the pool, and their results concatenated back in order,
+        like the :func:`.vcat` modifier does.
+    :param pure:
+        If true, the `fn` has no side-effects and its results depend only on its inputs,
+        so that any duplicates of this operation (same `fn` & `needs`) get eliminated,
+        when :func:`.compose()`\\d with ``dedupe=True``
+        (see :term:`common-subexpression elimination`).
+    :param const:
+        If true, the results of the `fn` never change (it has no `needs`,
+        or depends only on other `const` operations), so it is computed just once
+        per :term:`plan`, when :func:`.set_optimize_plans()` is enabled
+        (see :term:`plan folding`).
     :param node_props:
         Added as-is into NetworkX graph, and you may filter operations by
         :meth:`.Pipeline.withset()`.
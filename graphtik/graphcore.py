@@ -0,0 +1,116 @@
+# Copyright 2020-2020, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+A compact, integer-indexed & read-only index of a :term:`dag`, for the executor.
+
+An :class:`.ExecutionPlan` is still pruned & its :term:`steps` built on
+its :mod:`networkx` :attr:`~.ExecutionPlan.dag`; but while executing,
+the adjacencies consulted on every step (to count the consumers of values,
+or find the operations to schedule) are looked up in a :class:`CompactDag`,
+built once per plan, that numbers the nodes and keeps their adjacencies
+in (CSR) :class:`array.array`\\s, costing integer lookups only.
+
+Only the standard library is used (*numpy* is an optional dependency).
+"""
+from array import array
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+
+#: Bit of :attr:`CompactDag.node_flags` for operations (data-nodes have none).
+NODE_OP = 1
+
+
+class CompactDag:
+    """
+    The adjacencies of a :class:`networkx.DiGraph`, numbered in its iteration order.
+
+    .. attribute:: nodes
+
+        the tuple of the nodes, indexed by their numbers
+    .. attribute:: index
+
+        the ``{node: number}`` dictionary
+    .. attribute:: node_flags
+
+        the :data:`NODE_OP` bit of each node, as :class:`bytes`
+
+    No other node or edge attributes are kept.
+    """
+
+    __slots__ = (
+        "nodes",
+        "index",
+        "node_flags",
+        "_succ_ptr",
+        "_succ",
+        "_pred_ptr",
+        "_pred",
+    )
+
+    def __init__(self, graph: nx.DiGraph):
+        nodes = self.nodes = tuple(graph)
+        index = self.index = {n: i for i, n in enumerate(nodes)}
+        self.node_flags = bytes(
+            NODE_OP if data.get("typ") == 1 else 0 for _n, data in graph.nodes.items()
+        )
+
+        succ_ptr, succ = array("l", [0]), array("l")
+        for _src, successors in graph.succ.items():
+            succ.extend(index[dst] for dst in successors)
+            succ_ptr.append(len(succ))
+
+        pred_ptr, pred = array("l", [0]), array("l")
+        for _dst, predecessors in graph.pred.items():
+            pred.extend(index[src] for src in predecessors)
+            pred_ptr.append(len(pred))
+
+        self._succ_ptr, self._succ = succ_ptr, succ
+        self._pred_ptr, self._pred = pred_ptr, pred
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __repr__(self):
+        return f"CompactDag(x{len(self.nodes)} nodes, x{len(self._succ)} edges)"
+
+    def successors(self, node) -> List[Any]:
+        i = self.index[node]
+        nodes = self.nodes
+        return [nodes[j] for j in self._succ[self._succ_ptr[i] : self._succ_ptr[i + 1]]]
+
+    def predecessors(self, node) -> List[Any]:
+        i = self.index[node]
+        nodes = self.nodes
+        return [nodes[j] for j in self._pred[self._pred_ptr[i] : self._pred_ptr[i + 1]]]
+
+    def upstream_ops(self) -> Dict[Any, Tuple[Any, ...]]:
+        """
+        The ``{op: nearest-upstream-ops}``, reached backwards through data-nodes only.
+
+        When operations execute only after all their nearest upstream ones
+        have executed, these stand for all their ancestor operations.
+        """
+        nodes, node_flags = self.nodes, self.node_flags
+        pred_ptr, pred = self._pred_ptr, self._pred
+        upstream = {}
+        for i, flags in enumerate(node_flags):
+            if not flags & NODE_OP:
+                continue
+            seen, ups = set(), []
+            stack = list(pred[pred_ptr[i] : pred_ptr[i + 1]])
+            while stack:
+                j = stack.pop()
+                if j in seen:
+                    continue
+                seen.add(j)
+                if node_flags[j] & NODE_OP:
+                    ups.append(nodes[j])
+                else:
+                    stack.extend(pred[pred_ptr[j] : pred_ptr[j + 1]])
+            upstream[nodes[i]] = tuple(ups)
+
+        return upstream
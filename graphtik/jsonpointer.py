@@ -17,8 +17,9 @@ Copied from pypi/pandalone.
 import logging
 import operator
 import re
+import sys
 from collections import abc as cabc
-from functools import partial
+from functools import lru_cache, partial
 from typing import (
     Any,
     Collection,
@@ -33,15 +34,23 @@ from typing import (
     Union,
 )
 
-import numpy as np
-import pandas as pd
-from pandas.core.generic import NDFrame
-
 
 log = logging.getLogger(__name__)
 UNSET = "%%UNSET%%"  # Change this in case of troubles...
 
 
+def is_ndframe(obj) -> bool:
+    """
+    Check if `obj` is a pandas object, without importing :mod:`pandas`.
+
+    Any such object implies that :mod:`pandas` has already been imported by someone,
+    so that this module avoids importing it just for checking it
+    (which would add to the import time of :mod:`graphtik`).
+    """
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(obj, pd.core.generic.NDFrame)
+
+
 def escape_jsonpointer_part(part: str) -> str:
     """convert path-part according to the json-pointer standard"""
     return str(part).replace("~", "~0").replace("/", "~1")
@@ -162,27 +171,35 @@ def jsonp_path(jsonpointer: str) -> List[str]:
     if parts is False:
         parts = [jsonpointer]
     elif parts is None:
-        ## For empty-paths, the jsonpointer standard specifies
-        #  they must return the whole document (satisfied by `resolve_path()`)
-        #  but not what their *parts* should be.
-        if jsonpointer == "":
-            return []
-
-        parts = [
-            unescape_jsonpointer_part(part)
-            for part in re.sub(".+(?:/$|/{2})", "/", jsonpointer).split("/")
-        ]
-        try:
-            last_idx = -parts[::-1].index("") - 1 + len(parts)
-            parts = parts[last_idx:]
-        except ValueError:
-            pass  # no root after 1st step.
-        if "" in parts[1:]:
-            last_idx = len(parts) - 1 - parts[::-1].index("")
-            parts = parts[last_idx:]
+        # Optimization: plain strings are parsed once (copied, to be modifiable).
+        parts = list(_parse_jsonp_path(jsonpointer))
     return parts
 
 
+@lru_cache(maxsize=4096)
+def _parse_jsonp_path(jsonpointer: str) -> Tuple[str, ...]:
+    """The uncached :func:`.jsonp_path()` parsing for plain strings."""
+    ## For empty-paths, the jsonpointer standard specifies
+    #  they must return the whole document (satisfied by `resolve_path()`)
+    #  but not what their *parts* should be.
+    if jsonpointer == "":
+        return ()
+
+    parts = [
+        unescape_jsonpointer_part(part)
+        for part in re.sub(".+(?:/$|/{2})", "/", jsonpointer).split("/")
+    ]
+    try:
+        last_idx = -parts[::-1].index("") - 1 + len(parts)
+        parts = parts[last_idx:]
+    except ValueError:
+        pass  # no root after 1st step.
+    if "" in parts[1:]:
+        last_idx = len(parts) - 1 - parts[::-1].index("")
+        parts = parts[last_idx:]
+    return tuple(parts)
+
+
 class ResolveError(KeyError):
     """
     A :class:`KeyError` raised when a json-pointer does not :func:`resolve <.resolve_path>`.
@@ -224,6 +241,53 @@ def _log_overwrite(part, doc: Doc, child):
     )
 
 
+def _int_getitem(doc, part):
+    """The 2nd indexer of :func:`.resolve_path()`, for arrays."""
+    return doc[int(part)]
+
+
+_part_indexers = (operator.getitem, _int_getitem, getattr)
+_part_indexers_no_attrs = _part_indexers[:2]
+
+
+def _is_type_failure(ex: Exception) -> bool:
+    """
+    Whether an indexer failed due to the type of the doc (or the part) & not its contents.
+
+    i.e. indexing a list with a string, a scalar with anything, or a string into int,
+    so that trying again the same indexer for the same step on docs
+    of that same type is pointless.
+    """
+    return type(ex) is TypeError or (
+        type(ex) is ValueError and str(ex).startswith("invalid literal for int()")
+    )
+
+
+class _CompiledPath:
+    """
+    The parts of a json-pointer path, and the indexers that failed for each step.
+
+    Created by :func:`_compile_path()`, and used by :func:`.resolve_path()`
+    to skip the indexers that failed in previous resolutions of the same step
+    on a doc of the same type (instead of raising and logging them again).
+    """
+
+    __slots__ = ("parts", "failed_indexers")
+
+    def __init__(self, parts: Tuple[str, ...]):
+        self.parts = parts
+        #: ``{(step-index, doc-type) -> set(indexer-index)}``
+        self.failed_indexers = {}
+
+    def __repr__(self):
+        return f"_CompiledPath({self.parts!r})"
+
+
+@lru_cache(maxsize=4096)
+def _compile_path(parts: Tuple[str, ...]) -> _CompiledPath:
+    return _CompiledPath(parts)
+
+
 def resolve_path(
     doc: Doc,
     path: Union[str, Iterable[str]],
@@ -276,6 +340,8 @@ def resolve_path(
 
     **Examples:**
 
+        >>> import numpy as np, pandas as pd
+
         >>> dt = {
         ...     'pi':3.14,
         ...     'foo':'bar',
@@ -304,16 +370,18 @@ def resolve_path(
 
     :author: Julian Berman, ankostis
     """
-    part_indexers = [
-        operator.getitem,
-        lambda doc, part: doc[int(part)],
-        *((getattr,) if descend_objects else ()),
-    ]
+    part_indexers = _part_indexers if descend_objects else _part_indexers_no_attrs
 
     if root is UNSET:
         root = doc
 
     parts = jsonp_path(path) if isinstance(path, str) else path
+    try:
+        failed_indexers = _compile_path(tuple(parts)).failed_indexers
+    except TypeError:
+        # Unhashable parts (e.g. slices for pandas).
+        failed_indexers = {}
+    is_debug = log.isEnabledFor(logging.DEBUG)
     for i, part in enumerate(parts):
         if part == "":
             if root is None:
@@ -323,12 +391,18 @@ def resolve_path(
             doc = root
             continue
 
+        step_key = (i, type(doc))
+        skipped = failed_indexers.get(step_key, ())
         for ii, indexer in enumerate(part_indexers):
+            if ii in skipped:
+                continue
             try:
                 doc = indexer(doc, part)
                 break
             except Exception as ex:
-                if ii > 0:  # ignore int-indexing
+                if _is_type_failure(ex):
+                    failed_indexers.setdefault(step_key, set()).add(ii)
+                if is_debug and ii > 0:  # ignore int-indexing
                     log.debug(
                         "indexer %s failed on step (#%i)%s of json-pointer(%r) with doc(%s), due to: %s ",
                         indexer,
@@ -445,11 +519,9 @@ def collection_scouter(
     new_doc = None
     value = mother()
 
-    if (
-        concat_axis is not None
-        and isinstance(doc, NDFrame)
-        and isinstance(value, NDFrame)
-    ):
+    if concat_axis is not None and is_ndframe(doc) and is_ndframe(value):
+        import pandas as pd
+
         new_doc = pd.concat((doc, value), axis=concat_axis)
     else:
         doc[key] = value
@@ -618,7 +690,7 @@ def set_path_value(
 
 
 def _index_or_delay_concat(
-    doc: Doc, key: str, value, delayed_concats: Optional[list]
+    doc: Doc, key: str, value, delayed_concats: Optional[list], assigns: list
 ) -> None:
     """
     Set Indexed value, or delay :term:`pandas concatenation`, for the recurse parent to do it.
@@ -627,17 +699,48 @@ def _index_or_delay_concat(
         if given (not ``None``), pandas-concats are enabled and
         should add further values into it
         (may contain past values to be mass-concatenated by the caller)
+    :param assigns:
+        where to append the ``(key, value)`` pairs to be indexed,
+        to be mass-assigned by :func:`_assign_items()`, by the caller.
     """
-    if delayed_concats is None or not isinstance(doc, NDFrame):
-        doc[key] = value
+    if delayed_concats is None or not is_ndframe(doc):
+        assigns.append((key, value))
     else:
         ## Delay further concats or Index non-pandas value.
         #
-        if isinstance(value, NDFrame):
+        if is_ndframe(value):
             delayed_concats.append(value)
         else:
             assert not delayed_concats, f"Parent left delayed_concats? {locals()}"
-            doc[key] = value
+            assigns.append((key, value))
+
+
+def _assign_items(doc: Doc, assigns: list) -> None:
+    """
+    Index all `assigns` pairs into `doc`, with new dataframe columns added at once.
+
+    When `doc` is a dataframe receiving more than one new columns, they are
+    built into a dataframe aligned on its index, and assigned in place
+    with a single ``doc[new_cols] = new_df``, so any other references
+    to `doc` see them too.
+    """
+    if len(assigns) > 1 and type(doc).__name__ == "DataFrame" and is_ndframe(doc):
+        items = dict(assigns)
+        new_cols = [k for k in items if k not in doc]
+        if len(new_cols) > 1:
+            import warnings
+
+            import pandas as pd
+
+            new_df = pd.DataFrame({k: items[k] for k in new_cols}, index=doc.index)
+            with warnings.catch_warnings():
+                # Pandas inserts them one by one, consolidating blocks lazily.
+                warnings.simplefilter("ignore", pd.errors.PerformanceWarning)
+                doc[new_cols] = new_df
+            assigns = [(k, v) for k, v in items.items() if k not in new_df]
+
+    for key, value in assigns:
+        doc[key] = value
 
 
 def _convey_axes_names(doc, dfs_to_convey):
@@ -647,6 +750,8 @@ def _convey_axes_names(doc, dfs_to_convey):
     TODO: WORKAROUND pandas drop other index-names when concat with unequal axes!
     e.g. pandas#13475, 21629, 27053, 27230
     """
+    import pandas as pd
+
     for axis in (0, 1):
         doc_axis = doc.axes[axis]
         if not any(doc_axis.names):
@@ -657,19 +762,42 @@ def _convey_axes_names(doc, dfs_to_convey):
                     return
 
 
+def _build_paths_trie(paths_vals: Iterable[Tuple[List[str], Any]]) -> dict:
+    """
+    Nest the (path-parts, value) pairs as ``{part: [tip-values, {child-part: ...}]}``.
+
+    Child-parts are ordered as 1st met in `paths_vals`, and tip-values, as given.
+    """
+    trie = {}
+    for path, value in paths_vals:
+        assert len(path) >= 1, locals()
+        node = None
+        children = trie
+        for part in path:
+            node = children.get(part)
+            if node is None:
+                node = children[part] = [[], {}]
+            children = node[1]
+        node[0].append(value)
+
+    return trie
+
+
 def _update_paths(
     doc: Doc,
-    paths_vals: Collection[Tuple[List[str], Any]],
+    paths_trie: dict,
     container_factory,
     root: Doc,
     descend_objects,
     concat_axis,
 ) -> Optional[Doc]:
     """
-    (recursive) mass-update `path_vals` (jsonp, value) pairs into doc, with ..
+    (recursive) mass-update the trie of (jsonp, value) pairs into doc, with ..
 
     special treatment for :term:`pandas concatenation`.
 
+    :param paths_trie:
+        as built by :func:`_build_paths_trie()`
     :param concat_axis:
         either 0, 1 or None, in which case, it concatenates only when
         both doc & value are DataFrames
@@ -679,71 +807,74 @@ def _update_paths(
     FIXME: ROOT in mass-update_paths NOT IMPLEMENTED
     FIXME: SET_OBJECT_ATTR in mass-update_paths NOT IMPLEMENTED
     """
-    #: A `group` is a subset of the paths iterated below
-    #: that have a common "prefix", i.e. their 1st step,
-    #: seen as "root" for each recursed call.
-    group: List[Tuple[str, Any]] = ()  # Begin with a blocker value.
-    #: The `last_prefix` & `next_prefix` detect when group's 1st step
-    #: has changed while iterating (path, value) pairs
-    #: (meaning we have proceeded to the next `group)`.
-    last_prefix = None
     #: Consecutive Pandas values to mass-concat.
     delayed_concats: list = None if concat_axis is None else []
-    for i, (path, value) in enumerate((*paths_vals, ((UNSET,), UNSET))):
-        assert len(path) >= 1 or value is UNSET, locals()
+    #: Tip values to mass-index.
+    assigns = []
 
-        ## Concate any delayed values.
-        #
-        if delayed_concats and (len(path) > 1 or not isinstance(value, NDFrame)):
-            assert concat_axis is not None and isinstance(
-                doc, NDFrame
-            ), f"Delayed without permission? {locals}"
+    def flush(doc) -> Doc:
+        """Assign pending tips, and then concat any delayed values."""
+        nonlocal assigns, delayed_concats
+
+        if assigns:
+            _assign_items(doc, assigns)
+            assigns = []
+
+        if delayed_concats:
+            import pandas as pd
+
+            assert concat_axis is not None and is_ndframe(
+                doc
+            ), f"Delayed without permission? {locals()}"
             delayed_concats = (doc, *delayed_concats)
             doc = pd.concat(delayed_concats, axis=concat_axis)
             _convey_axes_names(doc, delayed_concats)
 
             delayed_concats = None
 
-        next_prefix = path[0]
-        if next_prefix != last_prefix:
-            if len(path) == 1 and value is not UNSET:
-                # Assign "tip" value of the before proceeding to the next group,
-                # THOUGH if a deeper path with this same prefix follows,
-                # it will overwrite the value just written.
-                _index_or_delay_concat(doc, next_prefix, value, delayed_concats)
-            else:
-                if last_prefix:  # Is it past the 1st loop?
-                    child = None
-                    if last_prefix in doc:
-                        child = doc[last_prefix]
-                        if not is_collection(child):
-                            _log_overwrite(last_prefix, doc, child)
-                            child = None
-
-                    if child is None:
-                        child = doc[last_prefix] = container_factory()
-
-                    ## Recurse into collected sub-group.
-                    #
-                    sub_group = [(path[1:], value) for path, value in group]
-                    new_child = _update_paths(
-                        child,
-                        sub_group,
-                        container_factory,
-                        root,
-                        descend_objects,
-                        concat_axis,
-                    )
-                    if new_child is not None:
-                        doc[last_prefix] = new_child
-
-                # prepare the next group
-                last_prefix, group = (next_prefix, [(path, value)])
-        else:
-            assert len(path) > 1, locals()  # shortest path switches group.
-            group.append((path, value))  # pylint: disable=no-member
+        return doc
+
+    for prefix, (tip_values, children) in paths_trie.items():
+        for value in tip_values:
+            if delayed_concats and not is_ndframe(value):
+                doc = flush(doc)
+            # Assign "tip" value of the before proceeding to deeper paths,
+            # THOUGH if a deeper path with this same prefix follows,
+            # it will overwrite the value just written.
+            _index_or_delay_concat(doc, prefix, value, delayed_concats, assigns)
+
+        if children:
+            if delayed_concats:
+                doc = flush(doc)
+            elif assigns:
+                _assign_items(doc, assigns)
+                assigns = []
+
+            if prefix:  # Not root.
+                child = None
+                if prefix in doc:
+                    child = doc[prefix]
+                    if not is_collection(child):
+                        _log_overwrite(prefix, doc, child)
+                        child = None
+
+                if child is None:
+                    child = doc[prefix] = container_factory()
+
+                ## Recurse into sub-trie.
+                #
+                new_child = _update_paths(
+                    child,
+                    children,
+                    container_factory,
+                    root,
+                    descend_objects,
+                    concat_axis,
+                )
+                if new_child is not None:
+                    doc[prefix] = new_child
 
-    return doc
+    return flush(doc)
 
 
 def update_paths(
@@ -769,7 +900,12 @@ def update_paths(
         root = doc
     pvs = [(jsonp_path(p), v) for p, v in sorted(paths_vals, key=lambda pv: pv[0])]
     new_doc = _update_paths(
-        doc, pvs, container_factory, root, descend_objects, concat_axis
+        doc,
+        _build_paths_trie(pvs),
+        container_factory,
+        root,
+        descend_objects,
+        concat_axis,
     )
     if new_doc is not doc:
         # Changed-doc would be lost in vain...
@@ -843,6 +979,8 @@ def pop_path(
 
     **Examples:**
 
+        >>> import numpy as np, pandas as pd
+
         >>> dt = {
         ...     'pi':3.14,
         ...     'foo':'bar',
@@ -31,12 +31,14 @@ utilize a combination of these **diacritics**:
 import enum
 from functools import lru_cache, partial
 import operator
+import weakref
 from typing import (
     Any,
     Callable,
     Collection,
     Iterable,
     List,
+    Mapping,
     NamedTuple,
     Optional,
     Tuple,
@@ -99,6 +101,16 @@ class _Optionals(enum.Enum):
     varargs = 3
 
 
+#: Bits of :attr:`._Modifier._flags`, for the predicates to test them at once
+#: (``SFX`` marks both :term:`sideffects` & :term:`sideffected`).
+_FLAG_OPTIONAL = 1
+_FLAG_VARARG = 2
+_FLAG_VARARGS = 4
+_FLAG_SFX = 8
+_FLAG_SFXED = 16
+_FLAG_IMPLICIT = 32
+
+
 class Accessor(NamedTuple):
     """
     Getter/setter functions to extract/populate values from a :term:`solution layer`.
@@ -195,8 +207,27 @@ class _Modifier(str):
     .. Note::
         Factory function:func:`_modifier()` may return a plain string, if no other
         arg but ``name`` is given.
+
+    .. Note::
+        Identical instances are shared (interned), so they have no ``__dict__``
+        to set arbitrary attributes on; modifiers given extra `kw` are constructed
+        as (never interned) :class:`_ExtModifier` instead.
     """
 
+    __slots__ = (
+        "_repr",
+        "_func",
+        "_keyword",
+        "_optional",
+        "_accessor",
+        "_sideffected",
+        "_sfx_list",
+        "_jsonp",
+        "_implicit",
+        "_flags",
+        "__weakref__",  # for interning
+    )
+
     #: pre-calculated representation
     _repr: str
     #: The name of a modifier function here, needed to reconstruct
@@ -204,17 +235,17 @@ class _Modifier(str):
     _func: str
     #: Map my name in `needs` into this kw-argument of the function.
     #: :func:`get_keyword()` returns it.
-    _keyword: str = None
+    _keyword: str
     #: required is None, regular optional or varargish?
     #: :func:`is_optional()` returns it.
     #: All regulars are `keyword`.
-    _optional: _Optionals = None
+    _optional: _Optionals
     #: An :term:`accessor` with getter/setter functions to read/write solution values.
     #: Any sequence of 2-callables will do.
-    _accessor: Accessor = None
+    _accessor: Accessor
     #: Has value only for sideffects: the pure-sideffect string or
     #: the existing :term:`sideffected` dependency.
-    _sideffected: str = None
+    _sideffected: str
     #: At least one name(s) denoting the :term:`sideffects` modification(s) on
     #: the :term:`sideffected`, performed/required by the operation.
     #:
@@ -222,7 +253,15 @@ class _Modifier(str):
     #:    and :func:`is_pure_optional()` returns True.
     #: - If not empty :func:`is_sfxed()` returns true
     #:   (the :attr:`._sideffected`).
-    _sfx_list: Tuple[Union[str, None]] = ()
+    _sfx_list: Tuple[Union[str, None]]
+    #: The :term:`jsonp` steps, or falsy if not a json pointer path.
+    #: :func:`get_jsonp()` returns it.
+    _jsonp: List[str]
+    #: :func:`is_implicit()` returns it.
+    _implicit: bool
+    #: A bitmask of ``_FLAG_XXX`` constants summarizing all the above,
+    #: for the predicates to answer with a single test.
+    _flags: int
 
     def __new__(
         cls,
@@ -271,19 +310,35 @@ class _Modifier(str):
         obj = super().__new__(cls, name)
         obj._repr = _repr
         obj._func = _func
-        if keyword:
-            obj._keyword = keyword
+        obj._keyword = keyword or None
+        obj._optional = optional or None
+        obj._accessor = accessor or None
+        obj._sideffected = sideffected or None
+        obj._sfx_list = sfx_list or ()
+        obj._jsonp = obj._implicit = None
+        for k, v in kw.items():
+            setattr(obj, k, v)
+
+        flags = 0
         if optional:
-            obj._optional = optional
-        if accessor:
-            obj._accessor = accessor
+            flags |= _FLAG_OPTIONAL
+            if optional == _Optionals.vararg:
+                flags |= _FLAG_VARARG
+            elif optional == _Optionals.varargs:
+                flags |= _FLAG_VARARGS
         if sideffected:
-            obj._sideffected = sideffected
-        if sfx_list:
-            obj._sfx_list = sfx_list
-        vars(obj).update(kw)
+            flags |= _FLAG_SFX | _FLAG_SFXED if sfx_list else _FLAG_SFX
+        if obj._implicit:
+            flags |= _FLAG_IMPLICIT
+        obj._flags = flags
+
         return obj
 
+    def _attrs(self) -> Iterable[Tuple[str, Any]]:
+        """The ``(attr, value)`` pairs given to the constructor (slotted & extra ones)."""
+        yield from ((k, getattr(self, k)) for k in _Modifier.__slots__[:-2])
+        yield from getattr(self, "__dict__", {}).items()
+
     def __repr__(self):
         """Note that modifiers have different ``repr()`` from ``str()``."""
         return self._repr
@@ -317,6 +372,10 @@ class _Modifier(str):
         )
 
 
+class _ExtModifier(_Modifier):
+    """A :class:`_Modifier` with extra attributes (e.g. from client code), never interned."""
+
+
 def _modifier(
     name,
     *,
@@ -371,7 +430,7 @@ def _modifier(
                 None,
                 (),
             ), locals()
-            return _Modifier(name, name, "modify", *args[1:], **kw)
+            return _interned_modifier(name, name, "modify", *args[1:], **kw)
 
         # Make a plain string instead.
         return str(name)
@@ -386,7 +445,46 @@ def _modifier(
     _repr = repr_fmt % fmt_args
     name = str_fmt % fmt_args
 
-    return _Modifier(name, _repr, func, *args[1:], **kw)
+    return _interned_modifier(name, _repr, func, *args[1:], **kw)
+
+
+#: Identical modifiers are shared, for as long as anything references them.
+_interned_modifiers: Mapping[tuple, _Modifier] = weakref.WeakValueDictionary()
+
+
+def _interned_modifier(*args, **kw) -> _Modifier:
+    """
+    Construct a :class:`_Modifier`, or return an identical one already existing.
+
+    Modifiers (in)directly containing other modifiers (e.g. a :term:`sideffected`
+    of a modifier) are not interned (nor looked up), since these compare equal
+    to plain strings; neither are those with extra (non-slot) `kw` attributes.
+    """
+    if any(k not in _Modifier.__slots__ for k in kw):
+        return _ExtModifier(*args, **kw)
+
+    kw_items = tuple(
+        sorted(
+            (k, type(v), tuple(v) if isinstance(v, list) else v) for k, v in kw.items()
+        )
+    )
+    key = (*args, kw_items)
+    if any(isinstance(i, _Modifier) for i in _iter_nested(key)):
+        return _Modifier(*args, **kw)
+    try:
+        mod = _interned_modifiers.get(key)
+    except TypeError:  # unhashable, e.g. slices in `jsonp` steps
+        return _Modifier(*args, **kw)
+    if mod is None:
+        mod = _interned_modifiers[key] = _Modifier(*args, **kw)
+    return mod
+
+
+def _iter_nested(items):
+    for i in items:
+        yield i
+        if isinstance(i, tuple):
+            yield from _iter_nested(i)
 
 
 def modifier_withset(
@@ -409,7 +507,7 @@ def modifier_withset(
         kw = {
             **{
                 k.lstrip("_"): v
-                for k, v in vars(dep).items()
+                for k, v in dep._attrs()
                 # Regenerate cached, truthy-only, jsonp-parts.
                 if k != "_jsonp" or not v
             },
@@ -451,22 +549,22 @@ def is_optional(dep) -> Optional[_Optionals]:
     :return:
         the :attr:`._optional`
     """
-    return getattr(dep, "_optional", None)
+    return dep._optional if getattr(dep, "_flags", 0) & _FLAG_OPTIONAL else None
 
 
 def is_vararg(dep) -> bool:
     """Check if an :term:`optionals` dependency is `vararg`."""
-    return getattr(dep, "_optional", None) == _Optionals.vararg
+    return bool(getattr(dep, "_flags", 0) & _FLAG_VARARG)
 
 
 def is_varargs(dep) -> bool:
     """Check if an :term:`optionals` dependency is `varargs`."""
-    return getattr(dep, "_optional", None) == _Optionals.varargs
+    return bool(getattr(dep, "_flags", 0) & _FLAG_VARARGS)
 
 
 def is_varargish(dep) -> bool:
     """Check if an :term:`optionals` dependency is :term:`varargish`."""
-    return dep._optional in (_Optionals.vararg, _Optionals.vararg)
+    return bool(getattr(dep, "_flags", 0) & (_FLAG_VARARG | _FLAG_VARARGS))
 
 
 def jsonp_ize(dep):
@@ -491,7 +589,7 @@ def is_sfx(dep) -> Optional[str]:
 
 def is_pure_sfx(dep) -> bool:
     """Check if it is :term:`sideffects` but not a :term:`sideffected`."""
-    return getattr(dep, "_sideffected", None) and not getattr(dep, "_sfx_list", None)
+    return getattr(dep, "_flags", 0) & (_FLAG_SFX | _FLAG_SFXED) == _FLAG_SFX
 
 
 def is_sfxed(dep) -> bool:
@@ -501,12 +599,12 @@ def is_sfxed(dep) -> bool:
     :return:
         the :attr:`._sfx_list` if it is  a *sideffected* dep, None/empty-tuple otherwise
     """
-    return getattr(dep, "_sideffected", None) and getattr(dep, "_sfx_list", None)
+    return dep._sfx_list if getattr(dep, "_flags", 0) & _FLAG_SFXED else None
 
 
 def is_implicit(dep) -> bool:
     """Return if it is a :term:`implicit` dependency. """
-    return getattr(dep, "_implicit", None)
+    return dep._implicit if getattr(dep, "_flags", 0) & _FLAG_IMPLICIT else None
 
 
 def get_accessor(dep) -> bool:
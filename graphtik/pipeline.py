@@ -13,8 +13,9 @@ import inspect
 import logging
 import re
 import sys
+import uuid
 from collections import abc as cabc
-from typing import Callable, List, Mapping, Union
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Tuple, Union
 
 from boltons.setutils import IndexedSet as iset
 
@@ -41,6 +42,89 @@ def _id_tristate_bool(b):
     return 3 if b is None else (hash(bool(b)) + 1)
 
 
+def _pure_op_key(op) -> Optional[tuple]:
+    """
+    The identity of a :attr:`.FnOp.pure` operation, equal for duplicates, or None if not eligible.
+
+    Operations with :term:`sideffects`, :term:`implicit` `provides` or
+    a :term:`current-working-document` are not eligible, neither those with
+    unhashable `node_props`; duplicates must also agree on their
+    :term:`reschedule`, :term:`endurance`, :term:`parallel` & :term:`marshalling` flags.
+    """
+    from .modifier import is_implicit, is_sfx, is_sfxed
+
+    if not getattr(op, "pure", None) or not op.fn or op.cwd:
+        return None
+    if any(is_sfx(p) or is_sfxed(p) or is_implicit(p) for p in op.provides):
+        return None
+    try:
+        node_props = frozenset((op.node_props or {}).items())
+    except TypeError as ex:
+        log.debug("Cannot dedupe pure %s, due to unhashable `node_props`: %s", op, ex)
+        return None
+
+    return (
+        id(op.fn),
+        tuple(repr(n) for n in op.needs),
+        tuple(repr(n) for n in op._fn_needs),
+        len(op._fn_provides),
+        bool(op.returns_dict),
+        op.map_over,
+        op.partitionable,
+        op.streaming,
+        _id_tristate_bool(op.rescheduled),
+        _id_tristate_bool(op.endured),
+        _id_tristate_bool(op.parallel),
+        _id_tristate_bool(op.marshalled),
+        node_props,
+    )
+
+
+def _alias_dupe_provides(kept, dupe):
+    """Clone `kept` op with :term:`alias`\\es for the `provides` of its `dupe` (if any)."""
+    renames = dict(zip(dupe._fn_provides, kept._fn_provides))
+    new_aliases = [
+        *zip(kept._fn_provides, dupe._fn_provides),
+        *((renames[src], dst) for src, dst in dupe.aliases or ()),
+    ]
+    aliases = list(kept.aliases or ())
+    provided = set(kept.provides)
+    for src, dst in new_aliases:
+        if dst not in provided:
+            aliases.append((src, dst))
+            provided.add(dst)
+
+    return kept.withset(aliases=aliases) if provided != set(kept.provides) else kept
+
+
+def _dedupe_pure_ops(operations) -> list:
+    """
+    Apply :term:`common-subexpression elimination` on `operations`.
+
+    Of all :attr:`.FnOp.pure` operations with the same function & `needs`,
+    only the 1st one is kept, :term:`alias`\\ing its `provides` into those
+    of the duplicates dropped.
+    """
+    kept = {}  # op-key --> index in `deduped`
+    deduped, dupes = [], []
+    for op in operations:
+        key = _pure_op_key(op)
+        if key is None:
+            deduped.append(op)
+        elif key not in kept:
+            kept[key] = len(deduped)
+            deduped.append(op)
+        else:
+            idx = kept[key]
+            deduped[idx] = _alias_dupe_provides(deduped[idx], op)
+            dupes.append(op.name)
+
+    if dupes:
+        log.info("Compose deduped %i pure operations %s.", len(dupes), dupes)
+
+    return deduped
+
+
 def build_network(
     operations,
     cwd=None,
@@ -51,17 +135,20 @@ def build_network(
     node_props=None,
     renamer=None,
     excludes=None,
+    dedupe=None,
 ):
     """
     The :term:`network` factory that does :term:`operation merging` before constructing it.
 
     :param nest:
         see same-named param in :func:`.compose`
+    :param dedupe:
+        see same-named param in :func:`.compose`
     """
     kw = {
         k: v
         for k, v in locals().items()
-        if v is not None and k not in ("operations", "excludes")
+        if v is not None and k not in ("operations", "excludes", "dedupe")
     }
 
     def proc_op(op, parent=None):
@@ -106,6 +193,9 @@ def build_network(
             merge_set = [op for op in merge_set if op not in excludes]
             log.info("Compose excluded %i operations %s.", len(excludes), excludes)
 
+    if dedupe:
+        merge_set = _dedupe_pure_ops(merge_set)
+
     assert all(bool(n) for n in merge_set)
 
     from .planning import Network  # Imported here not to affect locals() at the top.
@@ -148,6 +238,7 @@ class Pipeline(Operation):
         node_props=None,
         renamer=None,
         excludes=None,
+        dedupe=None,
     ):
         """
         For arguments, ee :meth:`withset()` & class attributes.
@@ -168,6 +259,9 @@ class Pipeline(Operation):
         self.outputs = outputs
         #: Remember `predicate` for future `compute()`?
         self.predicate = predicate
+        #: Identifies this instance when :term:`coalescing` computes
+        #: (unlike :func:`id()`, never reused after garbage-collection).
+        self._coalesce_token = uuid.uuid4().hex
 
         # Prune network
         self.net = build_network(
@@ -180,6 +274,7 @@ class Pipeline(Operation):
             node_props,
             renamer,
             excludes,
+            dedupe,
         )
         # TODO: implement `cwd` also for whole pipelines.
         self.name, self.needs, self.provides, _aliases = reparse_operation_data(
@@ -380,6 +475,9 @@ class Pipeline(Operation):
         callbacks=None,
         solution_class: "Type[Solution]" = None,
         layered_solution=None,
+        memory_budget: int = None,
+        lazy=False,
+        coalescer: "SingleFlight" = None,
     ) -> "Solution":
         """
         Compile & :term:`execute` the plan, log :term:`jetsam` & plot :term:`plottable` on errors.
@@ -428,7 +526,19 @@ class Pipeline(Operation):
               layer for each operation, regardless of any *jsonp* dependencies.
             - If ``None``, layers are used only if there are NO :term:`jsonp` dependencies
               in the network.
-
+        :param memory_budget:
+            if given, the bytes above which solution values are :term:`spill`\\ed
+            into temporary files, to be reloaded when needed
+            (:term:`sequential` execution only).
+        :param lazy:
+            when true, nothing executes yet, and a :class:`.LazySolution` is returned,
+            to execute just the operations needed for each key 1st read.
+        :param coalescer:
+            if given, a :class:`.SingleFlight` to :term:`coalesce <coalescing>`
+            concurrent calls of this pipeline with the same inputs content, arguments
+            & :term:`configurations` into a single execution, sharing its (read-only)
+            solution; calls with `callbacks`, `solution_class` or `lazy` are never
+            coalesced.
 
         :return:
             The :term:`solution` which contains the results of each operation executed
@@ -455,6 +565,39 @@ class Pipeline(Operation):
         """
         from .config import reset_abort
 
+        if coalescer is not None:
+            from .coalescing import content_key
+            from .config import _execution_settings
+
+            ## Lazy solutions execute while read, and callbacks & custom solutions
+            #  concern each caller, so never shared.
+            key = None
+            if not (lazy or callbacks or solution_class):
+                key = content_key(
+                    self._coalesce_token,
+                    named_inputs or {},
+                    outputs,
+                    recompute_from,
+                    predicate,
+                    layered_solution,
+                    memory_budget,
+                    _execution_settings(),
+                )
+            return coalescer.do(
+                key,
+                lambda: self.compute(
+                    named_inputs,
+                    outputs,
+                    recompute_from,
+                    predicate=predicate,
+                    callbacks=callbacks,
+                    solution_class=solution_class,
+                    layered_solution=layered_solution,
+                    memory_budget=memory_budget,
+                    lazy=lazy,
+                ),
+            )
+
         ok = False
         try:
             if named_inputs is None:
@@ -477,6 +620,24 @@ class Pipeline(Operation):
             # Restore `abort` flag for next run.
             reset_abort()
 
+            if lazy:
+                from .execution import LazySolution
+
+                plan.validate(named_inputs, outputs)
+                ok = True
+                return LazySolution(
+                    plan,
+                    named_inputs,
+                    recompute_from,
+                    predicate=predicate,
+                    pipeline=self,
+                    name=self.name,
+                    callbacks=callbacks,
+                    solution_class=solution_class,
+                    layered_solution=layered_solution,
+                    memory_budget=memory_budget,
+                )
+
             solution = plan.execute(
                 named_inputs,
                 outputs,
@@ -484,6 +645,7 @@ class Pipeline(Operation):
                 callbacks=callbacks,
                 solution_class=solution_class,
                 layered_solution=layered_solution,
+                memory_budget=memory_budget,
             )
 
             ok = True
@@ -516,6 +678,105 @@ class Pipeline(Operation):
                         exc_info=True,
                     )
 
+    def compute_iter(
+        self,
+        named_inputs: Mapping = None,
+        # /,  PY3.8+ positional-only
+        outputs: Items = UNSET,
+        recompute_from: Items = None,
+        **compute_kw,
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Like :meth:`compute()` but yield each ``(name, value)`` output as soon as produced.
+
+        The :term:`execution` runs in a background thread (with a copy of the caller's
+        :term:`configurations`), for any kind of executor, while this generator yields
+        the values of the asked `outputs` (or all, if ``None``) right after
+        each operation producing them has completed.
+
+        :param compute_kw:
+            the rest keyword arguments of :meth:`compute()`
+        :return:
+            the :term:`solution`, as the value of the final ``StopIteration``
+            (e.g. ``solution = yield from pipe.compute_iter(...)``)
+        :raises:
+            whatever :meth:`compute()` raises, after yielding any outputs produced so far
+
+        Outputs produced by more operations (:term:`overwrite`\\s) are yielded
+        more than once.
+        Closing the generator early does NOT stop the execution.
+
+        **Example:**
+
+            >>> from graphtik import compose, operation
+
+            >>> pipe = compose(
+            ...     "iter",
+            ...     operation(lambda a: a + 1, "inc", needs="a", provides="b"),
+            ...     operation(lambda b: b * 2, "double", needs="b", provides="c"),
+            ... )
+            >>> for name, value in pipe.compute_iter({"a": 1}, outputs=["c", "b"]):
+            ...     print(name, value)
+            b 2
+            c 4
+        """
+        import queue
+        import threading
+        from contextvars import copy_context
+
+        from .execution import Solution
+
+        if outputs == UNSET:
+            outputs = self.outputs
+        asked = None if outputs is None else asset(outputs, "outputs")
+        solution_class = compute_kw.pop("solution_class", None) or Solution
+        results = queue.SimpleQueue()
+        done = object()
+
+        def listener(op, op_outputs):
+            for k in op_outputs:
+                if asked is None or k in asked:
+                    results.put((k, solution[k]))
+
+        def solution_factory(*args, **kw):
+            nonlocal solution
+            solution = solution_class(*args, **kw)
+            solution._outputs_listener = listener
+            return solution
+
+        def run():
+            # Always end the results (forwarding even `SystemExit` & co),
+            # or the consumer would wait forever.
+            end = None
+            try:
+                end = self.compute(
+                    named_inputs,
+                    outputs,
+                    recompute_from,
+                    solution_class=solution_factory,
+                    **compute_kw,
+                )
+            except BaseException as ex:
+                end = ex
+            finally:
+                results.put((done, end))
+
+        solution = None
+        threading.Thread(
+            target=copy_context().run,
+            args=(run,),
+            name=f"graphtik-compute_iter({self.name})",
+            daemon=True,
+        ).start()
+
+        while True:
+            name, value = results.get()
+            if name is done:
+                if isinstance(value, BaseException):
+                    raise value
+                return value
+            yield name, value
+
     def __call__(self, **input_kwargs) -> "Solution":
         """
         Delegates to :meth:`compute()`, respecting any narrowed `outputs`.
@@ -551,6 +812,7 @@ def compose(
     marshalled=None,
     nest: Union[Callable[[RenArgs], str], Mapping[str, str], Union[bool, str]] = None,
     node_props=None,
+    dedupe=None,
 ) -> Pipeline:
     """
     Merge or :term:`nest <operation nesting>` operations & pipelines into a new pipeline.
@@ -638,6 +900,10 @@ def compose(
         by :meth:`.Pipeline.withset()`.
         Also plot-rendering affected if they match `Graphviz` properties,
         unless they start with underscore(``_``)
+    :param dedupe:
+        if true, keep just one of the :attr:`.FnOp.pure` operations having the same
+        function & `needs`, :term:`alias`\\ing its `provides` into those of the
+        duplicates (see :term:`common-subexpression elimination`)
 
     :return:
         Returns a special type of operation class, which represents an
@@ -710,4 +976,5 @@ def compose(
         node_props=node_props,
         renamer=renamer,
         excludes=excludes,
+        dedupe=dedupe,
     )
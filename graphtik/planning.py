@@ -12,6 +12,7 @@ from typing import (
     Any,
     Callable,
     Collection,
+    Dict,
     Iterable,
     List,
     Mapping,
@@ -27,7 +28,7 @@ from boltons.iterutils import pairwise
 from boltons.setutils import IndexedSet as iset
 
 from .base import Items, Operation, PlotArgs, Plottable, astuple
-from .config import is_debug, is_skip_evictions
+from .config import is_debug, is_optimize_plans, is_skip_evictions
 from .modifier import (
     dep_renamed,
     dep_stripped,
@@ -74,8 +75,8 @@ def _optionalized(graph, data):
     return (
         optional(data)
         if all_optionals
-        else data  # sideffect
-        if is_sfx(data)
+        else data  # sideffect, or nothing to un-optionalize
+        if is_sfx(data) or (type(data) is str and "/" not in data)
         else modifier_withset(
             data,
             # un-optionalize
@@ -90,8 +91,9 @@ def collect_requirements(graph) -> Tuple[iset, iset]:
     """Collect & split datanodes in (possibly overlapping) `needs`/`provides`."""
     operations = list(yield_ops(graph))
     provides = iset(p for op in operations for p in op.provides)
-    needs = iset(_optionalized(graph, n) for op in operations for n in op.needs)
-    provides = iset(provides)
+    # Optionalize each distinct need once (not once per consuming op).
+    needs = iset(n for op in operations for n in op.needs)
+    needs = iset(_optionalized(graph, n) for n in needs)
     return needs, provides
 
 
@@ -177,6 +179,65 @@ yield_superdocs = partial(_yield_chained_docs, (("in_edges", 0),))
 #: Calls :func:`_yield_chained_docs()` for both subdocs & superdocs.
 yield_chaindocs = partial(_yield_chained_docs, (("out_edges", 1), ("in_edges", 0)))
 
+#: Maps :term:`doc chain` nodes to themselves & all their sub/super docs.
+ChaindocsIndex = Dict[str, Tuple[str, ...]]
+
+
+def build_chaindocs_index(dag) -> ChaindocsIndex:
+    """
+    Collect, for every node in a :term:`doc chain`, all its sub & super docs at once.
+
+    :return:
+        a dict with all nodes having "subdoc" edges, mapped to a tuple with
+        the node itself, all its subdocs and all its superdocs
+        (nodes not in any chain are missing, they chain to themselves alone)
+
+    The lookups of :func:`yield_indexed_chaindocs()` avoid re-walking
+    the edges of the `dag` with :func:`yield_chaindocs()`,
+    for the same results (though in different order).
+    """
+    subdocs, superdocs = defaultdict(list), defaultdict(list)
+    for src, dst, subdoc in dag.edges(data="subdoc"):
+        if subdoc:
+            subdocs[src].append(dst)
+            superdocs[dst].append(src)
+
+    def dig(links: Mapping[str, List[str]], memo: dict, doc) -> Tuple[str, ...]:
+        found = memo.get(doc)
+        if found is None:
+            found = memo[doc] = tuple(
+                dd for d in links.get(doc, ()) for dd in (d, *dig(links, memo, d))
+            )
+        return found
+
+    descendants, ancestors = {}, {}
+    return {
+        doc: (
+            doc,
+            *dig(subdocs, descendants, doc),
+            *dig(superdocs, ancestors, doc),
+        )
+        for doc in (*subdocs, *superdocs)
+    }
+
+
+def yield_indexed_chaindocs(
+    index: ChaindocsIndex, dag, docs: Iterable[str]
+) -> Iterable[str]:
+    """
+    Like :func:`yield_chaindocs()`, but looking up chains in a pre-built `index`.
+
+    :param index:
+        as built by :func:`build_chaindocs_index()` for `dag` or for a super-graph
+        of it (e.g. for the :class:`.Network` graph of a broken dag),
+        so it may yield also docs not in `dag`
+    :param docs:
+        the docs to fetch chains for, ignoring those not in `dag`
+    """
+    for d in docs:
+        if d in dag:
+            yield from index.get(d, (d,))
+
 
 def clone_graph_with_stripped_sfxed(graph):
     """Clone `graph` including ALSO stripped :term:`sideffected` deps, with original attrs. """
@@ -312,7 +373,9 @@ def inputs_for_recompute(
     return new_inputs, recomputes
 
 
-def unsatisfied_operations(dag, inputs: Iterable) -> Tuple[OpMap, iset]:
+def unsatisfied_operations(
+    dag, inputs: Iterable, chaindocs: ChaindocsIndex = None
+) -> Tuple[OpMap, iset]:
     """
     Traverse topologically sorted dag to collect un-satisfied operations.
 
@@ -330,14 +393,19 @@ def unsatisfied_operations(dag, inputs: Iterable) -> Tuple[OpMap, iset]:
         a graph with broken edges those arriving to existing inputs
     :param inputs:
         an iterable of the names of the input values
+    :param chaindocs:
+        a :term:`doc chain`\\s index from :func:`build_chaindocs_index()`
+        for `dag` (or a super-graph of it); built if not given
     :return:
         a 2-tuple with ({pruned-op, unsatisfied-explanation}, topo-sorted-nodes)
 
     """
+    if chaindocs is None:
+        chaindocs = build_chaindocs_index(dag)
     # Collect data that will be produced.
     ok_data = set()
     # Input parents assumed to contain all subdocs.
-    ok_data.update(yield_chaindocs(dag, inputs, ok_data))
+    ok_data.update(yield_indexed_chaindocs(chaindocs, dag, inputs))
     # To collect the map of operations --> satisfied-needs.
     op_satisfaction = defaultdict(set)
     # To collect the operations to drop.
@@ -361,7 +429,9 @@ def unsatisfied_operations(dag, inputs: Iterable) -> Tuple[OpMap, iset]:
                 # assert real_needs == set(n for n in node.needs if not is_optional(n))
                 if real_needs.issubset(satisfied_needs):
                     # Op is satisfied; mark its outputs as ok.
-                    ok_data.update(yield_chaindocs(dag, dag.adj[node], ok_data))
+                    ok_data.update(
+                        yield_indexed_chaindocs(chaindocs, dag, dag.adj[node])
+                    )
                 else:
                     pruned_ops[
                         node
@@ -407,11 +477,9 @@ class Network(Plottable):
         """
         ## Check for duplicate, operations can only append  once.
         #
-        uniques = set(operations)
-        if len(operations) != len(uniques):
-            dupes = list(operations)
-            for i in uniques:
-                dupes.remove(i)
+        uniques = set()
+        dupes = [op for op in operations if op in uniques or uniques.add(op)]
+        if dupes:
             raise ValueError(
                 f"Operations may only be added once, dupes: {list(dupes)}"
                 f"\n  out of: {list(operations)}"
@@ -428,13 +496,21 @@ class Network(Plottable):
         #: prior to :term:`planning`.
         self.graph = graph
 
-        for op in operations:
-            self._append_operation(graph, op)
+        self._append_operations(graph, operations)
         self.needs, self.provides = collect_requirements(self.graph)
 
         #: Speed up :meth:`compile()` call and avoid a multithreading issue(?)
         #: that is occurring when accessing the dag in networkx.
         self._cached_plans = {}
+        #: Lazily built by :meth:`chaindocs_index()`.
+        self._chaindocs_index = None
+
+    def chaindocs_index(self) -> ChaindocsIndex:
+        """The :func:`build_chaindocs_index()` of the :attr:`graph` (cached)."""
+        index = self._chaindocs_index
+        if index is None:
+            index = self._chaindocs_index = build_chaindocs_index(self.graph)
+        return index
 
     def __repr__(self):
         nodes = self.graph.nodes
@@ -457,56 +533,89 @@ class Network(Plottable):
 
         return plot_args
 
-    def _append_operation(self, graph, operation: Operation):
+    def _append_operations(self, graph, operations: Collection[Operation]):
         """
-        Adds the given operation and its data requirements to the network graph.
+        Adds the given operations and their data requirements to the network graph.
 
         - Invoked during constructor only (immutability).
         - Identities are based on the name of the operation, the names of the operation's needs,
           and the names of the data it provides.
-        - Adds needs, operation & provides, in that order.
+        - Adds needs, operation & provides, in that order, for each operation.
+        - Nodes & edges are collected in insertion-ordered dicts, and then
+          inserted into the graph in bulk, at the end, to avoid the overhead of
+          :mod:`networkx` on very large compositions
+          (their order matters, for the sorting of the :term:`execution steps`).
 
         :param graph:
             the `networkx` graph to append to
-        :param operation:
-            operation instance to append
+        :param operations:
+            operation instances to append
         """
         subdoc_attrs = {"subdoc": True}
-        # Using a separate set (and not ``graph.edges`` view)
-        # to avoid concurrent access error.
-        seen_doc_edges = set()
+        #: ``{node -> node-props}``
+        nodes = {}
+        #: ``{(src, dst) -> edge-props}``
+        edges = {}
+        #: ``{node -> typ}`` to check for collisions, seeded from any given graph;
+        #: also registers subdoc-chain nodes, to detect clashes with them.
+        node_types = {n: typ for n, typ in graph.nodes(data="typ", default=0)}
+
+        def add_node(node, props=None):
+            node_props = nodes.get(node)
+            if node_props is None:
+                node_props = nodes[node] = {}
+            if props:
+                node_props.update(props)
+
+        def add_edge(src, dst, props):
+            ## Insert implicitly any missing nodes, like :mod:`networkx` does.
+            #
+            if src not in nodes:
+                nodes[src] = {}
+            if dst not in nodes:
+                nodes[dst] = {}
+            edge_props = edges.get((src, dst))
+            if edge_props is None:
+                edges[(src, dst)] = dict(props)
+            else:
+                edge_props.update(props)
+
+        #: ``{doc-parts -> reversed-chain-edges}``, not to re-create
+        #: the same modifiers for every op sharing a document.
+        doc_chains = {}
+
+        def append_subdoc_chain(doc_parts, seen_doc_edges):
+            doc_parts = tuple(doc_parts)
+            chain_edges = doc_chains.get(doc_parts)
+            if chain_edges is None:
+                doc_chain = [
+                    modify("/".join(doc_parts[: i + 1])) for i in range(len(doc_parts))
+                ]
+                # FIXME: subdocs ignore double-slashes or final slash!
+                doc_chain = [p for p in doc_chain if p]
+                chain_edges = doc_chains[doc_parts] = list(pairwise(doc_chain))[::-1]
 
-        def unseen_subdoc_edges(doc_edges):
-            """:param doc_edges: e.g. ``[(root, root/n1), (root/n1, root/n1/n11)]``"""
             ## Start in reverse, from leaf edge, and stop
             #  ASAP a known edge is met, assuming path to root
             #  has already been inserted into graph.
             #
-            for src, dst in reversed(doc_edges):
+            for src, dst in chain_edges:
                 if (src, dst) in seen_doc_edges:
                     break
 
                 seen_doc_edges.add((src, dst))
-                yield (src, dst, subdoc_attrs)
-
-        def append_subdoc_chain(doc_parts):
-            doc_chain = list(doc_parts)
-            doc_chain = [
-                modify("/".join(doc_chain[: i + 1])) for i in range(len(doc_chain))
-            ]
-            # FIXME: subdocs ignore double-slashes or final slash!
-            doc_chain = [p for p in doc_chain if p]
-            graph.add_edges_from(unseen_subdoc_edges(pairwise(doc_chain)))
-
-        node_types = graph.nodes(data="typ")  # a view to check for collisions
+                add_edge(src, dst, subdoc_attrs)
+                node_types.setdefault(src, 0)
+                node_types.setdefault(dst, 0)
 
         def check_node_collision(
             node, node_type: int, dep_op=None, dep_kind: str = None
         ):
             """The dep_op/dep_kind are given only for data-nodes."""
-            if node in node_types and node_types[node] != node_type:
+            known_type = node_types.setdefault(node, node_type)
+            if known_type != node_type:
                 assert not (bool(dep_op) ^ bool(dep_kind)), locals()
-                graph_type = NODE_TYPE[node_types[node]]
+                graph_type = NODE_TYPE[known_type]
                 given_node = (
                     f"{dep_kind}({node!r})" if dep_op else f"operation({node.name})"
                 )
@@ -515,59 +624,69 @@ class Network(Plottable):
                     f"Name of {given_node} clashed with a same-named {graph_type} in graph!{dep_op}"
                 )
 
-        ## Needs
-        #
-        needs = []
-        needs_edges = []
-        for n in operation.needs:
-            json_path = get_jsonp(n)
-            check_node_collision(n, 0, operation, "needs")
-            if json_path:
-                append_subdoc_chain(json_path)
-
-            nkw, ekw = {"typ": 0}, {}  # node, edge props
-            if is_optional(n):
-                ekw["optional"] = True
-            if is_sfx(n):
-                ekw["sideffect"] = nkw["sideffect"] = True
-            if is_implicit(n):
-                ekw["implicit"] = True
-            keyword = get_keyword(n)
-            if keyword:
-                ekw["keyword"] = keyword
-            needs.append((n, nkw))
-            needs_edges.append((n, operation, ekw))
-        graph.add_nodes_from(needs)
-        node_props = getattr(operation, "node_props", None) or {}
-        check_node_collision(operation, 1)
-        graph.add_node(operation, typ=1, **node_props)
-        graph.add_edges_from(needs_edges)
-
-        ## Prepare inversed-aliases index, used
-        #  to label edges reaching to aliased `provides`.
-        #
-        aliases = getattr(operation, "aliases", None)
-        alias_destinations = {v: src for src, v in aliases} if aliases else ()
+        for operation in operations:
+            # Using a separate set (and not ``graph.edges`` view)
+            # to avoid concurrent access error.
+            seen_doc_edges = set()
 
-        ## Provides
-        #
-        for n in operation.provides:
-            json_path = get_jsonp(n)
-            check_node_collision(n, 0, operation, "provides")
-            if json_path:
-                append_subdoc_chain(json_path)
+            ## Needs
+            #
+            needs = []
+            needs_edges = []
+            for n in operation.needs:
+                json_path = get_jsonp(n)
+                check_node_collision(n, 0, operation, "needs")
+                if json_path:
+                    append_subdoc_chain(json_path, seen_doc_edges)
+
+                nkw, ekw = {"typ": 0}, {}  # node, edge props
+                if is_optional(n):
+                    ekw["optional"] = True
+                if is_sfx(n):
+                    ekw["sideffect"] = nkw["sideffect"] = True
+                if is_implicit(n):
+                    ekw["implicit"] = True
+                keyword = get_keyword(n)
+                if keyword:
+                    ekw["keyword"] = keyword
+                needs.append((n, nkw))
+                needs_edges.append((n, ekw))
+            for n, nkw in needs:
+                add_node(n, nkw)
+            node_props = getattr(operation, "node_props", None) or {}
+            check_node_collision(operation, 1)
+            add_node(operation, {"typ": 1, **node_props})
+            for n, ekw in needs_edges:
+                add_edge(n, operation, ekw)
+
+            ## Prepare inversed-aliases index, used
+            #  to label edges reaching to aliased `provides`.
+            #
+            aliases = getattr(operation, "aliases", None)
+            alias_destinations = {v: src for src, v in aliases} if aliases else ()
+
+            ## Provides
+            #
+            for n in operation.provides:
+                json_path = get_jsonp(n)
+                check_node_collision(n, 0, operation, "provides")
+                if json_path:
+                    append_subdoc_chain(json_path, seen_doc_edges)
 
-            nkw, ekw = {"typ": 0}, {}
-            if is_sfx(n):
-                ekw["sideffect"] = nkw["sideffect"] = True
-            if is_implicit(n):
-                ekw["implicit"] = True
+                nkw, ekw = {"typ": 0}, {}
+                if is_sfx(n):
+                    ekw["sideffect"] = nkw["sideffect"] = True
+                if is_implicit(n):
+                    ekw["implicit"] = True
 
-            if n in alias_destinations:
-                ekw["alias_of"] = alias_destinations[n]
+                if n in alias_destinations:
+                    ekw["alias_of"] = alias_destinations[n]
 
-            graph.add_node(n, **nkw)
-            graph.add_edge(operation, n, **ekw)
+                add_node(n, nkw)
+                add_edge(operation, n, ekw)
+
+        graph.add_nodes_from(nodes.items())
+        graph.add_edges_from((src, dst, props) for (src, dst), props in edges.items())
 
     def _apply_graph_predicate(self, graph, predicate):
         to_del = []
@@ -705,7 +824,9 @@ class Network(Plottable):
                 )
 
         # Prune unsatisfied operations (those with partial inputs or no outputs).
-        unsatisfied, sorted_nodes = unsatisfied_operations(broken_dag, satisfied_inputs)
+        unsatisfied, sorted_nodes = unsatisfied_operations(
+            broken_dag, satisfied_inputs, self.chaindocs_index()
+        )
         comments.update(unsatisfied)
 
         # Clone it, to modify it.
@@ -792,8 +913,9 @@ class Network(Plottable):
         #  (must augment dag before stripping outputs docchains).
         #
         pruned_dag = clone_graph_with_stripped_sfxed(pruned_dag)
+        chaindocs = build_chaindocs_index(pruned_dag)
         outputs = set(oo for o in outputs for oo in (o, dep_stripped(o)))
-        outputs = set(yield_chaindocs(pruned_dag, outputs))
+        outputs = set(yield_indexed_chaindocs(chaindocs, pruned_dag, outputs))
 
         ## Add Operation and Eviction steps.
         #
@@ -829,7 +951,7 @@ class Network(Plottable):
             #  but here we scan for predecessors of the operation (needs).
             #
             for need in pruned_dag.predecessors(op):
-                need_chain = set(yield_also_chaindocs(pruned_dag, need))
+                need_chain = set(chaindocs.get(need, (need,)))
 
                 ## Don't evict if any `need` in doc-chain has been asked
                 #  as output.
@@ -871,6 +993,42 @@ class Network(Plottable):
 
         return list(steps)
 
+    def _fold_operations(self, pruned_dag, sorted_nodes, inputs: Collection) -> dict:
+        """
+        Find the operations to :term:`fold <plan folding>` away from the plan's `steps`.
+
+        :param inputs:
+            the plan's `needs`, that disqualify any `const` operations needing them
+        :return:
+            an (ordered) ``{op: (src, dst) pairs}`` dict for :term:`conveyor operation`\\s
+            with plain dependencies, or ``{op: None}`` for :attr:`.FnOp.const` ones,
+            needing only the outputs of other `const` ops
+        """
+        from .fnop import identity_fn
+
+        folded = {}
+        const_outs = set()
+        for op in yield_ops(sorted_nodes):
+            if op not in pruned_dag:
+                continue
+            if getattr(op, "const", None):
+                needs = set(pruned_dag.predecessors(op))
+                if needs <= const_outs and not needs & set(inputs):
+                    folded[op] = None
+                    const_outs.update(pruned_dag.successors(op))
+            elif (
+                getattr(op, "fn", None) is identity_fn
+                and not op.returns_dict
+                and all(type(d) is str for d in (*op.needs, *op.provides))
+            ):
+                conveyed = dict(zip(op._fn_provides, op._fn_needs))
+                folded[op] = (
+                    *((src, dst) for dst, src in conveyed.items()),
+                    *((conveyed[src], dst) for src, dst in op.aliases or ()),
+                )
+
+        return folded
+
     def _deps_tuplized(
         self, deps, arg_name
     ) -> Tuple[Optional[Tuple[str, ...]], Optional[Tuple[str, ...]]]:
@@ -941,7 +1099,14 @@ class Network(Plottable):
             recompute_from, k3 = self._deps_tuplized(recompute_from, "recompute_from")
             if not predicate:
                 predicate = None
-            cache_key = (k1, k2, k3, predicate, is_skip_evictions())
+            cache_key = (
+                k1,
+                k2,
+                k3,
+                predicate,
+                is_skip_evictions(),
+                is_optimize_plans(),
+            )
 
             ## Build (or retrieve from cache) execution plan
             #  for the given dep-lists (excluding any unknown node-names).
@@ -961,6 +1126,11 @@ class Network(Plottable):
                 steps = self._build_execution_steps(
                     pruned_dag, sorted_nodes, needs, outputs or ()
                 )
+                folded = None
+                if is_optimize_plans():
+                    folded = self._fold_operations(pruned_dag, sorted_nodes, needs)
+                    if folded:
+                        steps = [s for s in steps if s not in folded]
                 plan = ExecutionPlan(
                     self,
                     needs,
@@ -969,6 +1139,7 @@ class Network(Plottable):
                     tuple(steps),
                     asked_outs=outputs is not None,
                     comments=op_comments,
+                    folded=folded,
                 )
 
                 self._cached_plans[cache_key] = plan
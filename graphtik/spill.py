@@ -0,0 +1,118 @@
+# Copyright 2020-2020, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+Spill large :term:`solution` values into files, to respect a :term:`memory budget`.
+
+- *numpy* arrays are saved as ``.npy`` files, reloaded as copy-on-write
+  memory-maps, so that only the pages actually touched occupy RAM;
+- anything else (e.g. *pandas* objects) is pickled.
+
+Neither *numpy* nor *pandas* are imported by this module, unless
+values of theirs are to be spilled.
+"""
+import logging
+import os
+import pickle
+import sys
+from contextlib import suppress
+
+from .jsonpointer import is_ndframe
+
+log = logging.getLogger(__name__)
+
+
+def _is_ndarray(obj) -> bool:
+    """Check if `obj` is a (non-object) *numpy* array, without importing :mod:`numpy`."""
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(obj, np.ndarray) and not obj.dtype.hasobject
+
+
+def sizeof(value) -> int:
+    """
+    A cheap estimation of the memory occupied by a `value`, in bytes.
+
+    - *numpy* arrays report their buffer size, except memory-maps,
+      which are paged by the OS and count as 0;
+    - *pandas* objects report their shallow memory usage (including the index);
+    - anything else reports :func:`sys.getsizeof()` (not recursing into containers).
+    """
+    if _is_ndarray(value):
+        np = sys.modules["numpy"]
+        if isinstance(value, np.memmap) or isinstance(
+            getattr(value, "base", None), np.memmap
+        ):
+            return 0
+        return value.nbytes
+    if is_ndframe(value):
+        usage = value.memory_usage(index=True)  # a series for dataframes
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    return sys.getsizeof(value)
+
+
+class Spilled:
+    """
+    A placeholder for a solution value written into a file by :func:`spill()`.
+
+    .. attribute:: path
+
+        the file holding the value
+    .. attribute:: nbytes
+
+        the :func:`sizeof()` the value when spilled
+    """
+
+    __slots__ = ("path", "nbytes")
+
+    def __init__(self, path: str, nbytes: int):
+        self.path = path
+        self.nbytes = nbytes
+
+    def load(self):
+        """Read back the value (*numpy* arrays as copy-on-write memory-maps)."""
+        if self.path.endswith(".npy"):
+            import numpy as np
+
+            return np.load(self.path, mmap_mode="c", allow_pickle=False)
+
+        with open(self.path, "rb") as f:
+            return pickle.load(f)
+
+    def discard(self):
+        """Delete the file, ignoring errors (e.g. still memory-mapped on Windows)."""
+        with suppress(OSError):
+            os.remove(self.path)
+
+    def __repr__(self):
+        return f"Spilled({self.path!r}, nbytes={self.nbytes})"
+
+
+def spill(value, fpath: str, nbytes: int = None) -> Spilled:
+    """
+    Write `value` into a file, named after `fpath` plus a format extension.
+
+    :param nbytes:
+        the :func:`sizeof()` the value, if already known
+    :return:
+        the :class:`Spilled` placeholder to reload `value` from
+    :raises:
+        any error pickling `value` (e.g. :class:`TypeError` for locks),
+        after removing the incomplete file
+    """
+    if nbytes is None:
+        nbytes = sizeof(value)
+    if _is_ndarray(value):
+        import numpy as np
+
+        fpath = f"{fpath}.npy"
+        np.save(fpath, value, allow_pickle=False)
+    else:
+        fpath = f"{fpath}.pickle"
+        try:
+            with open(fpath, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            with suppress(OSError):
+                os.remove(fpath)
+            raise
+
+    return Spilled(fpath, nbytes)
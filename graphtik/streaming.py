@@ -0,0 +1,168 @@
+# Copyright 2020-2020, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+Chunked values flowing between :term:`streaming` operations, like Unix pipes.
+
+A :class:`Stream` wraps the chunks-iterator returned by a *streaming* operation;
+any *streaming* operations downstream receive their own iterator over those chunks
+(so their generators are chained lazily), while *non-streaming* ones receive
+the chunks concatenated (see :func:`concat_chunks()`).
+
+Neither *numpy* nor *pandas* are imported by this module, unless chunks
+of theirs are to be concatenated.
+"""
+import logging
+import sys
+import threading
+from itertools import chain, tee
+from typing import Iterable, Iterator, List
+
+from .base import UNSET
+from .jsonpointer import is_ndframe
+
+log = logging.getLogger(__name__)
+
+
+def concat_chunks(chunks: List):
+    """
+    Join `chunks` by the type of the 1st one, or return them as a list.
+
+    - *pandas* objects are :func:`pandas.concat()`\\ed along rows,
+    - *numpy* arrays are :func:`numpy.concatenate()`\\d along the 1st axis,
+    - strings & bytes are joined, lists are chained,
+    - anything else (or no chunks at all) is returned as the list of chunks.
+    """
+    if not chunks:
+        return chunks
+
+    first = chunks[0]
+    if is_ndframe(first):
+        import pandas as pd
+
+        return pd.concat(chunks)
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(first, np.ndarray):
+        return np.concatenate(chunks)
+    if isinstance(first, (str, bytes)):
+        return first[:0].join(chunks)
+    if isinstance(first, list):
+        return list(chain.from_iterable(chunks))
+
+    return chunks
+
+
+def buffered(chunks: Iterable, maxsize: int) -> Iterator:
+    """
+    Pull `chunks` in a background thread, up to `maxsize` chunks ahead of the consumer.
+
+    The thread starts on the 1st chunk requested, and any error raised while
+    producing the chunks is re-raised to the consumer; if the consumer stops early
+    (the returned generator is closed or garbage-collected), the thread stops too.
+    """
+    import queue
+
+    buffer = queue.Queue(maxsize)
+    done = object()
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        """Wait for room in the buffer, unless the consumer has stopped."""
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for chunk in chunks:
+                if not put((chunk, None)):
+                    return
+        except Exception as ex:
+            put((done, ex))
+        else:
+            put((done, None))
+
+    threading.Thread(target=produce, name="graphtik-stream", daemon=True).start()
+    try:
+        while True:
+            chunk, ex = buffer.get()
+            if chunk is done:
+                if ex is not None:
+                    raise ex
+                return
+            yield chunk
+    finally:
+        stopped.set()
+
+
+class _LockedFork:
+    """A :func:`itertools.tee()` copy, advanced under the lock of its :class:`Stream`."""
+
+    __slots__ = ("_chunks", "_lock")
+
+    def __init__(self, chunks: Iterator, lock: threading.Lock):
+        self._chunks = chunks
+        self._lock = lock
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            return next(self._chunks)
+
+
+class Stream:
+    """
+    The chunks produced by a :term:`streaming` operation, consumed lazily.
+
+    :param chunks:
+        the iterator returned by the operation's function
+    :param buffer:
+        when positive, the chunks are produced in a background thread
+        that many chunks ahead (see :func:`buffered()`)
+
+    Every :meth:`fork()` iterates the chunks from the start, so all consumers
+    see all of them; the chunks pulled by one consumer but not yet by the others
+    (or by this stream, until :term:`evicted <eviction>`) are kept in memory
+    (see :func:`itertools.tee()`).  The forks may be consumed concurrently,
+    e.g. by operations running in an :term:`execution pool`.
+    """
+
+    __slots__ = ("_chunks", "_value", "_joined", "_lock")
+
+    def __init__(self, chunks: Iterator, buffer: int = 0):
+        if buffer and buffer > 0:
+            chunks = buffered(chunks, buffer)
+        self._chunks = chunks
+        self._value = UNSET
+        #: false if :func:`concat_chunks()` could not join the chunks, returning them
+        self._joined = True
+        self._lock = threading.Lock()
+
+    def fork(self) -> Iterator:
+        """An iterator over all the chunks, for a :term:`streaming` consumer."""
+        with self._lock:
+            if self._value is not UNSET:
+                return iter(self._value if not self._joined else (self._value,))
+            self._chunks, chunks = tee(self._chunks)
+            return _LockedFork(chunks, self._lock)
+
+    __iter__ = fork
+
+    def materialize(self):
+        """Pull & :func:`concat_chunks()` any chunks left (memoized), for non-streaming consumers."""
+        with self._lock:
+            if self._value is UNSET:
+                chunks = list(self._chunks)
+                self._value = concat_chunks(chunks)
+                self._joined = self._value is not chunks
+                self._chunks = None
+            return self._value
+
+    def __repr__(self):
+        state = "pending" if self._value is UNSET else f"value={self._value!r}"
+        return f"Stream({state})"
@@ -330,3 +330,84 @@ def test_combine_networks(exemethod, bools):
         else:
             # legend-node included here.`
             assert old_node.get_name() in new_node_names
+
+
+def test_compose_dedupe_pure_ops():
+    calls = []
+
+    def expensive(a, b):
+        calls.append((a, b))
+        return a + b, a * b
+
+    common = operation(
+        expensive, "common", needs=["a", "b"], provides=["sum", "prod"], pure=True
+    )
+    sub1 = compose("sub1", common, operation(str, "fmt1", needs="sum", provides="s1"))
+    sub2 = compose(
+        "sub2",
+        common.withset(provides=["sum2", "prod2"], aliases={"prod2": "product"}),
+        operation(str, "fmt2", needs="sum2", provides="s2"),
+    )
+    impure = compose("impure", sub1, sub2, nest=lambda ren_args: ren_args.typ == "op")
+    assert len(impure.ops) == 4
+    impure.compute({"a": 2, "b": 3})
+    assert len(calls) == 2
+
+    calls.clear()
+    pipe = compose(
+        "deduped", sub1, sub2, nest=lambda ren_args: ren_args.typ == "op", dedupe=True
+    )
+    assert [op.name for op in pipe.ops] == ["sub1.common", "sub1.fmt1", "sub2.fmt2"]
+    assert pipe.ops[0].aliases == [
+        ("sum", "sum2"),
+        ("prod", "prod2"),
+        ("prod", "product"),
+    ]
+    sol = pipe.compute({"a": 2, "b": 3})
+    assert len(calls) == 1
+    assert sol == {
+        "a": 2,
+        "b": 3,
+        "sum": 5,
+        "prod": 6,
+        "sum2": 5,
+        "prod2": 6,
+        "product": 6,
+        "s1": "5",
+        "s2": "5",
+    }
+
+    ## Not pure, or different needs, are kept.
+    #
+    pipe = compose(
+        "kept",
+        common,
+        common.withset(name="other_needs", needs=["b", "a"], provides=["x", "y"]),
+        common.withset(name="impure", provides=["z", "w"], pure=False),
+        dedupe=True,
+    )
+    assert len(pipe.ops) == 3
+
+    ## Different flags or `node_props`, are kept.
+    #
+    pipe = compose(
+        "flags",
+        common,
+        common.withset(name="endured", provides=["s3", "p3"], endured=True),
+        common.withset(name="resched", provides=["s4", "p4"], rescheduled=True),
+        common.withset(name="parallel", provides=["s5", "p5"], parallel=True),
+        common.withset(name="marshal", provides=["s6", "p6"], marshalled=True),
+        common.withset(name="props", provides=["s7", "p7"], node_props={"a": 1}),
+        common.withset(name="props2", provides=["s8", "p8"], node_props={"a": 1}),
+        common.withset(name="unhashable", provides=["s9", "p9"], node_props={"a": []}),
+        dedupe=True,
+    )
+    assert [op.name for op in pipe.ops] == [
+        "common",
+        "endured",
+        "resched",
+        "parallel",
+        "marshal",
+        "props",
+        "unhashable",
+    ]
@@ -2,19 +2,42 @@
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """Test :term:`parallel`, :term:`marshalling` and other :term:`execution` related stuff. """
 import io
+import logging
 import os
 from functools import partial
 from multiprocessing import cpu_count
 from multiprocessing import dummy as mp_dummy
-from operator import mul, sub
+from operator import add, mul, sub
 from textwrap import dedent
 from time import sleep, time
 
 import pandas as pd
 import pytest
-from graphtik import AbortedException, compose, hcat, modify, operation, optional, vcat
-from graphtik.config import abort_run, execution_pool_plugged
+from graphtik import (
+    AbortedException,
+    compose,
+    hcat,
+    keyword,
+    modify,
+    operation,
+    optional,
+    vararg,
+    varargs,
+    vcat,
+)
+from graphtik.base import LazyInput
+from graphtik.config import (
+    abort_run,
+    execution_pool_plugged,
+    operations_endured,
+    plans_optimized,
+    prefetch_steps_plugged,
+    providers_raced,
+    tasks_fused,
+    tasks_in_parallel,
+)
 from graphtik.execution import OpTask, task_context
+from graphtik.planning import yield_ops
 from pandas.testing import assert_frame_equal
 
 from .helpers import abspow, dummy_sol, exe_params
@@ -206,6 +229,31 @@ def test_solution_copy(samplenet):
     assert sol == sol.copy()
 
 
+def test_solution_dag_copy_on_write():
+    def fail(a):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "cow",
+        operation(fail, "bad", needs="a", provides="b", endured=True),
+        operation(lambda a: a, "good", needs="a", provides="c"),
+        operation(lambda b: b, "next", needs="b", provides="d"),
+    )
+    plan = pipe.compile(["a"])
+    n_plan_edges = len(plan.dag.edges)
+
+    sol = pipe.compile("a", outputs="c").execute({"a": 1})
+    assert sol == {"c": 1}
+    assert sol.dag is sol.plan.dag
+
+    sol = plan.execute({"a": 1})
+    assert sol == {"a": 1, "c": 1}
+    assert sol.dag is not plan.dag
+    assert ("bad", "b") not in {(str(s), str(d)) for s, d in sol.dag.edges}
+    assert len(plan.dag.edges) == n_plan_edges
+    assert sol.copy().dag is sol.dag
+
+
 def test_solution_df_concat_delay_groups(monkeypatch):
     concat_args = []
 
@@ -267,3 +315,1008 @@ def test_solution_df_concat_delay_groups(monkeypatch):
     print(df.to_csv())
     assert [len(i) for i in concat_args] == [5, 5]
     assert_frame_equal(df, exp)
+
+
+@pytest.mark.parametrize("jsonp, parallel", [(True, False), (False, True)])
+def test_evictions_release_values(jsonp, parallel):
+    import tracemalloc
+
+    import numpy as np
+
+    n_ops, size = 10, 1_000_000
+    names = [f"d{i}/arr" if jsonp else f"d{i}" for i in range(n_ops)]
+    ops = [operation(lambda: np.ones(size // 8), "op0", provides=names[0])]
+    ops.extend(
+        operation(lambda a: a + 1, f"op{i}", needs=names[i - 1], provides=names[i])
+        for i in range(1, n_ops)
+    )
+    pipe = compose("evictions_chain", *ops, parallel=parallel)
+
+    with execution_pool_plugged(mp_dummy.Pool(1)):
+        tracemalloc.start()
+        try:
+            sol = pipe.compute({}, outputs=names[-1])
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    assert sol.is_layered is not jsonp
+    assert list(sol) == [f"d{n_ops - 1}"]
+    assert (sol[modify(names[-1])] == n_ops).all()
+    assert [len(outs) for outs in sol.executed.values()] == [0] * (n_ops - 1) + [1]
+    # No more than 2 arrays alive at any time (+ overheads).
+    assert peak < 3 * size, peak
+
+
+@pytest.mark.parametrize("jsonp", [False, True])
+def test_memory_budget_spills(jsonp, caplog):
+    import tracemalloc
+
+    import numpy as np
+
+    from graphtik.spill import Spilled
+
+    caplog.set_level(logging.INFO, logger="graphtik.execution")
+
+    n_ops, size = 10, 1_000_000
+    names = [f"d{i}/arr" if jsonp else f"d{i}" for i in range(n_ops)]
+    ops = [
+        operation(partial(np.full, size // 8, i), f"op{i}", provides=names[i])
+        for i in range(n_ops)
+    ]
+    ops.append(
+        operation(
+            lambda *arrs: pd.DataFrame({"total": sum(arrs)}),
+            "total",
+            needs=names,
+            provides="df",
+        )
+    )
+    ops.append(operation(lambda df: df.sum(), "summary", needs="df", provides="sum"))
+    pipe = compose("spills", *ops)
+
+    tracemalloc.start()
+    try:
+        sol = pipe.compute(memory_budget=size)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert sol.is_layered is not jsonp
+    assert sol["sum"]["total"] == size // 8 * sum(range(n_ops))
+    assert (sol["df"]["total"] == sum(range(n_ops))).all()
+    assert (sol[modify(names[3])] == 3).all()
+    assert not any(isinstance(v, Spilled) for m in sol.maps for v in m.values())
+    assert not any(isinstance(v, Spilled) for outs in sol.layers for v in outs.values())
+    spills = [r for r in caplog.records if "spilled" in r.message]
+    assert len(spills) >= n_ops - 2
+    if not jsonp:
+        # Arrays are reloaded as memory-maps, unlike pickled docs.
+        assert peak < 6 * size, peak
+
+
+def test_memory_budget_unspillable(caplog):
+    import threading
+
+    caplog.set_level(logging.INFO, logger="graphtik.execution")
+
+    pipe = compose(
+        "unspillable",
+        operation(lambda a: threading.Lock(), "mklock", needs="a", provides="lock"),
+        operation(lambda a: [a] * 100, "mklist", needs="a", provides="b"),
+        operation(lambda b: len(b), "len", needs="b", provides="c"),
+        operation(lambda lock, c: c, "use", needs=["lock", "c"], provides="d"),
+    )
+    sol = pipe.compute({"a": 1}, memory_budget=10)
+    assert sol["d"] == 100
+    assert len([r for r in caplog.records if "failed to spill" in r.message]) == 1
+
+    ## Inputs over budget do not spill any intermediates.
+    caplog.clear()
+    pipe = compose(
+        "big-inputs", operation(lambda a: a, "copy", needs="a", provides="b")
+    )
+    pipe = compose("big-inputs", pipe, operation(len, "len", needs="b", provides="c"))
+    sol = pipe.compute({"a": "x" * 1000}, memory_budget=1000)
+    assert sol["c"] == 1000
+    assert not [r for r in caplog.records if "spilled" in r.message]
+
+
+@pytest.mark.parametrize("layered", [False, True])
+def test_memory_budget_sizes_once(layered, monkeypatch):
+    from graphtik import spill
+
+    sized = []
+    monkeypatch.setattr(
+        spill, "sizeof", lambda v, _orig=spill.sizeof: sized.append(v) or _orig(v)
+    )
+
+    n_ops = 20
+    ops = [
+        operation(lambda x: x + 1, f"op{i}", needs=f"d{i}", provides=f"d{i + 1}")
+        for i in range(n_ops)
+    ]
+    pipe = compose("sizes", *ops)
+    sol = pipe.compute({"d0": 0}, memory_budget=10 ** 9, layered_solution=layered)
+
+    assert sol[f"d{n_ops}"] == n_ops
+    # Each intermediate sized just once, inputs & last output never.
+    assert sized == list(range(1, n_ops))
+    assert sol._mem_total == sum(spill.sizeof(i) for i in range(1, n_ops))
+
+
+@pytest.mark.parametrize("layered", [False, True])
+def test_lazy_inputs(layered):
+    loaded = []
+
+    def loader(name, value):
+        def load():
+            loaded.append(name)
+            return value
+
+        return LazyInput(load)
+
+    pipe = compose(
+        "lazy",
+        operation(lambda a, b: a + b, "add", needs=["a", "b"], provides="ab"),
+        operation(lambda c: c * 2, "double", needs="c", provides="cc"),
+    )
+    inp = {"a": loader("a", 1), "b": 2, "c": loader("c", 3)}
+
+    sol = pipe.compute(dict(inp), outputs="ab", layered_solution=layered)
+    assert sol == {"ab": 3}
+    assert loaded == ["a"]
+
+    loaded.clear()
+    sol = pipe.compute(inp, layered_solution=layered)
+    assert loaded == ["a", "c"]
+    assert isinstance(inp["a"], LazyInput)  # inputs not modified
+    assert sol == {"a": 1, "b": 2, "c": 3, "ab": 3, "cc": 6}
+
+    loaded.clear()
+    sol = pipe.compute(inp, outputs="cc", layered_solution=layered)
+    assert sol == {"cc": 6}
+    assert loaded == ["c"]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_lazy_inputs_loaded_when_needed(parallel):
+    events = []
+
+    def load(name):
+        events.append(name)
+        return name
+
+    def op1(a):
+        events.append("o1 ran")
+        return a
+
+    pipe = compose(
+        "lazy_order",
+        operation(op1, "o1", needs="a", provides="A"),
+        operation(lambda A, b: A + b, "o2", needs=["A", "b"], provides="AB"),
+        parallel=parallel,
+    )
+    inp = {k: LazyInput(partial(load, k)) for k in "ab"}
+    with execution_pool_plugged(mp_dummy.Pool(2)):
+        sol = pipe.compute(inp)
+
+    assert sol["AB"] == "ab"
+    assert events == ["a", "o1 ran", "b"]
+
+
+def test_lazy_inputs_prefetched():
+    import threading
+
+    loaded = {}
+
+    def load(name):
+        loaded[name] = threading.current_thread().name
+        return name
+
+    def check_loaded(*args):
+        # Prefetch may still be running for the next op.
+        assert "a" in loaded
+        return args
+
+    pipe = compose(
+        "prefetch",
+        operation(check_loaded, "op1", needs="a", provides="A"),
+        operation(check_loaded, "op2", needs=["A", "b"], provides="B"),
+        operation(check_loaded, "op3", needs=["B", "c"], provides="C"),
+    )
+    inp = {k: LazyInput(partial(load, k)) for k in "abc"}
+    with prefetch_steps_plugged(3):
+        sol = pipe.compute(inp, outputs="C")
+
+    assert sol == {"C": ((("a",), "b"), "c")}
+    assert sorted(loaded) == ["a", "b", "c"]
+    assert all(t.startswith("graphtik-prefetch") for t in loaded.values()), loaded
+
+
+def test_lazy_solution():
+    calls = []
+
+    def fn(name, f, **kw):
+        def wrapped(*args):
+            calls.append(name)
+            return f(*args)
+
+        return operation(wrapped, f"op_{name}", **kw)
+
+    pipe = compose(
+        "lazy_sol",
+        fn("ab", add, needs=["a", "b"], provides="ab"),
+        fn("abc", add, needs=["ab", "c"], provides="abc"),
+        fn("abd", add, needs=["ab", "d"], provides="abd"),
+        fn("neg", lambda a: -a, needs="a", provides="neg"),
+    )
+    inp = {"a": 1, "b": 2, "c": 3, "d": 4}
+
+    sol = pipe.compute(inp, lazy=True)
+    assert not calls
+    assert set(sol) == {*inp, "ab", "abc", "abd", "neg"}
+    assert "neg" in sol and "x" not in sol and not calls
+
+    assert sol["abc"] == 6
+    assert calls == ["ab", "abc"]
+    assert sol["abd"] == 7
+    assert calls == ["ab", "abc", "abd"]  # `ab` reused
+    assert sol["a"] == 1
+    assert len(sol.solutions) == 2
+    assert dict(sol) == {**inp, "ab": 3, "abc": 6, "abd": 7, "neg": -1}
+    assert calls == ["ab", "abc", "abd", "neg"]
+    with pytest.raises(KeyError):
+        sol["x"]
+
+    ## Intermediates not asked are kept internally, but not exposed,
+    #  while keys pending need them.
+    #
+    calls.clear()
+    sol = pipe.compute(inp, outputs=["abc", "abd"], lazy=True)
+    assert list(sol) == ["abc", "abd"]
+    assert sol["abd"] == 7
+    assert "ab" in sol.solutions[0]
+    assert sol["abc"] == 6
+    assert calls == ["ab", "abd", "abc"]  # `ab` runs once
+    assert dict(sol) == {"abc": 6, "abd": 7}
+    with pytest.raises(KeyError):
+        sol["ab"]
+    assert not any("ab" in s for s in sol.solutions)  # evicted, nobody needs it
+
+    ## Access failures get jetsam.
+    #
+    bad_pipe = compose(
+        "lazy_sol",
+        *pipe.ops[:3],
+        operation(lambda a: 1 / 0, "op_neg", needs="a", provides="neg"),
+    )
+    sol = bad_pipe.compute(inp, lazy=True)
+    with pytest.raises(ZeroDivisionError) as exinfo:
+        sol["neg"]
+    jetsam = exinfo.value.jetsam
+    assert jetsam["pipeline"] is bad_pipe
+    assert jetsam["network"] is bad_pipe.net
+    assert jetsam["plan"] and jetsam["solution"] is not None
+
+    with pytest.raises(ValueError, match="Unsolvable graph"):
+        pipe.compute({"a": 1}, outputs="abc", lazy=True)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_compute_iter(parallel):
+    import threading
+
+    first_received = threading.Event()
+
+    def wait_consumer(b):
+        assert first_received.wait(5), "outputs not streamed!"
+        return b * 2
+
+    pipe = compose(
+        "streamed",
+        operation(lambda a: a + 1, "inc", needs="a", provides="b"),
+        operation(wait_consumer, "double", needs="b", provides="c"),
+        operation(lambda c: -c, "neg", needs="c", provides="d"),
+        parallel=parallel,
+    )
+
+    with execution_pool_plugged(mp_dummy.Pool(2)):
+        it = pipe.compute_iter({"a": 1}, outputs=["b", "d"])
+        assert next(it) == ("b", 2)
+        first_received.set()
+        assert next(it) == ("d", -4)
+        with pytest.raises(StopIteration) as exinfo:
+            next(it)
+        sol = exinfo.value.value
+        assert sol == {"b": 2, "d": -4}
+
+        assert list(pipe.compute_iter({"a": 1}, outputs=None)) == [
+            ("b", 2),
+            ("c", 4),
+            ("d", -4),
+        ]
+
+
+def test_compute_iter_fails():
+    pipe = compose(
+        "fail",
+        operation(lambda a: a, "ok", needs="a", provides="b"),
+        operation(lambda b: 1 / 0, "bad", needs="b", provides="c"),
+    )
+    it = pipe.compute_iter({"a": 1})
+    assert next(it) == ("b", 1)
+    with pytest.raises(ZeroDivisionError):
+        next(it)
+
+    def interrupt(*args, **kw):
+        raise KeyboardInterrupt()
+
+    pipe.compute = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        list(pipe.compute_iter({"a": 1}))
+
+
+def test_streaming_ops_pipelined():
+    events = []
+
+    def read(n):
+        for i in range(n):
+            events.append(f"read{i}")
+            yield [i]
+
+    def square(chunks):
+        for chunk in chunks:
+            events.append(f"square{chunk[0]}")
+            yield [i * i for i in chunk]
+
+    pipe = compose(
+        "streams",
+        operation(read, "read", needs="n", provides="nums", streaming=True),
+        operation(square, "square", needs="nums", provides="squares", streaming=True),
+        operation(sum, "sum_squares", needs="squares", provides="total"),
+        operation(len, "count_nums", needs="nums", provides="count"),
+    )
+    assert "~(" in repr(pipe.ops[0])
+
+    sol = pipe.compute({"n": 3})
+    assert sol == {
+        "n": 3,
+        "nums": [0, 1, 2],
+        "squares": [0, 1, 4],
+        "total": 5,
+        "count": 3,
+    }
+    assert events == ["read0", "square0", "read1", "square1", "read2", "square2"]
+
+    events.clear()
+    sol = pipe.compute({"n": 3}, outputs="count")
+    assert sol == {"count": 3}
+    assert events == ["read0", "read1", "read2"]
+
+
+def test_streaming_forks_in_parallel():
+    def read(n):
+        for i in range(n):
+            sleep(0.0001)
+            yield [i]
+
+    def scale(k):
+        def scaler(chunks):
+            for chunk in chunks:
+                yield [i * k for i in chunk]
+
+        return scaler
+
+    pipe = compose(
+        "forks",
+        operation(read, "read", needs="n", provides="nums", streaming=True),
+        operation(scale(2), "double", needs="nums", provides="d", streaming=True),
+        operation(scale(3), "triple", needs="nums", provides="t", streaming=True),
+        operation(sum, "sum_d", needs="d", provides="sd"),
+        operation(sum, "sum_t", needs="t", provides="st"),
+        parallel=True,
+    )
+    n = 200
+    with execution_pool_plugged(mp_dummy.Pool(4)):
+        for _ in range(5):
+            sol = pipe.compute({"n": n})
+            assert sol["sd"] == 2 * sum(range(n))
+            assert sol["st"] == 3 * sum(range(n))
+
+
+def test_streaming_buffered():
+    def read(n):
+        for i in range(n):
+            yield pd.DataFrame({"a": [i]})
+        raise IOError("truncated!")
+
+    pipe = compose(
+        "buffered",
+        operation(read, "read", needs="n", provides="df", streaming=2),
+        operation(lambda df: df["a"].sum(), "sum_df", needs="df", provides="total"),
+    )
+    with pytest.raises(IOError, match="truncated!"):
+        pipe.compute({"n": 3})
+
+    pipe = compose(
+        "buffered",
+        operation(
+            lambda n: (pd.DataFrame({"a": [i]}) for i in range(n)),
+            "read",
+            needs="n",
+            provides="df",
+            streaming=2,
+        ),
+        operation(lambda df: df["a"].sum(), "sum_df", needs="df", provides="total"),
+    )
+    sol = pipe.compute({"n": 3})
+    assert sol["total"] == 3
+    assert_frame_equal(sol["df"], pd.DataFrame({"a": [0, 1, 2]}, index=[0, 0, 0]))
+
+
+def test_stream_early_stop_n_unjoined_fork():
+    import threading
+
+    from graphtik.streaming import Stream, buffered
+
+    produced = []
+
+    def endless():
+        i = 0
+        while True:
+            produced.append(i)
+            yield i
+            i += 1
+
+    chunks = buffered(endless(), 2)
+    assert next(chunks) == 0
+    chunks.close()
+    sleep(0.3)
+    n = len(produced)
+    sleep(0.3)
+    assert len(produced) == n  # producer stopped
+    assert not [t for t in threading.enumerate() if t.name == "graphtik-stream"]
+
+    stream = Stream(iter([{1}, {2}]))  # unjoinable chunks
+    assert stream.materialize() == [{1}, {2}]
+    assert list(stream.fork()) == [{1}, {2}]
+
+    stream = Stream(iter(["a", "b"]))
+    assert stream.materialize() == "ab"
+    assert list(stream.fork()) == ["ab"]
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_map_over_pipeline(parallel):
+    import threading
+
+    def work(item, offset):
+        return item + offset, threading.current_thread().name
+
+    pipe = compose(
+        "fanout",
+        operation(range, "make_items", needs="n", provides="items"),
+        operation(
+            work,
+            "work",
+            needs=["items", "offset"],
+            provides="results",
+            map_over="items",
+            parallel=parallel,
+        ),
+    )
+    main_thread = threading.current_thread().name
+    with execution_pool_plugged(mp_dummy.Pool(3)):
+        sol = pipe.compute({"n": 6, "offset": 10}, outputs="results")
+    results = sol["results"]
+    assert [r for r, _ in results] == list(range(10, 16))
+    threads = {t for _, t in results}
+    if parallel:
+        assert main_thread not in threads
+    else:
+        assert threads == {main_thread}
+
+
+def test_solution_df_concat_deferred_across_ops(monkeypatch):
+    concat_args = []
+
+    def my_concat(dfs, *args, **kwds):
+        concat_args.append(dfs)
+        return orig_concat(dfs, *args, **kwds)
+
+    orig_concat = pd.concat
+    monkeypatch.setattr(pd, "concat", my_concat)
+
+    n_ops = 12
+    df = pd.DataFrame({"doc": [1, 2]})
+    df.columns.names = ["l1"]
+    pipe = compose(
+        "deferred_concats",
+        *(
+            operation(
+                partial(pd.Series, [i, i], name=f"c{i}"),
+                f"op{i}",
+                provides=hcat(f"a/df/H{i:02}"),
+            )
+            for i in range(n_ops)
+        ),
+        operation(lambda df: df.shape, "get_shape", needs="a/df", provides="shape"),
+        operation(
+            lambda shape: pd.Series([-1, -1], name="late"),
+            "late",
+            needs="shape",
+            provides=hcat("a/df/H"),
+        ),
+    )
+    sol = pipe.compute({"a": {"df": df}})
+
+    assert not sol.is_layered
+    assert sol["shape"] == (2, n_ops + 1)
+    # One concat for the 12 fragments, and one for the last one at the end.
+    assert [len(i) for i in concat_args] == [n_ops + 1, 2]
+    df = sol["a"]["df"]
+    assert list(df.columns) == ["doc", *(f"c{i}" for i in range(n_ops)), "late"]
+    assert df.columns.names == ["l1"]
+    assert (df["c11"] == 11).all()
+
+
+def test_solution_df_concat_deferred_fails_on_producer():
+    pipe = compose(
+        "bad_concats",
+        operation(
+            lambda: pd.Series([1, 1], name="ok"), "good", provides=hcat("a/df/H1")
+        ),
+        operation(
+            lambda: pd.Series([1, 2], index=[0, 0], name="dupes"),
+            "bad",
+            provides=hcat("a/df/H2"),
+        ),
+    )
+    with pytest.raises(ValueError, match="non-unique index") as exinfo:
+        pipe.compute({"a": {"df": pd.DataFrame({"doc": [1, 2]})}})
+    assert exinfo.value.jetsam["task"].op.name == "bad"
+
+    with operations_endured():
+        sol = pipe.compute({"a": {"df": pd.DataFrame({"doc": [1, 2]})}})
+    assert isinstance(sol.is_failed(pipe.find_op_by_name("bad")), ValueError)
+    assert list(sol["a"]["df"].columns) == ["doc", "ok"]
+
+
+@pytest.mark.parametrize("outputs", [None, ["s", "X"], "z"])
+def test_codegen(outputs):
+    pipe = compose(
+        "codegen",
+        operation(sub, "sub", needs=["a", "b"], provides="ab"),
+        operation(
+            lambda ab, c=1: ab * c, "mul", needs=["ab", optional("c")], provides="abc"
+        ),
+        operation(
+            lambda x, *, k: (x, k),
+            "two",
+            needs=["abc", keyword("a", "k")],
+            provides=["x", "y"],
+            aliases=[("x", "X")],
+        ),
+        operation(
+            lambda x, y: {"z": x + y},
+            "dict",
+            needs=["x", "y"],
+            provides="z",
+            returns_dict=True,
+        ),
+        operation(
+            lambda *a: sum(a), "va", needs=[vararg("z"), varargs("vs")], provides="s"
+        ),
+    )
+    plan = pipe.compile(["a", "b", "c", "vs"], outputs)
+    run_plan = plan.codegen()
+    assert run_plan.__source__
+
+    inp = {"a": 1, "b": 2, "c": 3, "vs": [1, 2]}
+    assert run_plan(inp) == dict(plan.execute(inp))
+    if outputs:
+        assert "del " in run_plan.__source__
+
+    with pytest.raises(ValueError, match="Plan needs more inputs"):
+        run_plan({"a": 1})
+
+
+def test_codegen_fallback():
+    def fail(a):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "codegen",
+        operation(fail, "bad", needs="a", provides="b", endured=True),
+        operation(lambda a: a, "good", needs="a", provides="c"),
+    )
+    plan = pipe.compile("a")
+    run_plan = plan.codegen()
+    assert run_plan.__source__ is None
+    assert run_plan({"a": 1}) == {"a": 1, "c": 1}
+
+    plan = compose("jsonp", operation(str, needs="a/b", provides="c")).compile()
+    assert plan.codegen().__source__ is None
+
+
+def test_partitionable_ops():
+    import threading
+
+    def scale(df, k):
+        return df.assign(
+            b=df.a * k, nrows=len(df), thread=threading.current_thread().name
+        )
+
+    df = pd.DataFrame({"a": range(7)}, index=pd.Index(range(10, 17), name="idx"))
+    pipe = compose(
+        "partitioned",
+        operation(scale, "scale", needs=["df", "k"], provides="out", partitionable=3),
+    )
+    sol = pipe.compute({"df": df, "k": 2})
+    assert sol["out"]["thread"].nunique() == 1
+
+    with execution_pool_plugged(mp_dummy.Pool(3)):
+        sol = pipe.compute({"df": df, "k": 2})
+    out = sol["out"]
+    assert_frame_equal(out[["a", "b"]], df.assign(b=df.a * 2))
+    assert out.index.name == "idx"
+    assert list(out["nrows"]) == [3, 3, 3, 2, 2, 2, 2]
+    assert threading.current_thread().name not in set(out["thread"])
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_plan_folding(parallel):
+    calls = []
+
+    def config():
+        calls.append("config")
+        return 10
+
+    pipe = compose(
+        "folded",
+        operation(config, "config", provides="k", const=True),
+        operation(lambda k: k + 1, "derived", needs="k", provides="k2", const=True),
+        operation(None, "copy", needs="x", provides="y", aliases={"y": "yy"}),
+        operation(
+            lambda k2, y, yy, x: k2 + y + yy + x,
+            "work",
+            needs=["k2", "y", "yy", "x"],
+            provides="out",
+            parallel=parallel,
+        ),
+    )
+    plan = pipe.compile("x", "out")
+    assert len(list(yield_ops(plan.steps))) == 4
+    assert plan.folded is None
+
+    with plans_optimized(), execution_pool_plugged(mp_dummy.Pool(2)):
+        plan = pipe.compile("x", "out")
+        assert [op.name for op in yield_ops(plan.steps)] == ["work"]
+        assert [op.name for op in plan.folded] == ["config", "derived", "copy"]
+
+        for x in (1, 2):
+            sol = plan.execute({"x": x}, "out")
+            assert sol == {"out": 11 + 3 * x}
+            assert [op.name for op in sol.executed] == [
+                "config",
+                "derived",
+                "copy",
+                "work",
+            ]
+        assert calls == ["config"]
+
+        sol = pipe.compute({"x": 3})
+        assert sol == {"x": 3, "k": 10, "k2": 11, "y": 3, "yy": 3, "out": 20}
+        assert calls == ["config"] * 2  # a new (unevicting) plan
+
+
+def test_plan_folding_const_failures_n_copies():
+    calls = []
+
+    def bad():
+        calls.append("bad")
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "const-fails",
+        operation(bad, "bad", provides="k", const=True, endured=True),
+        operation(lambda k: k, "use", needs="k", provides="kk", const=True),
+        operation(list, "empty", provides="lst", const=True),
+        operation(
+            lambda lst: lst.append(1) or len(lst), "app", needs="lst", provides="n"
+        ),
+    )
+    with plans_optimized():
+        plan = pipe.compile((), ["kk", "n"])
+        assert [op.name for op in plan.folded] == ["bad", "use", "empty"]
+        for _ in range(2):
+            cbs = []
+            sol = plan.execute({}, callbacks=(cbs.append, None))
+            assert sol["n"] == 1  # not leaking across solutions
+            assert isinstance(sol.executed[pipe.ops[0]], ValueError)
+            assert pipe.ops[1] in sol.canceled
+            assert [t.op.name for t in cbs] == ["bad", "empty", "app"]
+        # Failures are not cached, but retried.
+        assert calls == ["bad", "bad"]
+
+        ## A transient failure is cached once it succeeds.
+        #
+        def flaky():
+            calls.append("flaky")
+            if len(calls) < 4:
+                raise ValueError("Boom!")
+            return 1
+
+        pipe = compose(
+            "const-flaky",
+            operation(flaky, "flaky", provides="k", const=True, endured=True),
+            operation(lambda k: k + 1, "inc", needs="k", provides="kk"),
+        )
+        plan = pipe.compile((), "kk")
+        assert "kk" not in plan.execute({})
+        for _ in range(2):
+            assert plan.execute({})["kk"] == 2
+        assert calls == ["bad", "bad", "flaky", "flaky"]
+
+        pipe = compose("const-fails", operation(bad, "bad", provides="k", const=True))
+        with pytest.raises(ValueError, match="Boom!"):
+            pipe.compute()
+
+
+@pytest.mark.parametrize("marshal", [False, True])
+def test_fused_chains(marshal):
+    import threading
+
+    def step(name):
+        def fn(x):
+            return x + [(name, threading.current_thread().name)]
+
+        return fn
+
+    pipe = compose(
+        "chains",
+        operation(step("a"), "a", needs="x", provides="xa"),
+        operation(step("b"), "b", needs="xa", provides="xb"),
+        operation(step("c"), "c", needs="xb", provides="xc"),
+        operation(step("d"), "d", needs="x", provides="xd"),
+        operation(lambda xc, xd: xc + xd, "join", needs=["xc", "xd"], provides="out"),
+        parallel=True,
+        marshalled=marshal,
+    )
+    plan = pipe.compile("x", "out")
+    chains = plan._linear_chains()
+    assert {h.name: [op.name for op in ops] for h, ops in chains.items()} == {
+        "a": ["a", "b", "c"]
+    }
+
+    pre_cb, post_cb = [], []
+    callbacks = (
+        lambda task: pre_cb.append(task.op.name),
+        lambda task: post_cb.append(task.op.name),
+    )
+    with tasks_fused(), execution_pool_plugged(mp_dummy.Pool(2)):
+        sol = plan.execute({"x": []}, "out", callbacks=callbacks)
+    out = sol["out"]
+    assert [name for name, _ in out] == ["a", "b", "c", "d"]
+    assert len({thread for _, thread in out[:3]}) == 1
+    assert list(sol) == ["out"]
+    assert [op.name for op in sol.executed] == ["a", "b", "c", "d", "join"]
+    assert sol.elapsed_ms.keys() == sol.executed.keys()
+    assert all(isinstance(ms, float) for ms in sol.elapsed_ms.values())
+    assert pre_cb == post_cb == ["a", "b", "c"]
+
+    ## Failures in the middle of a chain.
+    #
+    pipe = compose(
+        "chains",
+        operation(step("a"), "a", needs="x", provides="xa"),
+        operation(lambda xa: 1 / 0, "b", needs="xa", provides="xb"),
+        operation(step("c"), "c", needs="xb", provides="xc"),
+        parallel=True,
+        marshalled=marshal,
+    )
+    with tasks_fused(), execution_pool_plugged(mp_dummy.Pool(2)):
+        with pytest.raises(ZeroDivisionError):
+            pipe.compute({"x": []}, "xc")
+        with operations_endured():
+            sol = pipe.compute({"x": []}, "xc")
+    assert [op.name for op in sol.executed] == ["a", "b"]
+    assert [op.name for op in sol.canceled] == ["c"]
+
+
+def test_hedged_providers():
+    import time
+
+    def slow(k):
+        time.sleep(0.5)
+        return "slow"
+
+    def fast(k):
+        return "fast"
+
+    def failing(k):
+        raise ValueError("Boom!")
+
+    def failing_too(k):
+        raise ValueError("Boom too!")
+
+    def make_pipe(*fns):
+        return compose(
+            "hedged",
+            *(operation(fn, fn.__name__, needs="k", provides="x") for fn in fns),
+            operation(str.upper, "consume", needs="x", provides="out"),
+            parallel=True,
+        )
+
+    with providers_raced(), execution_pool_plugged(mp_dummy.Pool(3)):
+        t0 = time.time()
+        sol = make_pipe(slow, fast).compute({"k": 1}, "out")
+        assert time.time() - t0 < 0.4
+        assert sol == {"out": "FAST"}
+        assert [op.name for op in sol.executed] == ["fast", "consume"]
+        assert [op.name for op in sol.canceled] == ["slow"]
+        assert sol.elapsed_ms.keys() == sol.executed.keys()
+        sol.scream_if_incomplete()  # losing a race is no failure
+
+        sol = make_pipe(failing, slow).compute({"k": 1}, "out")
+        assert sol == {"out": "SLOW"}
+        assert [op.name for op in sol.canceled] == ["failing"]
+
+        with pytest.raises(ValueError, match="Boom!"):
+            make_pipe(failing, failing_too).compute({"k": 1}, "out")
+
+    ## Without a pool, the 1st provider cancels the rest.
+    #
+    with providers_raced(), tasks_in_parallel(False):
+        sol = make_pipe(fast, slow).compute({"k": 1})
+    assert sol == {"k": 1, "x": "fast", "out": "FAST"}
+    assert [op.name for op in sol.canceled] == ["slow"]
+    assert sol.check_if_incomplete() is None
+
+    ## ...and failures fall through to the next provider,
+    #  also when executed sequentially.
+    #
+    for parallel in (True, False):
+        with providers_raced(), tasks_in_parallel(False):
+            sol = (
+                make_pipe(failing, fast, slow)
+                .withset(parallel=parallel)
+                .compute({"k": 1})
+            )
+            assert sol == {"k": 1, "x": "fast", "out": "FAST"}
+            assert [op.name for op in sol.executed] == ["failing", "fast", "consume"]
+            assert [op.name for op in sol.canceled] == ["slow"]
+            assert sol.check_if_incomplete() is None
+
+            with pytest.raises(ValueError, match="Boom too!"):
+                make_pipe(failing, failing_too).withset(parallel=parallel).compute(
+                    {"k": 1}
+                )
+
+
+def test_parallel_evictions_refcounted():
+    import time
+
+    from graphtik.execution import Solution
+
+    evictions = []
+
+    class RecordingSolution(Solution):
+        def __delitem__(self, key):
+            evictions.append((key, [op.name for op in self.executed]))
+            super().__delitem__(key)
+
+    def slow(x):
+        time.sleep(0.2)
+        return x
+
+    pipe = compose(
+        "refcounts",
+        operation(lambda y: y, "fast", needs="y", provides="a"),
+        operation(slow, "slow", needs="x", provides="s"),
+        operation(lambda a, s: a + s, "join", needs=["a", "s"], provides="out"),
+        parallel=True,
+    )
+    with execution_pool_plugged(mp_dummy.Pool(2)):
+        sol = pipe.compute({"x": 1, "y": 2}, "out", solution_class=RecordingSolution)
+    assert sol == {"out": 3}
+    assert sorted(evictions) == [
+        ("a", ["fast", "slow", "join"]),
+        ("s", ["fast", "slow", "join"]),
+        ("x", ["fast", "slow"]),
+        # Evicted before waiting for `slow`, in the same batch.
+        ("y", ["fast"]),
+    ]
+
+    ## Folded conveyors release their needs, too.
+    evictions.clear()
+    pipe = compose(
+        "refcounts",
+        operation(lambda x: x, "a", needs="x", provides="y", parallel=True),
+        operation(None, "copy", needs="y", provides="yy"),
+        operation(lambda yy: yy, "b", needs="yy", provides="bb"),
+        operation(lambda bb: bb, "c", needs="bb", provides="cc"),
+        operation(lambda cc: cc, "d", needs="cc", provides="out"),
+    )
+    with plans_optimized(), execution_pool_plugged(mp_dummy.Pool(2)):
+        sol = pipe.compute({"x": 1}, "out", solution_class=RecordingSolution)
+    assert sol == {"out": 1}
+    assert ("y", ["a", "copy"]) in evictions
+
+
+def test_coalesced_computes():
+    from graphtik.coalescing import SingleFlight
+
+    calls = []
+
+    def slow(x):
+        calls.append(x)
+        sleep(0.2)
+        return x * 2
+
+    pipe = compose("coalesced", operation(slow, "slow", needs="x", provides="y"))
+    coalescer = SingleFlight()
+    with mp_dummy.Pool(4) as pool:
+        sols = pool.map(
+            lambda x: pipe.compute({"x": x}, "y", coalescer=coalescer),
+            [1, 1, 1, 2],
+        )
+    assert [sol["y"] for sol in sols] == [2, 2, 2, 4]
+    # Waiters receive their own copies.
+    assert sols[0] == sols[1] == sols[2]
+    assert len({id(sol) for sol in sols}) == 4
+    sols[1]["y"] = -1
+    assert sols[0]["y"] == sols[2]["y"] == 2
+    assert sorted(calls) == [1, 2]
+    assert coalescer.stats == {"calls": 4, "coalesced": 2, "computed": 2}
+
+    ## Without a window, finished calls are not shared.
+    pipe.compute({"x": 1}, "y", coalescer=coalescer)
+    assert sorted(calls) == [1, 1, 2]
+
+    coalescer = SingleFlight(window=60)
+    sol1 = pipe.compute({"x": 3}, "y", coalescer=coalescer)
+    sol2 = pipe.compute({"x": 3}, "y", coalescer=coalescer)
+    assert sol2 == sol1 and sol2 is not sol1
+    assert pipe.compute({"x": 3}, coalescer=coalescer) is not sol1
+    assert coalescer.stats == {"calls": 3, "coalesced": 1, "computed": 2}
+
+    ## Different pipelines, arguments & configs never coalesce.
+    pipe2 = compose("coalesced", operation(slow, "slow", needs="x", provides="y"))
+    assert pipe2.compute({"x": 3}, "y", coalescer=coalescer) is not sol1
+    assert pipe.compute({"x": 3}, "y", memory_budget=1, coalescer=coalescer) is not sol1
+    with operations_endured():
+        assert pipe.compute({"x": 3}, "y", coalescer=coalescer) is not sol1
+    cbs = []
+    pipe.compute({"x": 3}, "y", callbacks=cbs.append, coalescer=coalescer)
+    assert cbs
+    assert coalescer.stats == {"calls": 7, "coalesced": 1, "computed": 6}
+
+    ## Errors are shared, but never kept in the window.
+    with pytest.raises(ValueError, match="Unsolvable graph"):
+        pipe.compute({"z": 3}, "y", coalescer=coalescer)
+    with pytest.raises(ValueError, match="Unsolvable graph"):
+        pipe.compute({"z": 3}, "y", coalescer=coalescer)
+    assert coalescer.stats["coalesced"] == 1
+
+    ## Concurrent errors re-raised as copies.
+    def failing(x):
+        sleep(0.2)
+        raise ValueError(f"Boom {x}!")
+
+    pipe = compose("coalesced", operation(failing, "fail", needs="x", provides="y"))
+    coalescer = SingleFlight()
+
+    def compute_error(x):
+        try:
+            pipe.compute({"x": x}, "y", coalescer=coalescer)
+        except ValueError as ex:
+            return ex
+
+    with mp_dummy.Pool(3) as pool:
+        errors = pool.map(compute_error, [1, 1, 1])
+    assert [str(ex) for ex in errors] == ["Boom 1!"] * 3
+    assert len({id(ex) for ex in errors}) == 3
+    assert all(ex.__traceback__ for ex in errors)
+    assert coalescer.stats == {"calls": 3, "coalesced": 2, "computed": 1}
@@ -52,6 +52,33 @@ def filtdict(d, *keys):
     return type(d)(i for i in d.items() if i[0] in keys)
 
 
+def test_import_time():
+    """Heavy deps must load only when really needed, e.g. on `Network` construction."""
+    import subprocess
+
+    prog = """if 1:
+        import sys, time
+
+        t0 = time.perf_counter()
+        from graphtik import compose, operation, hcat
+
+        ops = [operation(str, needs="a/b", provides=hcat("a/c"))]
+        elapsed = time.perf_counter() - t0
+        print(elapsed)
+        print(sorted(
+            m for m in ("numpy", "pandas", "networkx", "jinja2") if m in sys.modules
+        ))
+        compose("p", *ops)
+        print("networkx" in sys.modules)
+    """
+    out = subprocess.check_output([sys.executable, "-c", prog], text=True)
+    elapsed, heavy_mods, nx_loaded = out.splitlines()
+    assert heavy_mods == "[]"
+    assert nx_loaded == "True"
+    # A generous budget, for slow CI servers.
+    assert float(elapsed) < 1.5
+
+
 def test_smoke_test():
 
     # Sum operation, late-bind compute function
@@ -168,6 +168,26 @@ def test_resolve_path_sequence():
     assert resolve_path(doc, path) == 33
 
 
+def test_resolve_path_caches_failed_indexers():
+    from graphtik.jsonpointer import _compile_path
+
+    path = "a/1"
+    compiled = _compile_path(tuple(jsonp_path(path)))
+    compiled.failed_indexers.clear()
+
+    for _ in range(2):
+        assert resolve_path({"a": [11, 22]}, path) == 22
+    assert compiled.failed_indexers == {(1, list): {0}}
+
+    ## Other doc-types on the same step still try all indexers.
+    #
+    assert resolve_path({"a": {"1": "str", 1: "int"}}, path) == "str"
+    assert resolve_path({"a": {1: "int"}}, path) == "int"
+    assert resolve_path({"a": [11, 22]}, path) == 22
+    with pytest.raises(ResolveError):
+        resolve_path({"a": [11]}, path)
+
+
 def test_resolve_path_missing_screams():
     doc = {}
 
@@ -623,3 +643,33 @@ def test_update_paths_df_concat(axis):
     check_dfs_eq(resolve_path(doc, "a/ab"), val2)
     check_dfs_eq(resolve_path(doc, "/a/ac/aca"), exp_aca)
     check_dfs_eq(resolve_path(doc, "a/aa"), exp_aa)
+
+
+def test_update_paths_df_many_new_columns():
+    import warnings
+
+    df = pd.DataFrame({"A": range(3)})
+    df.columns.names = ["cols"]
+    doc = {"a": {"df": df, "x": 1}}
+    path_values = [(f"a/df/c{i:03}", [i] * 3) for i in range(200)]
+    path_values.append(("a/df/A", [-1] * 3))
+    path_values.append(("a/x", 2))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        update_paths(doc, path_values)
+
+    new_df = doc["a"]["df"]
+    assert new_df is df
+    assert list(new_df.columns) == ["A", *(f"c{i:03}" for i in range(200))]
+    assert new_df.columns.names == ["cols"]
+    assert (new_df["A"] == -1).all()
+    assert (new_df["c199"] == 199).all()
+    assert doc["a"]["x"] == 2
+
+    ## Root frames too, and bad values raise.
+    #
+    update_paths(df, [("r1", [1] * 3), ("r2", [2] * 3)])
+    assert list(df.columns)[-2:] == ["r1", "r2"]
+    with pytest.raises(ValueError):
+        update_paths(df, [("b1", [1] * 2), ("b2", [2] * 2)])
@@ -8,10 +8,17 @@ from graphtik.jsonpointer import jsonp_path
 from graphtik.modifier import (
     Accessor,
     _Modifier,
+    _modifier,
     dep_renamed,
     dep_singularized,
     dep_stripped,
     is_implicit,
+    is_optional,
+    is_pure_sfx,
+    is_sfxed,
+    is_vararg,
+    is_varargish,
+    is_varargs,
     implicit,
     keyword,
     modify,
@@ -31,7 +38,7 @@ def modifier_kws(m):
     if isinstance(m, _Modifier):
         return {
             k: v
-            for k, v in vars(m).items()
+            for k, v in m._attrs()
             if k
             not in "_repr _func _sideffected _sfx_list _keyword _optional _jsonp".split()
         }
@@ -344,3 +351,49 @@ def test_implicit(ser_method):
 
     assert dep_renamed(m, "R")._implicit == m._implicit
     assert ser_method(m)._implicit == m._implicit
+
+
+def test_modifiers_interned_n_slotted(ser_method):
+    assert optional("a", "b") is optional("a", "b")
+    assert modify("a/b") is modify("a/b")
+    assert sfxed("a", "b") is sfxed("a", "b")
+    assert optional("a") is not keyword("a")
+    assert modify("a/b", jsonp=False) is not modify("a/b")
+    assert optional("a", implicit=1) is not optional("a", implicit=True)
+    # Modifiers containing modifiers compare equal with plain strings.
+    assert sfxed(modify("a/b", jsonp=False), "c") is not sfxed("a/b", "c")
+
+    # Regardless of which was interned 1st.
+    assert repr(sfxed("q", "c")._sideffected) == "'q'"
+    assert repr(sfxed(optional("q"), "c")._sideffected) == "'q'(?)"
+
+    m = vararg("a")
+    assert not hasattr(m, "__dict__")
+    with pytest.raises(AttributeError):
+        m.foo = 1
+    assert ser_method(m) == m and repr(ser_method(m)) == repr(m)
+
+    # Extra attributes go to never interned instances.
+    m = _modifier("a", foo=1)
+    assert m._foo == 1 and m is not _modifier("a", foo=1)
+
+
+@pytest.mark.parametrize(
+    "dep, exp",
+    [
+        ("a", (0, 0, 0, 0)),
+        (optional("a"), (0, 0, 0, 0)),
+        (vararg("a"), (1, 0, 1, 0)),
+        (varargs("a"), (0, 1, 1, 0)),
+        (sfx("a"), (0, 0, 0, 1)),
+        (sfxed("a", "b"), (0, 0, 0, 0)),
+        (sfxed_varargs("a", "b"), (0, 1, 1, 0)),
+    ],
+)
+def test_modifier_flags(dep, exp):
+    got = (is_vararg(dep), is_varargs(dep), is_varargish(dep), is_pure_sfx(dep))
+    assert got == tuple(bool(i) for i in exp)
+    assert bool(is_optional(dep)) == bool(getattr(dep, "_optional", None))
+    assert bool(is_sfxed(dep)) == bool(
+        getattr(dep, "_sideffected", None) and getattr(dep, "_sfx_list", None)
+    )
@@ -3,7 +3,7 @@
 
 import logging
 import re
-from collections import OrderedDict, namedtuple
+from collections import Counter, OrderedDict, namedtuple
 from functools import partial
 from textwrap import dedent
 from types import SimpleNamespace
@@ -735,6 +735,86 @@ def test_serialize_op(op_fact, ser_method):
     assert ser_method(op) == op
 
 
+def _fn_with_all_kinds_of_args(a, b, *args, k):
+    return a + b + sum(args) + k, k
+
+
+def test_fn_plans_serialized_and_withset(ser_method):
+    op = operation(
+        _fn_with_all_kinds_of_args,
+        needs=["a", "b", vararg("c"), varargs("d"), keyword("e", "k")],
+        provides=["x", keyword("y", "yy")],
+        aliases={"x": "X"},
+    )
+    inp = {"a": 1, "b": 2, "c": 3, "d": [4, 5], "e": 6}
+    exp = {"x": 21, "y": 6, "X": 21}
+    assert op.compute(inp) == exp
+    assert ser_method(op).compute(inp) == exp
+
+    op2 = op.withset(needs=["a", "e", vararg("c"), varargs("d"), keyword("b", "k")])
+    assert op2._fn_needs_bindings != op._fn_needs_bindings
+    assert op2.compute(inp) == {"x": 21, "y": 2, "X": 21}
+
+
+def test_fn_plans_used_on_compute(monkeypatch):
+    """`compute()` must bind & zip from the precomputed plans, not the modifiers."""
+    from graphtik import fnop
+
+    needs = [f"n{i}" for i in range(8)]
+    provides = [f"p{i}" for i in range(8)]
+    op = operation(lambda *a: a, needs=needs, provides=provides, aliases=[("p0", "A")])
+    assert len(op._fn_needs_bindings) == len(needs)
+    assert op._fn_dict_results_plan
+
+    calls = Counter()
+    for fname in ("get_keyword", "get_jsonp", "is_optional", "is_vararg", "is_varargs"):
+
+        def counted(*args, _orig=getattr(fnop, fname), _fname=fname):
+            calls[_fname] += 1
+            return _orig(*args)
+
+        monkeypatch.setattr(fnop, fname, counted)
+
+    inp = dict.fromkeys(needs, 1)
+    assert op.compute(inp) == {**dict.fromkeys(provides, 1), "A": 1}
+    assert not calls
+
+
+def test_jsonp_needs_grouped_by_parent():
+    op = operation(
+        lambda x, y, z, w=-1, v=-2: (x.sum(), y.sum(), z, w, v),
+        needs=[
+            "a/df/x",
+            "a/df/y",
+            "a/z",
+            optional("a/df/w"),
+            optional("b/c/v"),
+            optional("b/c/u"),
+        ],
+        provides="r",
+    )
+    parents = op._fn_needs_parents
+    assert [p and (str(p[0]), p[1]) for p in parents] == [
+        ("a/df", "x"),
+        ("a/df", "y"),
+        None,
+        ("a/df", "w"),
+        ("b/c", "v"),
+        ("b/c", "u"),
+    ]
+
+    df = pd.DataFrame({"x": [1, 2], "y": [3, 4]})
+    pipe = compose("grouped_jsonp_needs", op)
+    sol = pipe.compute({"a": {"df": df, "z": 5}})
+    assert not sol.is_layered
+    assert sol["r"] == (3, 7, 5, -1, -2)
+
+    sol = pipe.compute({"a": {"df": df, "z": 5}}, layered_solution=True)
+    assert sol["r"] == (3, 7, 5, -1, -2)
+
+    assert operation(str, needs=["a/b", "c/d", "a"])._fn_needs_parents is None
+
+
 def test_serialize_pipeline(samplenet, ser_method):
     def eq(pipe1, pipe2):
         return pipe1.name == pipe2.name and pipe1.ops == pipe2.ops
@@ -903,3 +983,71 @@ def test_pandas_input():
     assert (sol["A"] == ser).all()
     sol = operation(fn=None, name="pandas", needs="a", provides="A").compute({"a": ser})
     assert (sol["A"] == ser).all()
+
+
+def test_map_over():
+    op = operation(
+        lambda x, k: x * k, "scale", needs=["x", "k"], provides="y", map_over="x"
+    )
+    assert op.compute({"x": [1, 2, 3], "k": 10}) == {"y": [10, 20, 30]}
+    assert op.compute({"x": [], "k": 10}) == {"y": []}
+
+    op = op.withset(
+        fn=lambda x, k: (x, x * k), provides=["x2", "y"], needs=["x", keyword("k")]
+    )
+    assert op.compute({"x": (1, 2), "k": 2}) == {"x2": [1, 2], "y": [2, 4]}
+
+    df = pd.DataFrame({"g": [1, 1, 2], "v": [1, 2, 3]})
+    op = operation(
+        lambda grp: grp.v.sum(), "sums", needs="groups", provides="s", map_over="groups"
+    )
+    sums = op.compute({"groups": df.groupby("g")})["s"]
+    assert sums.to_dict() == {1: 3, 2: 3}
+
+    op = op.withset(fn=lambda grp: grp.assign(v=grp.v * 2))
+    got = op.compute({"groups": df.groupby("g")})["s"]
+    assert got.equals(df.assign(v=df.v * 2))
+
+    with pytest.raises(ValueError, match="not in `needs`"):
+        operation(str, "bad", needs="a", provides="b", map_over="x")
+    with pytest.raises(ValueError, match=r"cannot be a \*vararg\(s\)\* need"):
+        operation(str, "bad", needs=varargs("a"), provides="b", map_over="a")
+    with pytest.raises(ValueError, match=r"cannot be a \*vararg\(s\)\* need"):
+        operation(str, "bad", needs=["a", vararg("b")], provides="c", map_over="b")
+
+
+def test_partitionable():
+    import os
+
+    import numpy as np
+    from multiprocessing import dummy as mp_dummy
+
+    from graphtik.config import execution_pool_plugged
+
+    op = operation(
+        lambda a, b, k: (a + b * k, np.full_like(a, len(a))),
+        "axpy",
+        needs=["a", "b", "k"],
+        provides=["c", "sizes"],
+        partitionable=2,
+    )
+    a, b = np.arange(5), np.ones(5, dtype=int)
+    with execution_pool_plugged(mp_dummy.Pool(2)):
+        sol = op.compute({"a": a, "b": b, "k": 3})
+        assert (sol["c"] == a + 3).all()
+        assert list(sol["sizes"]) == [3, 3, 3, 2, 2]
+
+        ## As many partitions as CPUs (no more than rows).
+        #
+        sol = op.withset(partitionable=True).compute({"a": a, "b": b, "k": 3})
+        assert (sol["c"] == a + 3).all()
+        nparts = min(os.cpu_count() or 1, len(a))
+        assert sum(1 / n for n in sol["sizes"]) == pytest.approx(nparts)
+
+        with pytest.raises(ValueError, match="unequal number of rows"):
+            op.compute({"a": a, "b": b[:3], "k": 3})
+        with pytest.raises(ValueError, match="non row-wise types"):
+            op.withset(fn=lambda a, b, k: (1, 2)).compute({"a": a, "b": b, "k": 3})
+
+    with pytest.raises(ValueError, match="both `partitionable` and `map_over`"):
+        operation(str, "bad", needs="a", provides="b", map_over="a", partitionable=2)
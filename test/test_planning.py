@@ -2,19 +2,24 @@
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """mostly :mod:`networkx` routines tests"""
 
+from collections import Counter
+
 import networkx as nx
 import pytest
 from networkx.readwrite.edgelist import parse_edgelist
 
 from graphtik import operation
+from graphtik.graphcore import NODE_OP, CompactDag
 from graphtik.planning import (
+    Network,
+    build_chaindocs_index,
     yield_also_chaindocs,
     yield_also_subdocs,
     yield_also_superdocs,
     yield_chaindocs,
+    yield_indexed_chaindocs,
     yield_subdocs,
     yield_superdocs,
-    Network,
 )
 
 
@@ -85,6 +90,20 @@ def test_yield_chained_docs_leaf(g):
     assert list(yield_chaindocs(g, ["d11"], ())) == ["d11", "d1", "root"]
 
 
+@pytest.mark.parametrize(
+    "nodes",
+    [*"root d1 d11 d12 d2 d21 d211 foo bar baz BAD".split(), ["d11", "d2", "BAD"]],
+)
+def test_yield_indexed_chaindocs(g, nodes):
+    nodes = [nodes] if isinstance(nodes, str) else nodes
+    index = build_chaindocs_index(g)
+    assert "foo" not in index
+
+    assert list(yield_indexed_chaindocs(index, g, nodes)) == list(
+        yield_chaindocs(g, nodes)
+    )
+
+
 def test_yield_chained_docs_inner(g):
     ## inner-node
     #
@@ -186,3 +205,98 @@ def test_yield_chained_docs_root(g):
 def test_node_clashes(ops, err):
     with pytest.raises(ValueError, match=err):
         Network(*ops)
+
+
+def test_subdoc_chain_node_reused_by_later_op():
+    net = Network(
+        operation(str, "op1", needs="a/b", provides="b"),
+        operation(str, "op2", needs="a", provides="c"),
+    )
+    assert net.graph.has_edge("a", "a/b")
+    assert net.graph.has_edge("a", "op2")
+
+    with pytest.raises(ValueError, match=r"operation\(a\) clashed with"):
+        Network(operation(str, "op1", needs="a/b"), operation(str, "a"))
+
+
+@pytest.mark.parametrize("n_ops", [1_000, 4_000])
+def test_network_build_many_ops(n_ops, monkeypatch):
+    """Building should do work ~linear to the distinct deps, not per op-pair/op."""
+    from graphtik import planning
+
+    calls = Counter()
+
+    def counting(fn):
+        def wrapper(*args, **kw):
+            calls[fn.__name__] += 1
+            return fn(*args, **kw)
+
+        return wrapper
+
+    monkeypatch.setattr(planning, "modify", counting(planning.modify))
+    monkeypatch.setattr(planning, "_optionalized", counting(planning._optionalized))
+
+    ops = [
+        operation(
+            None, f"op{i}", needs=[f"d{i}", f"doc/d{i // 10}"], provides=f"d{i + 1}"
+        )
+        for i in range(n_ops)
+    ]
+    net = Network(*ops)
+
+    assert len(net.graph) == 2 * n_ops + 1 + n_ops // 10 + 1
+    assert net.needs[0] == "d0"
+    ## Subdoc-chains built once per document, needs optionalized once each.
+    assert calls == {"modify": 2 * n_ops // 10, "_optionalized": n_ops + n_ops // 10}
+
+
+@pytest.mark.slow
+def test_network_build_many_ops_timings():
+    """Not asserting, just report build times, see :func:`test_network_build_many_ops`."""
+    from time import perf_counter
+
+    for n_ops in (10_000, 40_000):
+        ops = [
+            operation(
+                None, f"op{i}", needs=[f"d{i}", f"doc/d{i // 10}"], provides=f"d{i + 1}"
+            )
+            for i in range(n_ops)
+        ]
+        t0 = perf_counter()
+        Network(*ops)
+        print(f"Network of {n_ops} ops built in {perf_counter() - t0:.2f}s")
+
+
+def test_compact_dag():
+    from graphtik import optional, sfxed
+
+    net = Network(
+        operation(str, "a", needs=["x", optional("y")], provides="z/b/c"),
+        operation(str, "b", needs="z/b/c", provides=sfxed("s", "S")),
+        operation(
+            str,
+            "c",
+            needs=["z/b", sfxed("s", "S")],
+            provides="w",
+            aliases=[("w", "ww")],
+        ),
+        operation(str, "d", needs=["z"], provides="v"),
+    )
+    graph = net.graph
+    cdag = CompactDag(graph)
+
+    assert len(cdag) == len(graph) and all(n in cdag for n in graph)
+    for n in graph:
+        assert cdag.successors(n) == list(graph.successors(n))
+        assert cdag.predecessors(n) == list(graph.predecessors(n))
+        assert bool(cdag.node_flags[cdag.index[n]] & NODE_OP) == (
+            graph.nodes[n]["typ"] == 1
+        )
+
+    a, b, c, d = (net.find_op_by_name(n) for n in "abcd")
+    assert {op: set(ups) for op, ups in cdag.upstream_ops().items()} == {
+        a: set(),
+        b: {a},
+        c: {b},  # `z/b` is a superdoc
+        d: set(),
+    }